@@ -0,0 +1,153 @@
+"""조사관 특수 능력(어빌리티) 레지스트리
+
+능력은 조사관 이름과 트리거로 등록하고, 팀 구성이 바뀔 때 compile_team()으로
+현재 팀에 해당하는 훅만 트리거별 테이블(TeamAbilities)로 묶어 둡니다.
+새 조사관 능력은 아래에 훅 하나를 등록하는 것으로 추가할 수 있습니다.
+
+트리거별 훅 시그니처:
+    on_turn_start(run)                       -> 로그 메시지 또는 None
+    on_cost(card, cost, is_first)            -> 조정된 비용
+    on_damage_bonus(card, method, stats)     -> (추가 피해, 능력 이름) 또는 None
+    on_multiplier(card, method, company)     -> (승수, 설명) 또는 None
+    on_draw_effect(card, value)              -> (드로우 수, 로그 메시지 또는 None)
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple, Callable
+
+from models import TaxType, AttackCategory, MethodType
+from content import LOGIC_CARD_DB
+
+TRIGGERS = ("on_turn_start", "on_cost", "on_damage_bonus", "on_multiplier", "on_draw_effect")
+
+# 트리거 -> [(조사관 이름, 훅)] (등록 순서 = 적용 순서)
+_REGISTRY = {trigger: [] for trigger in TRIGGERS}
+
+def ability(member_name, trigger):
+    """조사관 능력 훅 등록 데코레이터"""
+    if trigger not in _REGISTRY:
+        raise ValueError(f"알 수 없는 능력 트리거: {trigger}")
+
+    def register(handler):
+        _REGISTRY[trigger].append((member_name, handler))
+        return handler
+    return register
+
+@dataclass(frozen=True)
+class TeamAbilities:
+    """현재 팀에 적용되는 트리거별 훅 테이블"""
+    on_turn_start: Tuple[Callable, ...] = ()
+    on_cost: Tuple[Callable, ...] = ()
+    on_damage_bonus: Tuple[Callable, ...] = ()
+    on_multiplier: Tuple[Callable, ...] = ()
+    on_draw_effect: Tuple[Callable, ...] = ()
+
+def compile_team(team_members):
+    """팀 구성으로 훅 테이블 생성 (팀 구성이 바뀔 때만 호출). 같은 구성의 세션끼리 테이블을 공유"""
+    return _compile_names(frozenset(m.name for m in team_members))
+
+@lru_cache(maxsize=None)
+def _compile_names(names):
+    return TeamAbilities(**{
+        trigger: tuple(handler for name, handler in _REGISTRY[trigger] if name in names)
+        for trigger in TRIGGERS
+    })
+
+# --- 턴 시작 ---
+@ability("오기일", "on_turn_start")
+def _planning_focus(run):
+    run.player_focus_current += 1
+    return "✨ [기획 조사] 집중력 +1!"
+
+@ability("이승수", "on_turn_start")
+def _real_estate_card(run):
+    battle = run.battle
+    if run.team_stats["data"] >= 50 and not battle.kim_dj_effect_used:
+        new = LOGIC_CARD_DB["b_tier_01"]
+        run.player_hand.append(new)
+        run.just_created[new.card_id] += 1
+        battle.kim_dj_effect_used = True
+        return "✨ [부동산 조사] '금융거래 분석' 1장 획득!"
+    return None
+
+@ability("전진", "on_turn_start")
+def _field_command(run):
+    run.battle.cost_reduction_active = True
+    return "✨ [실무 지휘] 다음 카드 비용 -1!"
+
+# --- 카드 비용 ---
+@ability("강주연", "on_cost")
+def _tis_analysis(card, cost, is_first):
+    if '데이터' in card.name or '분석' in card.name or AttackCategory.CAPITAL in card.attack_category:
+        return max(0, cost - 1)
+    return cost
+
+@ability("변유솔", "on_cost")
+def _legal_review(card, cost, is_first):
+    type_match = ('분석' in card.name or '판례' in card.name or '법령' in card.name or AttackCategory.COMMON in card.attack_category)
+    if is_first and type_match:
+        return max(0, cost - 1)
+    return cost
+
+@ability("김동호", "on_cost")
+def _special_investigation(card, cost, is_first):
+    if card.name in ['현장 압수수색', '차명계좌 추적']:
+        return max(0, cost - 1)
+    return cost
+
+# --- 추가 피해 ---
+@ability("오슬비", "on_damage_bonus")
+def _fundamentals(card, method, stats):
+    if card.name in ["기본 경비 적정성 검토", "경비 처리 오류 지적"]:
+        return 8, "기본기"
+    return None
+
+@ability("오기일", "on_damage_bonus")
+def _planning_damage(card, method, stats):
+    if '분석' in card.name or '자료' in card.name or '추적' in card.name or AttackCategory.CAPITAL in card.attack_category:
+        return int(stats["analysis"] * 0.1 + stats["data"] * 0.1), "기획 조사"
+    return None
+
+@ability("이상언", "on_damage_bonus")
+def _regular_audit(card, method, stats):
+    if method == MethodType.ERROR:
+        return int(stats["persuasion"] / 10), "정기 조사"
+    return None
+
+@ability("김태호", "on_damage_bonus")
+def _deep_planning(card, method, stats):
+    if AttackCategory.CAPITAL in card.attack_category:
+        return int(stats["evidence"] * 0.1), "심층 기획"
+    return None
+
+# --- 최종 피해 승수 (등록 순서대로 곱함) ---
+@ability("구자환", "on_multiplier")
+def _tax_textbook(card, method, company):
+    if card.name == "판례 제시" and card.special_bonus and card.special_bonus.get('target_method') == method:
+        return 2, "✨ [세법 교본 x2]"
+    return None
+
+@ability("송민칠", "on_multiplier")
+def _offshore_tracking(card, method, company):
+    if company.size in ["외국계", "글로벌 기업"] or method == MethodType.CAPITAL_TX:
+        return 1.3, "✨ [역외탈세 +30%]"
+    return None
+
+@ability("허진", "on_multiplier")
+def _big_company_sniper(card, method, company):
+    if company.size in ["대기업", "외국계", "글로벌 기업"] and TaxType.CORP in card.tax_type:
+        return 1.25, "✨ [대기업 저격 +25%]"
+    return None
+
+@ability("최우현", "on_multiplier")
+def _underground_economy(card, method, company):
+    if method == MethodType.INTENTIONAL:
+        return 1.2, "✨ [지하경제 양성화 +20%]"
+    return None
+
+# --- 드로우 카드 효과 ---
+@ability("구자환", "on_draw_effect")
+def _tax_textbook_draw(card, value):
+    if card.name == "법령 재검토":
+        return value * 2, "✨ [세법 교본] +1장 추가!"
+    return value, None
@@ -0,0 +1,147 @@
+"""조사 도구(아티팩트) 효과 버스
+
+조사 도구 효과는 effect의 (type, subtype)별 컴파일러로 등록하고, 보유 도구 목록(ArtifactList)이
+바뀔 때 compile_artifacts()로 트리거별 테이블(ArtifactEffects)로 묶어 둡니다.
+턴 시작/스탯 계산/비용 계산은 테이블만 읽으므로 도구마다 effect 문자열을 비교하지 않고,
+새 효과 종류는 아래에 컴파일러 하나를 등록하는 것으로 추가할 수 있습니다
+(팩 검증용 스키마는 content_pack.ARTIFACT_EFFECTS).
+
+컴파일러는 compiler(artifact, table)로 호출되며 table의 트리거별 목록에 항목을 추가합니다:
+    on_turn_start: (run) -> 로그 메시지 또는 None
+    bonus_draw:    매 턴 시작 드로우에 더할 장수
+    stat_bonus:    (스탯 이름, 값)
+    cost_delta:    카드 ID -> [비용 변화] (적용 순서대로)
+"""
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Tuple, Callable, Dict
+
+import content
+
+# (effect type, subtype) -> 컴파일러 (subtype이 없는 효과는 None)
+_REGISTRY = {}
+
+def artifact_effect(effect_type, subtype=None):
+    """조사 도구 효과 컴파일러 등록 데코레이터"""
+    def register(compiler):
+        _REGISTRY[(effect_type, subtype)] = compiler
+        return compiler
+    return register
+
+@dataclass(frozen=True)
+class ArtifactEffects:
+    """보유 조사 도구의 트리거별 효과 테이블"""
+    on_turn_start: Tuple[Callable, ...] = ()
+    bonus_draw: int = 0
+    stat_bonus: Tuple[Tuple[str, int], ...] = ()
+    cost_delta: Dict[str, Tuple[int, ...]] = field(default_factory=dict)
+
+# 카탈로그가 바뀌면(content.use_catalog) 대상 카드 ID가 달라지므로 통째로 버림
+_COMPILED = (None, {})
+
+def compile_artifacts(artifacts):
+    """보유 도구로 효과 테이블 생성 (도구 목록이 바뀔 때만 호출). 같은 구성의 세션끼리 테이블을 공유"""
+    global _COMPILED
+    catalog, cache = _COMPILED
+    if catalog is not content.CATALOG:
+        cache = {}
+        _COMPILED = (content.CATALOG, cache)
+    key = tuple(art.name for art in artifacts)
+    effects = cache.get(key)
+    if effects is None:
+        effects = cache[key] = _compile(artifacts)
+    return effects
+
+def _compile(artifacts):
+    table = {"on_turn_start": [], "bonus_draw": [], "stat_bonus": [], "cost_delta": {}}
+    for art in artifacts:
+        compiler = _REGISTRY.get((art.effect["type"], art.effect.get("subtype")))
+        if compiler is None:
+            raise ValueError(f"알 수 없는 조사 도구 효과: {art.name} {art.effect}")
+        compiler(art, table)
+    return ArtifactEffects(
+        on_turn_start=tuple(table["on_turn_start"]),
+        bonus_draw=sum(table["bonus_draw"]),
+        stat_bonus=tuple(table["stat_bonus"]),
+        cost_delta={card_id: tuple(deltas) for card_id, deltas in table["cost_delta"].items()},
+    )
+
+class ArtifactList(list):
+    """보유 조사 도구 목록. list처럼 쓰되 도구가 바뀔 때마다 효과 테이블(effects)을 다시 컴파일"""
+    __slots__ = ("effects",)
+
+    def __init__(self, artifacts=()):
+        super().__init__(artifacts)
+        self.effects = compile_artifacts(self)
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+    def _changed(self):
+        self.effects = compile_artifacts(self)
+
+    def append(self, art):
+        super().append(art)
+        self._changed()
+
+    def extend(self, artifacts):
+        super().extend(artifacts)
+        self._changed()
+
+    def __iadd__(self, artifacts):
+        self.extend(artifacts)
+        return self
+
+    def insert(self, index, art):
+        super().insert(index, art)
+        self._changed()
+
+    def pop(self, index=-1):
+        art = super().pop(index)
+        self._changed()
+        return art
+
+    def remove(self, art):
+        super().remove(art)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+# --- 턴 시작 ---
+def _add_focus(value, message, run):
+    run.player_focus_current += value
+    return message
+
+@artifact_effect("on_turn_start", "focus")
+def _focus(art, table):
+    value = art.effect["value"]
+    table["on_turn_start"].append(partial(_add_focus, value, f"✨ {art.name} 집중력 +{value}!"))
+
+@artifact_effect("on_battle_start", "draw")
+def _draw(art, table):
+    table["bonus_draw"].append(art.effect["value"])
+
+# --- 스탯 ---
+@artifact_effect("on_battle_start", "stat_evidence")
+@artifact_effect("on_battle_start", "stat_persuasion")
+@artifact_effect("on_battle_start", "stat_analysis")
+def _stat(art, table):
+    table["stat_bonus"].append((art.effect["subtype"][len("stat_"):], art.effect["value"]))
+
+# --- 카드 비용 ---
+@artifact_effect("on_cost_calculate")
+def _cost(art, table):
+    targets = set(art.effect["target_cards"])
+    for card_id, card in content.LOGIC_CARD_DB.items():
+        if card.name in targets:
+            table["cost_delta"].setdefault(card_id, []).append(art.effect["value"])
@@ -0,0 +1,82 @@
+"""세션 메모리 벤치마크
+
+동시 접속 세션 N개(기본 1,000)를 서로 다른 스테이지의 전투 진행 중 상태까지 진행시켜
+메모리에 붙잡아 두고, tracemalloc으로 세션(RunState)당 추가 메모리를 측정합니다.
+정적 콘텐츠(조사관/카드/기업 DB)는 모든 세션이 공유하므로 측정 시작 전에 로드합니다.
+
+세션 구조(--layout)별로 비교합니다:
+    shared: 현재 구조. 세션은 공유 콘텐츠를 참조만 하고 전투 기업은 CompanyInstance로 감쌈
+    copied: 공유 전 구조. 세션마다 자기 콘텐츠 사본(조사관/카드/도구/기업)을 들고,
+            전투 기업은 템플릿을 따로 깊은 복사 (현재의 slots 클래스로 복사하므로 인스턴스마다
+            __dict__가 있던 당시 클래스보다는 작게 나옴)
+
+    python bench_memory.py --sessions 1000 --layout both
+"""
+import argparse
+import copy
+import gc
+import time
+import tracemalloc
+
+from engine import RunState
+from artifacts import ArtifactList
+from simulate import GreedyPolicy, play_run
+
+LAYOUTS = ("shared", "copied")
+
+def make_session(seed, target_stage, policy):
+    """target_stage 전투의 첫 턴을 진행한 상태의 세션 생성 (그 전에 끝나면 종료 상태)"""
+    run = RunState()
+    play_run(seed, policy, run=run, stop_stage=target_stage)
+    run.toasts.clear()  # Streamlit 어댑터는 매 rerun마다 토스트를 비움
+    return run
+
+def copy_content(run):
+    """세션이 참조하는 콘텐츠를 세션 전용 사본으로 바꿈 (copied 구조).
+    한 세션 안에서 같은 카드를 여러 장 들고 있으면 사본 하나를 같이 참조"""
+    memo = {}
+    own = lambda obj: copy.deepcopy(obj, memo)
+    run.player_team = own(run.player_team)
+    for zone in (run.player_deck, run.player_hand, run.player_discard):
+        zone.restore([own(card) for card in zone], zone.counts)
+    run.player_artifacts = ArtifactList(own(list(run.player_artifacts)))
+    run.company_order = own(run.company_order)
+    if run.battle is not None:
+        co = run.battle.company
+        co.template = copy.deepcopy(co.template)
+        for tactic, template in zip(co.tactics, co.template.tactics):
+            tactic.template = template
+    return run
+
+def measure(sessions, seed=0, layout="shared"):
+    """세션 sessions개를 유지할 때 세션당 평균/전체 추가 메모리(바이트) 반환"""
+    policy = GreedyPolicy()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    runs = [make_session(seed + i, i % 4, policy) for i in range(sessions)]
+    if layout == "copied":
+        runs = [copy_content(run) for run in runs]
+    gc.collect()
+    total = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return total / max(len(runs), 1), total
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="세션당 메모리 사용량 측정")
+    parser.add_argument("--sessions", type=int, default=1000, help="동시 세션 수")
+    parser.add_argument("--seed", type=int, default=0, help="시작 시드")
+    parser.add_argument("--layout", choices=LAYOUTS + ("both",), default="both", help="세션 구조 (모듈 설명 참고)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for layout in LAYOUTS if args.layout == "both" else (args.layout,):
+        started = time.perf_counter()
+        per_session, total = results[layout] = measure(args.sessions, args.seed, layout)
+        print(f"[{layout}] 세션 {args.sessions:,}개 | 세션당 {per_session / 1024:,.1f} KiB | "
+              f"전체 {total / 1024 / 1024:,.2f} MiB | {time.perf_counter() - started:.1f}초")
+    if len(results) == len(LAYOUTS):
+        print(f"공유 구조가 세션당 {(results['copied'][0] - results['shared'][0]) / 1024:,.1f} KiB 절약")
+
+if __name__ == "__main__":
+    main()
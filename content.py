@@ -0,0 +1,28 @@
+"""정적 게임 콘텐츠 (조사관, 카드, 조사 도구, 기업)
+
+정의는 packs/ 아래 콘텐츠 팩(TOML/JSON)에 있고 content_pack.load_catalog()로 읽습니다.
+Streamlit은 app.py만 매 상호작용마다 다시 실행하고 import된 모듈은 재사용하므로,
+이 모듈의 DB는 서버 프로세스당 한 번만 만들어져 모든 세션이 공유합니다.
+조사관/카드/조사 도구/기업은 frozen 객체라 세션 상태에는 이 객체들의 참조만 담깁니다.
+전투 진행 상태(추징액, 혐의별 적발액)는 전투 시작 시 공유 기업 템플릿을 감싸는
+models.CompanyInstance/TacticInstance에만 따로 두고, 기업 정의는 복사하지 않습니다.
+"""
+from content_pack import load_catalog
+
+CATALOG = load_catalog()
+
+# --- 2. 게임 데이터베이스 (DB) ---
+TAX_MAN_DB = dict(CATALOG.members)
+LOGIC_CARD_DB = dict(CATALOG.cards)
+ARTIFACT_DB = dict(CATALOG.artifacts)
+COMPANY_DB = list(CATALOG.companies.values())
+
+def use_catalog(catalog):
+    """DB 내용을 catalog로 교체 (같은 프로세스에서 콘텐츠 변형을 번갈아 돌리는 밸런스 실험용).
+    다른 모듈이 import해 둔 DB 객체는 그대로 두고 내용만 바꿔 즉시 반영되게 함"""
+    global CATALOG
+    CATALOG = catalog
+    for db, table in ((TAX_MAN_DB, catalog.members), (LOGIC_CARD_DB, catalog.cards), (ARTIFACT_DB, catalog.artifacts)):
+        db.clear()
+        db.update(table)
+    COMPANY_DB[:] = catalog.companies.values()
@@ -0,0 +1,310 @@
+"""콘텐츠 팩 로더
+
+packs/<팩 이름>/ 아래의 TOML(.toml)/JSON(.json) 파일에서 조사관·카드·조사 도구·기업 정의를
+읽어 검증하고, 원본 파일 내용의 해시를 키로 컴파일된 pickle 스냅샷을 packs/.cache/에 남깁니다.
+원본이 그대로면 다음 시작부터는 파싱/검증 없이 스냅샷만 읽습니다.
+
+파일 형식 (최상위 섹션 아래에 ID별 테이블):
+    [members.<id>]    name, description, cost, hp, focus, analysis, persuasion, evidence, data,
+                      ability_name, ability_desc
+    [cards.<id>]      name, description, cost, base_damage, tax_type(목록), attack_category(목록), text,
+                      special_effect = { type = "draw"|"search_draw", value }  (선택)
+                      special_bonus = { target_method, multiplier, bonus_desc }  (선택)
+    [artifacts.<id>]  name, description, effect = { type, value, subtype | target_cards }
+    [companies.<id>]  name, size, description, real_case_desc, revenue, operating_income, tax_target,
+                      team_hp_damage = [최소, 최대], defense_actions, difficulty_tier,
+                      real_investigation_result (선택)
+    [[companies.<id>.tactics]]  name, description, total_amount, tax_type(값 또는 목록),
+                                method_type, tactic_category
+
+Enum 필드는 값("법인세") 또는 이름("CORP") 모두 허용합니다. 팩은 packs/base가 먼저,
+나머지는 이름순으로 읽으며 같은 ID는 나중 팩의 정의로 덮어씁니다.
+패치 파일(patches, 밸런스 실험용)은 같은 형식이지만 정의 전체가 아니라 적은 필드만 덮어씁니다.
+비용(cost)/체력(hp)/피해(team_hp_damage)는 보정 전 원본 값으로 적습니다.
+"""
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+import tomllib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+
+from models import (
+    TaxType, AttackCategory, MethodType, DifficultyTier,
+    TaxManCard, LogicCard, EvasionTactic, Company, Artifact
+)
+
+SCHEMA_VERSION = 2  # 모델/검증 규칙이 바뀌면 올려서 기존 스냅샷 무효화
+PACKS_DIR = Path(__file__).resolve().parent / "packs"
+CACHE_DIR = PACKS_DIR / ".cache"
+BASE_PACK = "base"
+
+class ContentPackError(ValueError):
+    """콘텐츠 팩 정의 오류"""
+
+@dataclass(frozen=True)
+class ContentCatalog:
+    """팩에서 읽은 전체 콘텐츠 (ID -> 객체, 정의 순서 유지)"""
+    members: Dict[str, TaxManCard]
+    cards: Dict[str, LogicCard]
+    artifacts: Dict[str, Artifact]
+    companies: Dict[str, Company]
+
+# --- 필드 명세: 필드 -> (타입, 필수 여부) ---
+MEMBER_FIELDS = {
+    "name": (str, True), "description": (str, True), "cost": (int, True), "hp": (int, True),
+    "focus": (int, True), "analysis": (int, True), "persuasion": (int, True), "evidence": (int, True),
+    "data": (int, True), "ability_name": (str, True), "ability_desc": (str, True),
+}
+CARD_FIELDS = {
+    "name": (str, True), "description": (str, True), "cost": (int, True), "base_damage": (int, True),
+    "tax_type": (list, True), "attack_category": (list, True), "text": (str, True),
+    "special_effect": (dict, False), "special_bonus": (dict, False),
+}
+ARTIFACT_FIELDS = {"name": (str, True), "description": (str, True), "effect": (dict, True)}
+COMPANY_FIELDS = {
+    "name": (str, True), "size": (str, True), "description": (str, True), "real_case_desc": (str, True),
+    "revenue": (int, True), "operating_income": (int, True), "tax_target": (int, True),
+    "team_hp_damage": (list, True), "tactics": (list, True), "defense_actions": (list, True),
+    "difficulty_tier": (str, True), "real_investigation_result": (str, False),
+}
+TACTIC_FIELDS = {
+    "name": (str, True), "description": (str, True), "total_amount": (int, True),
+    "tax_type": ((str, list), True), "method_type": (str, True), "tactic_category": (str, True),
+}
+SECTIONS = ("members", "cards", "artifacts", "companies")
+ARTIFACT_EFFECTS = {  # 효과 구현은 artifacts.py 레지스트리
+    "on_turn_start": {"focus"},
+    "on_battle_start": {"draw", "stat_evidence", "stat_persuasion", "stat_analysis"},
+    "on_cost_calculate": None,  # subtype 대신 target_cards 사용
+}
+CARD_EFFECTS = {"draw", "search_draw"}
+
+# --- 팩 파일 탐색/해시 ---
+def pack_dirs(root=PACKS_DIR):
+    """읽을 팩 디렉터리 목록 (base 먼저, 나머지는 이름순)"""
+    if not root.is_dir():
+        return []
+    dirs = sorted(p for p in root.iterdir() if p.is_dir() and not p.name.startswith("."))
+    return sorted(dirs, key=lambda p: p.name != BASE_PACK)
+
+def pack_files(dirs):
+    """팩 디렉터리들의 정의 파일 목록 (디렉터리 순서 → 파일 이름순)"""
+    return [f for d in dirs for f in sorted(d.iterdir()) if f.suffix in (".toml", ".json") and f.is_file()]
+
+def source_hash(files):
+    """스키마 버전 + 파일 이름/내용의 SHA-256"""
+    digest = hashlib.sha256(f"schema:{SCHEMA_VERSION}".encode())
+    for f in files:
+        digest.update(f"\0{f.parent.name}/{f.name}\0".encode())
+        digest.update(f.read_bytes())
+    return digest.hexdigest()
+
+# --- 로드 ---
+def load_catalog(dirs=None, cache_dir=CACHE_DIR, use_cache=True, patches=()):
+    """콘텐츠 카탈로그 로드. 같은 원본으로 만든 스냅샷이 있으면 그것을 읽음.
+    patches는 팩 정의 위에 필드 단위로 덮어쓸 파일 목록 (스냅샷은 남기지 않음)"""
+    files = pack_files(pack_dirs() if dirs is None else dirs)
+    if not files:
+        raise ContentPackError(f"콘텐츠 팩 파일이 없습니다: {PACKS_DIR}")
+    if patches:
+        return _intern_ids(compile_catalog(files, [Path(p) for p in patches]))
+
+    snapshot = Path(cache_dir) / f"{source_hash(files)}.pickle"
+    if use_cache and snapshot.is_file():
+        try:
+            with open(snapshot, "rb") as fp:
+                return _intern_ids(pickle.load(fp))
+        except Exception:
+            pass  # 손상된 스냅샷은 다시 컴파일
+
+    catalog = compile_catalog(files)
+    if use_cache:
+        _write_snapshot(snapshot, catalog)
+    return _intern_ids(catalog)
+
+def _intern_ids(catalog):
+    """ID 문자열 intern (ID를 키로 쓰는 조회 테이블이 같은 문자열 객체를 공유하도록)"""
+    def interned(table):
+        return {sys.intern(k): v for k, v in table.items()}
+
+    cards = interned(catalog.cards)
+    for card_id, card in cards.items():
+        object.__setattr__(card, 'card_id', card_id)
+    return ContentCatalog(
+        members=interned(catalog.members), cards=cards,
+        artifacts=interned(catalog.artifacts), companies=interned(catalog.companies)
+    )
+
+def _write_snapshot(snapshot, catalog):
+    """스냅샷 원자적 기록. 이전 해시의 스냅샷은 정리 (쓰기 실패는 무시)"""
+    try:
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=snapshot.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fp:
+            pickle.dump(catalog, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, snapshot)
+        for old in snapshot.parent.glob("*.pickle"):
+            if old != snapshot:
+                old.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+def read_pack_file(path):
+    """TOML/JSON 파일 하나를 dict로 읽음"""
+    try:
+        if path.suffix == ".toml":
+            with open(path, "rb") as fp:
+                data = tomllib.load(fp)
+        else:
+            with open(path, encoding="utf-8") as fp:
+                data = json.load(fp)
+    except (tomllib.TOMLDecodeError, json.JSONDecodeError) as e:
+        raise ContentPackError(f"{path}: 파싱 오류 - {e}") from e
+    if not isinstance(data, dict):
+        raise ContentPackError(f"{path}: 최상위는 테이블이어야 합니다.")
+    unknown = set(data) - set(SECTIONS)
+    if unknown:
+        raise ContentPackError(f"{path}: 알 수 없는 섹션 {sorted(unknown)} (허용: {', '.join(SECTIONS)})")
+    return data
+
+def compile_catalog(files, patches=()):
+    """정의 파일들을 읽어 검증하고 게임 객체로 변환. patches는 기존 정의에 필드 단위로 병합"""
+    raw = {section: {} for section in SECTIONS}
+    origin = {}
+    for path in files:
+        for section, items in read_pack_file(path).items():
+            if not isinstance(items, dict):
+                raise ContentPackError(f"{path}: [{section}]는 ID별 테이블이어야 합니다.")
+            for item_id, item in items.items():
+                raw[section][item_id] = item
+                origin[section, item_id] = path
+    for path in patches:
+        for section, items in read_pack_file(path).items():
+            if not isinstance(items, dict):
+                raise ContentPackError(f"{path}: [{section}]는 ID별 테이블이어야 합니다.")
+            for item_id, item in items.items():
+                if item_id not in raw[section]:
+                    raise ContentPackError(f"{path}: 패치 대상 {section}.{item_id}가 없습니다.")
+                if not isinstance(item, dict):
+                    raise ContentPackError(f"{path}: {section}.{item_id}: 테이블이어야 합니다.")
+                raw[section][item_id] = {**raw[section][item_id], **item}
+                origin[section, item_id] = path
+
+    def where(section, item_id):
+        return f"{origin[section, item_id]}: {section}.{item_id}"
+
+    members = {k: _build_member(where("members", k), v) for k, v in raw["members"].items()}
+    cards = {k: _build_card(where("cards", k), k, v) for k, v in raw["cards"].items()}
+    card_names = {c.name for c in cards.values()}
+    artifacts = {k: _build_artifact(where("artifacts", k), v, card_names) for k, v in raw["artifacts"].items()}
+    companies = {k: _build_company(where("companies", k), v) for k, v in raw["companies"].items()}
+
+    for section, table in (("members", members), ("cards", cards), ("companies", companies)):
+        if not table:
+            raise ContentPackError(f"'{section}' 정의가 하나도 없습니다.")
+    return ContentCatalog(members=members, cards=cards, artifacts=artifacts, companies=companies)
+
+# --- 검증/변환 ---
+def _check_fields(where, data, spec):
+    if not isinstance(data, dict):
+        raise ContentPackError(f"{where}: 테이블이어야 합니다.")
+    unknown = set(data) - set(spec)
+    if unknown:
+        raise ContentPackError(f"{where}: 알 수 없는 필드 {sorted(unknown)}")
+    for key, (types, required) in spec.items():
+        if key not in data:
+            if required:
+                raise ContentPackError(f"{where}: 필수 필드 '{key}' 누락")
+            continue
+        value = data[key]
+        # bool은 int의 하위 타입이므로 숫자 필드에서 따로 거름
+        if not isinstance(value, types) or (types is int and isinstance(value, bool)):
+            raise ContentPackError(f"{where}: '{key}' 타입 오류 ({type(value).__name__})")
+
+def _enum(where, enum_cls, value):
+    """Enum 값 또는 이름으로 변환"""
+    for member in enum_cls:
+        if value == member.value or value == member.name:
+            return member
+    allowed = ", ".join(m.value for m in enum_cls)
+    raise ContentPackError(f"{where}: '{value}'은(는) 올바른 {enum_cls.__name__}가 아닙니다 ({allowed})")
+
+def _enum_list(where, enum_cls, values):
+    if not values:
+        raise ContentPackError(f"{where}: {enum_cls.__name__} 목록이 비어 있습니다.")
+    return [_enum(where, enum_cls, v) for v in values]
+
+def _build_member(where, data):
+    _check_fields(where, data, MEMBER_FIELDS)
+    return TaxManCard(**data)
+
+def _build_card(where, card_id, data):
+    _check_fields(where, data, CARD_FIELDS)
+    fields = dict(data)
+    fields["tax_type"] = _enum_list(where, TaxType, data["tax_type"])
+    fields["attack_category"] = _enum_list(where, AttackCategory, data["attack_category"])
+
+    effect = data.get("special_effect")
+    if effect is not None:
+        if effect.get("type") not in CARD_EFFECTS or not isinstance(effect.get("value"), int):
+            raise ContentPackError(f"{where}: special_effect는 type({', '.join(sorted(CARD_EFFECTS))})과 정수 value가 필요합니다.")
+
+    bonus = data.get("special_bonus")
+    if bonus is not None:
+        if set(bonus) != {"target_method", "multiplier", "bonus_desc"}:
+            raise ContentPackError(f"{where}: special_bonus는 target_method, multiplier, bonus_desc가 필요합니다.")
+        if not isinstance(bonus["multiplier"], (int, float)) or isinstance(bonus["multiplier"], bool):
+            raise ContentPackError(f"{where}: special_bonus.multiplier는 숫자여야 합니다.")
+        fields["special_bonus"] = dict(bonus, target_method=_enum(where, MethodType, bonus["target_method"]))
+
+    return LogicCard(card_id=card_id, **fields)
+
+def _build_artifact(where, data, card_names):
+    _check_fields(where, data, ARTIFACT_FIELDS)
+    effect = data["effect"]
+    effect_type = effect.get("type")
+    if effect_type not in ARTIFACT_EFFECTS:
+        raise ContentPackError(f"{where}: effect.type은 {', '.join(ARTIFACT_EFFECTS)} 중 하나여야 합니다.")
+    if not isinstance(effect.get("value"), int):
+        raise ContentPackError(f"{where}: effect.value는 정수여야 합니다.")
+    subtypes = ARTIFACT_EFFECTS[effect_type]
+    if subtypes is None:
+        targets = effect.get("target_cards")
+        if not isinstance(targets, list) or not targets:
+            raise ContentPackError(f"{where}: {effect_type} 효과에는 target_cards 목록이 필요합니다.")
+        missing = [name for name in targets if name not in card_names]
+        if missing:
+            raise ContentPackError(f"{where}: 존재하지 않는 카드 {missing}")
+    elif effect.get("subtype") not in subtypes:
+        raise ContentPackError(f"{where}: {effect_type} 효과의 subtype은 {', '.join(sorted(subtypes))} 중 하나여야 합니다.")
+    return Artifact(**data)
+
+def _build_tactic(where, data):
+    _check_fields(where, data, TACTIC_FIELDS)
+    tax = data["tax_type"]
+    return EvasionTactic(
+        name=data["name"],
+        description=data["description"],
+        total_amount=data["total_amount"],
+        tax_type=_enum_list(where, TaxType, tax) if isinstance(tax, list) else _enum(where, TaxType, tax),
+        method_type=_enum(where, MethodType, data["method_type"]),
+        tactic_category=_enum(where, AttackCategory, data["tactic_category"]),
+    )
+
+def _build_company(where, data):
+    _check_fields(where, data, COMPANY_FIELDS)
+    damage = data["team_hp_damage"]
+    if len(damage) != 2 or not all(isinstance(d, int) for d in damage) or damage[0] > damage[1]:
+        raise ContentPackError(f"{where}: team_hp_damage는 [최소, 최대] 정수 쌍이어야 합니다.")
+    if not data["tactics"]:
+        raise ContentPackError(f"{where}: 혐의(tactics)가 하나 이상 필요합니다.")
+    fields = dict(data)
+    fields["team_hp_damage"] = tuple(damage)
+    fields["tactics"] = [_build_tactic(f"{where}.tactics[{i}]", t) for i, t in enumerate(data["tactics"])]
+    fields["difficulty_tier"] = _enum(where, DifficultyTier, data["difficulty_tier"])
+    return Company(**fields)
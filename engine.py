@@ -0,0 +1,2023 @@
+import random
+import math
+from collections import Counter, deque
+from dataclasses import dataclass, field, replace
+from operator import attrgetter, itemgetter
+from typing import List, Optional, Dict, Tuple
+
+import numpy as np
+
+from models import (
+    AttackCategory, MethodType, DifficultyTier,
+    TaxFlag, CategoryFlag, TaxManCard, LogicCard, ResidualTactic, Company, CompanyInstance, Artifact,
+    get_enum_values, safe_get_enum_value
+)
+import content
+from content import TAX_MAN_DB, LOGIC_CARD_DB, ARTIFACT_DB, COMPANY_DB
+from abilities import TeamAbilities, compile_team
+from artifacts import ArtifactList
+
+# --- 게임 상태 클래스 ---
+def new_battle_stats():
+    """전투 통계 초기값"""
+    return {
+        'turns_taken': 0,
+        'cards_played': 0,
+        'total_damage_dealt': 0,
+        'tactics_cleared': 0
+    }
+
+@dataclass
+class BattleState:
+    """전투 한 번 동안만 유지되는 상태"""
+    company: CompanyInstance
+    bonus_draw: int = 0
+    turn_first_card_played: bool = True
+    kim_dj_effect_used: bool = False
+    cost_reduction_active: bool = False
+    cost_reduction_active_just_used: bool = False
+    hit_effect_company: int = 0
+    hit_effect_player: bool = False
+    stats: Dict[str, int] = field(default_factory=new_battle_stats)
+    tactic_compat: Dict[str, int] = field(default_factory=dict)  # card_id -> 공격 가능한 혐의 인덱스 비트열 (기업 템플릿별 공유)
+    damage_rows: Dict[tuple, tuple] = field(default_factory=dict)  # (card_id, 페널티) -> 혐의별 예상 대미지. damage_rows() 참고
+
+class BattleLog:
+    """전투 로그 링 버퍼. (레벨, 템플릿, 인자) 이벤트만 쌓고 화면에 표시할 때 포맷"""
+    __slots__ = ("events", "version")
+    MAX_EVENTS = 50
+    LEVEL_COLORS = {"success": "green", "warning": "orange", "error": "red", "info": "blue"}
+
+    def __init__(self, maxlen=MAX_EVENTS):
+        self.events = deque(maxlen=maxlen)  # 최신 이벤트가 왼쪽
+        self.version = 0  # 변경 횟수 (UI가 로그 패널을 다시 그릴지 판단)
+
+    def append(self, level, template, args):
+        self.events.appendleft((level, template, args))
+        self.version += 1
+
+    def clear(self):
+        self.events.clear()
+        self.version += 1
+
+    def __len__(self):
+        return len(self.events)
+
+    def lines(self):
+        """최신순 마크다운 줄 목록"""
+        result = []
+        for level, template, args in self.events:
+            msg = template.format(*args) if args else template
+            color = self.LEVEL_COLORS.get(level)
+            result.append(f":{color}[{msg}]" if color else msg)
+        return result
+
+    def to_markdown(self):
+        """전체 로그를 마크다운 블록 하나로"""
+        return "\n\n".join(self.lines())
+
+class NullLog(BattleLog):
+    """헤드리스 실행용 로그 (아무것도 저장하지 않음)"""
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(maxlen=0)
+
+    def append(self, level, template, args):
+        pass
+
+NULL_LOG = NullLog()  # 헤드리스 세션이 공유
+
+class RunRandom:
+    """런 단위 난수. 용도별 스트림(shuffle/enemy/reward/draft)이 독립이라 한쪽의 난수 소비가
+    다른 쪽 결과를 바꾸지 않음. 세션 메모리를 아끼려고 Mersenne Twister 상태(약 2.5KB)를 들고 있지 않고,
+    스트림별 사건 번호만 세어 사건마다 (시드, 스테이지, 스트림, 번호)로 생성기를 새로 만듦.
+    번호는 전투마다 0부터 다시 세므로, 앞 전투가 몇 턴 걸렸든 같은 시드의 n번째 전투는
+    같은 셔플/적 행동 굴림을 받음 (페어 실험의 공통 난수)"""
+    __slots__ = ("seed", "stage", "shuffle", "enemy", "reward", "draft")
+    STREAMS = ("shuffle", "enemy", "reward", "draft")
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().randrange(2 ** 32)
+        self.seed = seed
+        self.begin_stage(-1)  # 드래프트/덱 구성
+
+    def begin_stage(self, stage):
+        """전투 시작 시 호출. 사건 번호를 스테이지 기준으로 초기화"""
+        self.stage = stage
+        for name in self.STREAMS:
+            setattr(self, name, 0)
+
+    def stream(self, name):
+        """name 스트림의 다음 사건용 random.Random"""
+        n = getattr(self, name)
+        setattr(self, name, n + 1)
+        return random.Random(f"{self.seed}:{self.stage}:{name}:{n}")
+
+_card_id = attrgetter("card_id")
+
+class CardZone(list):
+    """카드 구역(덱/손패/버린 덱). list처럼 쓰되 변경할 때마다 카드 ID별 장수(counts)를 갱신해서
+    덱 구성 표시가 전체 카드를 다시 세지 않고 서로 다른 카드 수만큼만 일하게 함.
+    indexed 구역(덱/버린 덱)은 카드 ID별 위치(positions)도 유지해서 조건 검색(ids_matching)과
+    특정 카드 꺼내기(take)가 구역 크기와 무관함. 셔플과 스냅샷 복원(restore) 뒤에는 위치 색인을
+    버려 두었다가(positions None) 처음 필요할 때 locate()가 다시 만듦.
+    덱 맨 위는 리스트 끝: 드로우는 pop(), 섞기는 shuffle()로 제자리에서"""
+    __slots__ = ("counts", "positions", "indexed")
+
+    def __init__(self, cards=(), indexed=True):
+        super().__init__(cards)
+        self.indexed = indexed
+        self.positions = None
+        self._reindex()
+
+    def __reduce__(self):
+        # 복사/피클 시 색인을 카드 목록에서 다시 만듦
+        return type(self), (list(self), self.indexed)
+
+    def _reindex(self):
+        self.counts = Counter(card.card_id for card in self)
+        if self.indexed:
+            self._build_positions()
+
+    def _build_positions(self):
+        positions = self.positions
+        if positions is None:
+            positions = self.positions = {}
+        else:
+            positions.clear()
+        for pos, card in enumerate(self):
+            spots = positions.get(card.card_id)
+            if spots is None:
+                positions[card.card_id] = [pos]
+            else:
+                spots.append(pos)
+
+    def locate(self):
+        """카드 ID -> 위치 목록 색인 (indexed 구역만). 복원 뒤 처음 호출될 때 다시 만듦"""
+        if self.positions is None:
+            self._build_positions()
+        return self.positions
+
+    def restore(self, cards, counts):
+        """스냅샷 복원: 카드 목록과 ID별 장수를 새 객체 없이 제자리에 되돌림"""
+        list.__setitem__(self, slice(None), cards)
+        self_counts = self.counts
+        self_counts.clear()
+        dict.update(self_counts, counts)
+        # 위치 색인은 검색/꺼내기에만 필요하므로 그때 다시 만들고, 그 전까지는 갱신도 생략
+        self.positions = None
+
+    def _discount(self, card, pos):
+        card_id = card.card_id
+        counts = self.counts
+        if counts[card_id] <= 1:
+            del counts[card_id]
+            if self.positions is not None:
+                del self.positions[card_id]
+        else:
+            counts[card_id] -= 1
+            if self.positions is not None:
+                self.positions[card_id].remove(pos)
+
+    def append(self, card):
+        positions = self.positions
+        if positions is not None:
+            spots = positions.get(card.card_id)
+            if spots is None:
+                positions[card.card_id] = [len(self)]
+            else:
+                spots.append(len(self))
+        super().append(card)
+        self.counts[card.card_id] += 1
+
+    def extend(self, cards):
+        for card in cards:
+            self.append(card)
+
+    def __iadd__(self, cards):
+        self.extend(cards)
+        return self
+
+    def pop(self, index=-1):
+        last = len(self) - 1
+        if index < 0:
+            index += last + 1
+        card = super().pop(index)
+        self._discount(card, index)
+        if index != last and self.positions is not None:
+            # 중간에서 빼면 뒤 카드들의 위치가 하나씩 당겨짐
+            for spots in self.positions.values():
+                spots[:] = [pos - 1 if pos > index else pos for pos in spots]
+        return card
+
+    def take(self, card_id, rng):
+        """card_id 카드 한 장을 꺼냄 (여러 장이면 rng로 무작위 선택). 맨 위 카드를 빈자리로 옮겨
+        O(1)로 빼므로 나머지 순서가 조금 바뀌지만, 무작위로 섞인 구역에서는 여전히 무작위 순서"""
+        positions = self.locate()
+        spots = positions[card_id]
+        pos = spots[int(rng.random() * len(spots))] if len(spots) > 1 else spots[0]
+        last = len(self) - 1
+        if pos != last:
+            top = list.__getitem__(self, last)
+            top_spots = positions[top.card_id]
+            top_spots[top_spots.index(last)] = pos
+            spots[spots.index(pos)] = last
+            card = list.__getitem__(self, pos)
+            list.__setitem__(self, pos, top)
+            list.__setitem__(self, last, card)
+        return self.pop()
+
+    def ids_matching(self, category_mask=0, tax_mask=0):
+        """유형/세목 비트 중 하나라도 겹치는 카드 ID 집합 (서로 다른 카드 수만큼만 확인)"""
+        # IntFlag 연산자는 느려서 int로 비교
+        category_mask, tax_mask = int(category_mask), int(tax_mask)
+        getitem = list.__getitem__
+        found = set()
+        for card_id, spots in self.locate().items():
+            card = getitem(self, spots[0])
+            if int(card.category_mask) & category_mask or int(card.tax_mask) & tax_mask:
+                found.add(card_id)
+        return found
+
+    def shuffle(self, rng, canonical=False):
+        """제자리 O(n) Fisher–Yates 셔플. 위치 색인은 복원(restore) 때처럼 버려 두고 locate()가 다시 만듦.
+        canonical이면 카드 ID순으로 정렬한 뒤 섞어서, 섞기 전 순서가 달라도 카드 구성이 같으면
+        결과가 같음 (페어 실험에서 덱 순서를 맞추기 위함. RunState.canonical_shuffle)"""
+        if canonical:
+            self.sort(key=_card_id)
+        random_, getitem, setitem = rng.random, list.__getitem__, list.__setitem__
+        for i in range(len(self) - 1, 0, -1):
+            j = int(random_() * (i + 1))
+            card = getitem(self, i)
+            setitem(self, i, getitem(self, j))
+            setitem(self, j, card)
+        self.positions = None
+
+    def insert(self, index, card):
+        super().insert(index, card)
+        self._reindex()
+
+    def remove(self, card):
+        self.pop(self.index(card))
+
+    def clear(self):
+        super().clear()
+        self.counts.clear()
+        if self.positions is not None:
+            self.positions.clear()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._reindex()
+
+@dataclass
+class RunState:
+    """한 판(런) 전체의 상태. Streamlit 없이도 동작하는 순수 파이썬 객체"""
+    game_state: str = "MAIN_MENU"
+    player_team: List[TaxManCard] = field(default_factory=list)
+    player_deck: CardZone = field(default_factory=CardZone)
+    player_hand: CardZone = field(default_factory=lambda: CardZone(indexed=False))
+    player_discard: CardZone = field(default_factory=CardZone)
+    just_created: Counter = field(default_factory=Counter)  # 이번에 생성된 카드 ID별 장수 (카드 자체는 공유 객체)
+    player_artifacts: ArtifactList = field(default_factory=ArtifactList)  # .effects: 트리거별 효과 테이블
+    team_hp: int = 0
+    team_max_hp: int = 0
+    player_focus_current: int = 0
+    player_focus_max: int = 0
+    team_stats: Dict[str, int] = field(default_factory=lambda: {'analysis': 0, 'persuasion': 0, 'evidence': 0, 'data': 0})
+    abilities: TeamAbilities = field(default_factory=TeamAbilities)  # 팀 구성 변경 시 recalculate_team_stats에서 갱신
+    card_costs: Dict[int, tuple] = field(default_factory=dict)  # id(card) -> (card, 비용). invalidate_card_costs()로 비움
+    company_order: List[Company] = field(default_factory=list)
+    current_stage_level: int = 0
+    total_collected_tax: int = 0
+    battle: Optional[BattleState] = None
+    battle_log: BattleLog = field(default_factory=BattleLog)
+    selected_card_index: Optional[int] = None
+    draft_team_choices: List[TaxManCard] = field(default_factory=list)
+    draft_artifact_choices: List[Artifact] = field(default_factory=list)
+    bonus_reward_artifact: Optional[Artifact] = None
+    bonus_reward_member: Optional[TaxManCard] = None
+    reward_cards: List[LogicCard] = field(default_factory=list)
+    toasts: List[tuple] = field(default_factory=list)
+    rng: RunRandom = field(default_factory=RunRandom)  # start_draft()에서 런마다 새로 시드
+    actions: List[tuple] = field(default_factory=list)  # 리플레이 로그: (행동 이름, *인자). replay.py 참고
+    quiet: bool = False  # 헤드리스(시뮬레이션) 실행 시 로그/토스트 생략
+    canonical_shuffle: bool = False  # 섞기 전 카드 ID순 정렬 (페어 실험용, CardZone.shuffle 참고)
+
+    def __post_init__(self):
+        if self.quiet:
+            self.battle_log = NULL_LOG
+
+    @property
+    def current_battle_company(self):
+        return self.battle.company if self.battle else None
+
+    def toast(self, message, icon=None):
+        """UI에 띄울 알림 적재 (Streamlit 어댑터가 꺼내서 표시)"""
+        if not self.quiet:
+            self.toasts.append((message, icon))
+
+# --- 전투 스냅샷 ---
+class BattleSnapshot:
+    """전투 국면 스냅샷 (snapshot_battle/restore_battle). 카드 객체는 불변 공유 객체라서
+    구역은 카드 튜플로, 나머지는 정수/플래그 튜플로 평평하게 담음. 같은 전투(BattleState)에만 복원 가능"""
+    __slots__ = ("battle", "hand", "deck", "discard", "counts", "just_created", "tactics", "stats", "scalars", "rng")
+
+    def __init__(self, battle, hand, deck, discard, counts, just_created, tactics, stats, scalars, rng):
+        self.battle = battle
+        self.hand = hand
+        self.deck = deck
+        self.discard = discard
+        self.counts = counts
+        self.just_created = just_created
+        self.tactics = tactics
+        self.stats = stats
+        self.scalars = scalars
+        self.rng = rng
+
+def snapshot_battle(run):
+    """현재 전투 국면 저장 (수 마이크로초). 미리보기/탐색은 snapshot -> 진행 -> restore를 반복.
+    로그와 알림은 저장하지 않으므로 탐색은 quiet 세션에서 할 것"""
+    battle = run.battle
+    co = battle.company
+    hand, deck, discard = run.player_hand, run.player_deck, run.player_discard
+    tactics = []
+    for t in co.tactics:
+        tactics.append(t.exposed_amount)
+        tactics.append(t.is_cleared)
+    rng = run.rng
+    return BattleSnapshot(
+        battle, tuple(hand), tuple(deck), tuple(discard),
+        (dict(hand.counts), dict(deck.counts), dict(discard.counts)),
+        dict(run.just_created), tuple(tactics), tuple(battle.stats.values()),
+        (run.game_state, run.team_hp, run.player_focus_current, run.player_focus_max, run.selected_card_index,
+         run.total_collected_tax, run.bonus_reward_artifact, run.bonus_reward_member, co.current_collected_tax,
+         battle.bonus_draw, battle.turn_first_card_played, battle.kim_dj_effect_used, battle.cost_reduction_active,
+         battle.cost_reduction_active_just_used, battle.hit_effect_company, battle.hit_effect_player),
+        (rng.stage, rng.shuffle, rng.enemy, rng.reward, rng.draft),
+    )
+
+def restore_battle(run, snap):
+    """스냅샷 시점으로 되돌림. 기존 구역/딕셔너리를 제자리에서 덮어쓰므로 구역이나 카드 객체를 새로 만들지 않음"""
+    battle = run.battle
+    if battle is not snap.battle:
+        raise ValueError("다른 전투의 스냅샷입니다")
+    co = battle.company
+
+    counts_hand, counts_deck, counts_discard = snap.counts
+    run.player_hand.restore(snap.hand, counts_hand)
+    run.player_deck.restore(snap.deck, counts_deck)
+    run.player_discard.restore(snap.discard, counts_discard)
+    run.just_created.clear()
+    dict.update(run.just_created, snap.just_created)
+
+    values = snap.tactics
+    for i, t in enumerate(co.tactics):
+        t.exposed_amount = values[2 * i]
+        t.is_cleared = values[2 * i + 1]
+    stats = battle.stats
+    for key, value in zip(stats, snap.stats):
+        stats[key] = value
+
+    (run.game_state, run.team_hp, run.player_focus_current, run.player_focus_max, run.selected_card_index,
+     run.total_collected_tax, run.bonus_reward_artifact, run.bonus_reward_member, co.current_collected_tax,
+     battle.bonus_draw, battle.turn_first_card_played, battle.kim_dj_effect_used, battle.cost_reduction_active,
+     battle.cost_reduction_active_just_used, battle.hit_effect_company, battle.hit_effect_player) = snap.scalars
+    rng = run.rng
+    rng.stage, rng.shuffle, rng.enemy, rng.reward, rng.draft = snap.rng
+    run.card_costs.clear()
+
+def fork_battle(run, seed=None):
+    """현재 전투 국면을 복사한 헤드리스 RunState (탐색용. 원래 세션과 변경 가능한 상태를 공유하지 않음).
+    난수는 seed로 새로 시드하므로 원래 런의 앞으로의 셔플/적 행동 굴림을 미리 보지 않음"""
+    battle = run.battle
+    co = CompanyInstance(battle.company.template)
+    co.current_collected_tax = battle.company.current_collected_tax
+    for mine, theirs in zip(co.tactics, battle.company.tactics):
+        mine.exposed_amount, mine.is_cleared = theirs.exposed_amount, theirs.is_cleared
+    fork = RunState(
+        game_state=run.game_state,
+        player_team=list(run.player_team),
+        player_deck=CardZone(run.player_deck),
+        player_hand=CardZone(run.player_hand, indexed=False),
+        player_discard=CardZone(run.player_discard),
+        just_created=Counter(run.just_created),
+        player_artifacts=ArtifactList(run.player_artifacts),
+        team_hp=run.team_hp,
+        team_max_hp=run.team_max_hp,
+        player_focus_current=run.player_focus_current,
+        player_focus_max=run.player_focus_max,
+        team_stats=dict(run.team_stats),
+        abilities=run.abilities,
+        company_order=run.company_order,
+        current_stage_level=run.current_stage_level,
+        total_collected_tax=run.total_collected_tax,
+        battle=replace(battle, company=co, stats=dict(battle.stats), damage_rows=dict(battle.damage_rows)),
+        rng=RunRandom(seed),
+        quiet=True,
+        canonical_shuffle=run.canonical_shuffle,
+    )
+    fork.rng.begin_stage(run.current_stage_level)
+    return fork
+
+# --- 대미지 계산 클래스 ---
+class DamageCalculator:
+    """대미지 계산을 담당하는 클래스"""
+
+    BASIC_CARDS = ["기본 자료 대사", "기본 경비 적정성 검토",
+                   "경비 처리 오류 지적", "세금계산서 대사"]
+    STAGE_BONUS = {3: 50, 2: 30, 1: 15}
+    
+    def __init__(self, card, tactic, company, abilities, team_stats, stage_level):
+        self.card = card
+        self.tactic = tactic
+        self.company = company
+        self.abilities = abilities
+        self.team_stats = team_stats
+        self.stage_level = stage_level
+        self.log_messages = []
+        
+    def calculate(self, penalty_mult=1.0):
+        """모든 대미지 계산을 수행하고 결과 반환"""
+        result = {
+            'base_damage': self.card.base_damage,
+            'stage_bonus': 0,
+            'team_bonus': 0,
+            'ability_bonus': 0,
+            'multiplier': 1.0,
+            'multiplier_desc': [],
+            'final_damage': 0,
+            'logs': []
+        }
+        
+        # 1. 기본 대미지 + 스테이지 보너스
+        base_with_stage = self._calculate_base_and_stage_bonus()
+        result['stage_bonus'] = base_with_stage - self.card.base_damage
+        
+        # 2. 규모 보정
+        scaled_damage = self._apply_scale_correction(base_with_stage)
+        
+        # 3. 팀 스탯 보너스
+        team_bonus = self._calculate_team_bonus()
+        result['team_bonus'] = team_bonus
+        
+        # 4. 캐릭터 어빌리티 보너스
+        ability_bonus = self._calculate_ability_bonus()
+        result['ability_bonus'] = ability_bonus
+        
+        total_damage = scaled_damage + team_bonus + ability_bonus
+        
+        # 5. 승수 계산
+        multiplier, mult_desc = self._calculate_multipliers()
+        result['multiplier'] = multiplier * penalty_mult
+        result['multiplier_desc'] = mult_desc
+        
+        # 최종 대미지
+        result['final_damage'] = int(total_damage * result['multiplier'])
+        result['logs'] = self.log_messages
+        
+        return result
+    
+    @classmethod
+    def batch(cls, hand, tactics, company, abilities, team_stats, stage_level, penalty_mult=1.0):
+        """손패 × 혐의 전체의 최종 대미지 행렬을 NumPy로 한 번에 계산
+
+        결과[i, j]는 hand[i]로 tactics[j]를 공격할 때 calculate()의 final_damage와 같고,
+        마지막 열은 잔여 혐의(ResidualTactic) 대상 값입니다. 로그는 만들지 않습니다.
+        """
+        n = len(hand)
+        method_types = [t.method_type for t in tactics] + [MethodType.ERROR]
+        if n == 0:
+            return np.zeros((0, len(method_types)), dtype=np.int64)
+
+        # 카드 특성 벡터
+        base = np.empty(n, dtype=np.int64)
+        is_basic = np.empty(n, dtype=bool)
+        is_cost_or_common = np.empty(n, dtype=bool)
+        is_capital = np.empty(n, dtype=bool)
+        is_precedent = np.empty(n, dtype=bool)
+        is_seizure = np.empty(n, dtype=bool)
+
+        for i, card in enumerate(hand):
+            cats = card.attack_category
+            base[i] = card.base_damage
+            is_basic[i] = card.name in cls.BASIC_CARDS
+            is_cost_or_common[i] = any(c in [AttackCategory.COST, AttackCategory.COMMON] for c in cats)
+            is_capital[i] = AttackCategory.CAPITAL in cats
+            is_precedent[i] = '판례' in card.name
+            is_seizure[i] = '압수' in card.name
+
+        def positive_int(value):
+            value = int(value)
+            return value if value > 0 else 0
+
+        # 1~2. 기본 대미지 + 숙련 보너스, 규모 보정
+        damage = base + np.where(is_basic, cls.STAGE_BONUS.get(stage_level, 0), 0)
+        capped = cls._scale_factor(company)
+        if abs(capped - 1.0) > 0.01:
+            damage = np.trunc(damage * capped).astype(np.int64)
+
+        # 3. 팀 스탯 보너스
+        damage = damage + np.where(is_cost_or_common, positive_int(team_stats["analysis"] * 0.5), 0)
+        damage = damage + np.where(is_capital, positive_int(team_stats["data"] * 1.0), 0)
+        damage = damage + np.where(is_precedent, positive_int(team_stats["persuasion"] * 1.0), 0)
+        damage = damage + np.where(is_seizure, positive_int(team_stats["evidence"] * 1.5), 0)
+
+        # 4~5. 어빌리티 보너스와 승수는 혐의 유형별로 한 번씩만 훅을 평가해 열에 펼침
+        #      (승수는 스칼라 경로와 같은 순서로 곱해 부동소수 결과를 일치시킴)
+        unique_methods = list(dict.fromkeys(method_types))
+        column = np.array([unique_methods.index(m) for m in method_types], dtype=np.int64)
+        bonus = np.zeros((n, len(unique_methods)), dtype=np.int64)
+        mult = np.ones((n, len(unique_methods)), dtype=np.float64)
+        for i, card in enumerate(hand):
+            for j, method in enumerate(unique_methods):
+                bonus[i, j] = cls._ability_bonus(card, method, abilities, team_stats)[0]
+                mult[i, j] = cls._multiplier(card, method, company, abilities)[0]
+
+        total = damage[:, None] + bonus[:, column]
+        mult = mult[:, column] * penalty_mult
+
+        return np.trunc(total * mult).astype(np.int64)
+
+    def _calculate_base_and_stage_bonus(self):
+        """기본 대미지 + 스테이지 숙련 보너스"""
+        base = self.card.base_damage
+        
+        if self.card.name in self.BASIC_CARDS:
+            bonus = self.STAGE_BONUS.get(self.stage_level, 0)
+            
+            if bonus > 0:
+                self.log_messages.append(("📈 [숙련도] +{}억원", (bonus,)))
+            return base + bonus
+        
+        return base
+    
+    def _apply_scale_correction(self, damage):
+        """기업 규모에 따른 보정"""
+        capped = self._scale_factor(self.company)
+        
+        if abs(capped - 1.0) > 0.01:
+            scaled = int(damage * capped)
+            self.log_messages.append(("⚖️ [규모 보정] {}→{}억원", (damage, scaled)))
+            return scaled
+        
+        return damage
+    
+    @staticmethod
+    def _scale_factor(company):
+        """기업 규모(목표 세액) 보정 계수"""
+        ref = 500
+        scale = (company.tax_target / ref) ** 0.5 if company.tax_target > 0 else 0.5
+        return max(0.5, min(2.5, scale))
+    
+    def _calculate_team_bonus(self):
+        """팀 스탯 보너스 계산"""
+        bonus = 0
+        stats = self.team_stats
+        
+        if any(c in [AttackCategory.COST, AttackCategory.COMMON] for c in self.card.attack_category):
+            analysis_bonus = int(stats["analysis"] * 0.5)
+            if analysis_bonus > 0:
+                bonus += analysis_bonus
+                self.log_messages.append(("🧠 [분석력] +{}억원", (analysis_bonus,)))
+        
+        if AttackCategory.CAPITAL in self.card.attack_category:
+            data_bonus = int(stats["data"] * 1.0)
+            if data_bonus > 0:
+                bonus += data_bonus
+                self.log_messages.append(("💾 [데이터] +{}억원", (data_bonus,)))
+        
+        if '판례' in self.card.name:
+            persuasion_bonus = int(stats["persuasion"] * 1.0)
+            if persuasion_bonus > 0:
+                bonus += persuasion_bonus
+                self.log_messages.append(("💬 [설득력] +{}억원", (persuasion_bonus,)))
+        
+        if '압수' in self.card.name:
+            evidence_bonus = int(stats["evidence"] * 1.5)
+            if evidence_bonus > 0:
+                bonus += evidence_bonus
+                self.log_messages.append(("📂 [증거력] +{}억원", (evidence_bonus,)))
+        
+        return bonus
+    
+    def _calculate_ability_bonus(self):
+        """캐릭터 특수 능력 보너스"""
+        bonus, logs = self._ability_bonus(self.card, self.tactic.method_type, self.abilities, self.team_stats)
+        self.log_messages.extend(logs)
+        return bonus
+
+    @staticmethod
+    def _ability_bonus(card, method, abilities, team_stats):
+        """on_damage_bonus 훅 합산. (보너스, [(로그 템플릿, 인자)]) 반환"""
+        bonus = 0
+        logs = []
+        for hook in abilities.on_damage_bonus:
+            hit = hook(card, method, team_stats)
+            if hit and hit[0] > 0:
+                bonus += hit[0]
+                logs.append(("✨ [{}] +{}억원", (hit[1], hit[0])))
+        return bonus, logs
+
+    def _calculate_multipliers(self):
+        """각종 승수 계산"""
+        return self._multiplier(self.card, self.tactic.method_type, self.company, self.abilities)
+
+    @staticmethod
+    def _multiplier(card, method, company, abilities):
+        """카드 자체 보너스와 on_multiplier 훅을 순서대로 곱함. (승수, 설명 목록) 반환"""
+        mult = 1.0
+        descriptions = []
+
+        # 카드 자체 보너스
+        if card.special_bonus and card.special_bonus.get('target_method') == method:
+            mult *= card.special_bonus.get('multiplier', 1.0)
+            descriptions.append(f"🔥 [{card.special_bonus.get('bonus_desc')}]")
+
+        # 캐릭터 특수 승수
+        for hook in abilities.on_multiplier:
+            hit = hook(card, method, company)
+            if hit:
+                mult *= hit[0]
+                descriptions.append(hit[1])
+
+        return mult, descriptions
+
+
+# --- 교육 시스템 ---
+class EducationalSystem:
+    """교육적 피드백과 팁을 제공하는 시스템"""
+    
+    GLOSSARY = {
+        "부당행위계산부인": "특수관계자 간 거래에서 시가와 다른 가격으로 거래하여 부당하게 이익을 이전한 경우, 정상가격으로 재계산하여 과세하는 제도",
+        "조세피난처": "법인세율이 매우 낮거나 없으며, 금융 정보 공개를 거부하는 국가나 지역. 역외탈세의 주요 수단으로 활용됨",
+        "이전가격": "특수관계에 있는 기업 간 거래 가격. 이를 조작하여 소득을 저세율 국가로 이전할 수 있음",
+        "고정사업장(PE)": "외국 기업이 국내에서 사업을 영위하는 고정된 장소. 고정사업장이 인정되면 국내 법인세 과세 대상",
+        "가공경비": "실제 지출이 없거나 실체가 없는 거래에 대해 허위로 계상한 비용",
+        "차명계좌": "타인의 명의를 빌려 개설한 계좌. 자금 흐름을 숨기고 탈세하는데 악용됨",
+        "손금불산입": "회계상 비용으로 계상되었으나 세법상 비용으로 인정되지 않는 항목. 법인세 계산 시 소득에 가산됨",
+        "자료상": "실물 거래 없이 세금계산서만 거래하여 부당한 세액공제를 도와주고 수수료를 받는 불법 업체",
+        "정상가격(ALP)": "특수관계가 없는 독립된 기업 간 거래에서 적용될 가격. 이전가격 세제의 핵심 개념"
+    }
+    
+    @staticmethod
+    def get_attack_tip(card, tactic, multiplier):
+        """공격 시 교육적 팁 제공"""
+        tips = []
+        
+        if multiplier >= 2.0:
+            tips.append("💡 [조사 팁] 혐의 유형과 완벽하게 일치하는 카드로 최대 효과를 냈습니다!")
+        
+        if tactic.method_type == MethodType.INTENTIONAL and '압수' in card.name:
+            tips.append("💡 [조사 팁] 고의적 누락은 현장 증거 확보가 핵심입니다.")
+        elif tactic.method_type == MethodType.ERROR and '판례' in card.name:
+            tips.append("💡 [조사 팁] 단순 오류는 법령과 판례로 설득하는 것이 효과적입니다.")
+        elif tactic.method_type == MethodType.CAPITAL_TX and '자본' in card.name:
+            tips.append("💡 [조사 팁] 자본거래는 복잡한 자금 흐름 추적이 필요합니다.")
+        
+        return tips
+    
+    @staticmethod
+    def generate_battle_report(company, battle_stats):
+        """전투 종료 후 상세 보고서 생성"""
+        report = {
+            'efficiency': {
+                'damage_per_turn': battle_stats['total_damage_dealt'] / max(battle_stats['turns_taken'], 1),
+                'cards_per_turn': battle_stats['cards_played'] / max(battle_stats['turns_taken'], 1),
+                'target_achievement': (company.current_collected_tax / company.tax_target * 100) if company.tax_target > 0 else 0
+            },
+            'real_result': getattr(company, 'real_investigation_result', '조사 결과 정보가 없습니다.')
+        }
+        
+        return report
+
+
+# --- 3. 게임 로직 함수 ---
+
+def start_draft(run, seed=None):
+    """새 런 시작: 난수 시드 설정 후 조사팀 드래프트 후보 선정. seed가 없으면 임의 시드"""
+    run.rng = RunRandom(seed)
+    run.actions = []
+    rng = run.rng.stream("draft")
+    members = list(TAX_MAN_DB.values())
+    run.draft_team_choices = rng.sample(members, min(len(members), 3))
+    artifacts = list(ARTIFACT_DB.keys())
+    chosen_keys = rng.sample(artifacts, min(len(artifacts), 3))
+    run.draft_artifact_choices = [ARTIFACT_DB[k] for k in chosen_keys]
+    run.game_state = "GAME_SETUP_DRAFT"
+
+def initialize_game(run, chosen_lead: TaxManCard, chosen_artifact: Artifact):
+    """게임 초기화"""
+    rng = run.rng.stream("draft")
+    team_members = [chosen_lead]
+    all_mem = list(TAX_MAN_DB.values())
+    remain = [m for m in all_mem if m.name != chosen_lead.name]
+    team_members.extend(rng.sample(remain, min(2, len(remain))))
+    run.player_team = team_members
+
+    start_deck = [
+        LOGIC_CARD_DB["basic_01"], LOGIC_CARD_DB["basic_01"],
+        LOGIC_CARD_DB["basic_02"],
+        LOGIC_CARD_DB["b_tier_04"],
+        LOGIC_CARD_DB["c_tier_02"], LOGIC_CARD_DB["c_tier_02"],
+        LOGIC_CARD_DB["c_tier_01"], LOGIC_CARD_DB["c_tier_01"], LOGIC_CARD_DB["c_tier_01"],
+        LOGIC_CARD_DB["c_tier_01"], LOGIC_CARD_DB["c_tier_01"]
+    ]
+
+    run.player_deck = CardZone(start_deck)
+    run.player_deck.shuffle(run.rng.stream("shuffle"), run.canonical_shuffle)
+    run.player_hand = CardZone(indexed=False)
+    run.player_discard = CardZone()
+    run.player_artifacts = ArtifactList([chosen_artifact])
+    run.draft_team_choices = []
+    run.draft_artifact_choices = []
+
+    # 새 게임은 체력을 최대치로 재설정
+    recalculate_team_stats(run, reset_hp=True)
+
+    all_companies = sorted(COMPANY_DB, key=lambda x: x.tax_target)
+    group_c = [c for c in all_companies if c.difficulty_tier == DifficultyTier.EASY]
+    group_b = [c for c in all_companies if c.difficulty_tier == DifficultyTier.MEDIUM]
+    group_a = [c for c in all_companies if c.difficulty_tier == DifficultyTier.HARD]
+    group_s = [c for c in all_companies if c.difficulty_tier == DifficultyTier.EXPERT]
+
+    stage1 = rng.choice(group_c) if group_c else all_companies[0]
+    stage2 = rng.choice(group_b) if group_b else all_companies[1]
+    stage3 = rng.choice(group_a) if group_a else all_companies[2]
+    stage4 = rng.choice(group_s) if group_s else all_companies[3]
+
+    run.company_order = [stage1, stage2, stage3, stage4]
+
+    run.battle = None
+    run.battle_log.clear()
+    run.selected_card_index = None
+    run.reward_cards = []
+    run.bonus_reward_artifact = None
+    run.bonus_reward_member = None
+    run.game_state = "MAP"
+    run.current_stage_level = 0
+    run.total_collected_tax = 0
+
+def recalculate_team_stats(run, reset_hp=False):
+    """팀 스탯 재계산"""
+    team_members = run.player_team
+    run.team_max_hp = sum(m.hp for m in team_members)
+
+    if reset_hp:
+        run.team_hp = run.team_max_hp
+    else:
+        run.team_hp = min(run.team_hp, run.team_max_hp)
+
+    run.player_focus_max = sum(m.focus for m in team_members)
+    run.player_focus_current = min(run.player_focus_current, run.player_focus_max)
+    run.abilities = compile_team(team_members)
+    invalidate_card_costs(run)
+    if run.battle:
+        run.battle.damage_rows.clear()
+
+    run.team_stats = {
+        "analysis": sum(m.analysis for m in team_members),
+        "persuasion": sum(m.persuasion for m in team_members),
+        "evidence": sum(m.evidence for m in team_members),
+        "data": sum(m.data for m in team_members)
+    }
+
+    for stat, value in run.player_artifacts.effects.stat_bonus:
+        run.team_stats[stat] += value
+
+def start_player_turn(run):
+    """플레이어 턴 시작"""
+    battle = run.battle
+    battle.hit_effect_player = False
+    battle.stats['turns_taken'] += 1
+
+    run.player_focus_max = sum(m.focus for m in run.player_team)
+    run.player_focus_current = run.player_focus_max
+
+    battle.cost_reduction_active = False
+    for hook in run.abilities.on_turn_start:
+        msg = hook(run)
+        if msg:
+            log_message(run, msg, "info")
+
+    for hook in run.player_artifacts.effects.on_turn_start:
+        msg = hook(run)
+        if msg:
+            log_message(run, msg, "info")
+
+    run.player_focus_current = min(run.player_focus_current, run.player_focus_max + 10)
+
+    battle.bonus_draw = run.player_artifacts.effects.bonus_draw
+
+    draw_n = 4 + battle.bonus_draw
+    is_first_turn = battle.stats['turns_taken'] == 1
+
+    if battle.bonus_draw > 0 and is_first_turn:
+        log_message(run, "✨ 시작 보너스로 카드 {}장 추가 드로우!", "info", battle.bonus_draw)
+
+    draw_cards(run, draw_n)
+    check_draw_cards_in_hand(run)
+    log_message(run, "--- 플레이어 턴 시작 ---")
+    battle.turn_first_card_played = True
+    invalidate_card_costs(run)
+    run.selected_card_index = None
+
+def deck_counts(run):
+    """보유 카드 전체(덱 + 버린 덱 + 손패)의 카드 ID별 장수. 구역별 counts만 합침"""
+    counts = dict(run.player_deck.counts)
+    for zone in (run.player_discard, run.player_hand):
+        for card_id, n in zone.counts.items():
+            counts[card_id] = counts.get(card_id, 0) + n
+    return counts
+
+def search_card(run, category_mask):
+    """덱과 버린 덱에서 유형이 겹치는 카드 한 장을 무작위로 꺼내 반환 (없으면 None).
+    손패에 이미 있는 카드, 비용 0 카드, 공통 유형 카드, 드로우 카드는 제외.
+    후보는 구역 색인에서 카드 ID 단위로 모아 장수만큼 가중해 고르므로 덱 크기와 무관하고,
+    같은 카드가 덱에 있으면 덱에서 먼저 뺌"""
+    deck, discard, hand = run.player_deck, run.player_discard, run.player_hand
+    candidates, weights = [], []
+    for card_id in sorted(deck.ids_matching(category_mask) | discard.ids_matching(category_mask)):
+        if card_id in hand.counts:
+            continue
+        zone = deck if card_id in deck.counts else discard
+        card = zone[zone.locate()[card_id][0]]
+        if (card.cost <= 0 or CategoryFlag.COMMON in card.category_mask
+                or (card.special_effect and card.special_effect.get("type") == "draw")):
+            continue
+        candidates.append(card_id)
+        weights.append(deck.counts.get(card_id, 0) + discard.counts.get(card_id, 0))
+    if not candidates:
+        return None
+    rng = run.rng.stream("shuffle")
+    card_id = rng.choices(candidates, weights)[0]
+    return (deck if card_id in deck.counts else discard).take(card_id, rng)
+
+def draw_cards(run, num):
+    """카드 드로우"""
+    try:
+        drawn = []
+        for _ in range(num):
+            if not run.player_deck:
+                if not run.player_discard:
+                    log_message(run, "경고: 더 뽑을 카드 없음!", "error")
+                    break
+                log_message(run, "덱 리셔플.")
+                # 빈 덱과 버린 덱 구역을 맞바꾼 뒤 제자리에서 섞음 (복사 없음)
+                run.player_deck, run.player_discard = run.player_discard, run.player_deck
+                run.player_deck.shuffle(run.rng.stream("shuffle"), run.canonical_shuffle)
+                if not run.player_deck:
+                    log_message(run, "경고: 덱/버린 덱 모두 비었음!", "error")
+                    break
+            if not run.player_deck:
+                log_message(run, "경고: 덱 비었음!", "error")
+                break
+            card = run.player_deck.pop()
+            drawn.append(card)
+        run.player_hand.extend(drawn)
+    except Exception as e:
+        log_message(run, "⚠️ 카드 드로우 오류: {}", "error", str(e))
+
+def check_draw_cards_in_hand(run):
+    """손패의 드로우 카드 자동 실행"""
+    try:
+        created = Counter(run.just_created)
+        indices = []
+        for i, c in enumerate(run.player_hand):
+            if c.cost == 0 and c.special_effect and c.special_effect.get("type") == "draw":
+                if created[c.card_id] > 0:
+                    created[c.card_id] -= 1
+                    continue
+                indices.append(i)
+        indices.reverse()
+        total_draw = 0
+
+        for idx in indices:
+            if idx < len(run.player_hand):
+                card = run.player_hand.pop(idx)
+                run.player_discard.append(card)
+                val = card.special_effect.get('value', 0)
+                log_message(run, "✨ [{}] 효과! 카드 {}장 뽑기.", "info", card.name, val)
+
+                for hook in run.abilities.on_draw_effect:
+                    val, msg = hook(card, val)
+                    if msg:
+                        log_message(run, msg, "info")
+
+                total_draw += val
+            else:
+                log_message(run, "경고: 드로우 처리 인덱스 오류 (idx: {})", "error", idx)
+
+        run.just_created.clear()
+
+        if total_draw > 0:
+            draw_cards(run, total_draw)
+    except Exception as e:
+        log_message(run, "⚠️ 드로우 카드 처리 오류: {}", "error", str(e))
+
+def check_card_tactic_match(card, tactic):
+    """카드가 혐의에 사용 가능한지 (세목 일치 여부, 유형 일치 여부) 반환"""
+    is_tax = bool(card.tax_mask & (tactic.tax_mask | TaxFlag.COMMON))
+    is_cat = bool(card.category_mask & (tactic.category_mask | CategoryFlag.COMMON))
+    return is_tax, is_cat
+
+def build_tactic_compat(cards, tactics):
+    """카드 ID × 혐의 호환성 비트 행렬. 행은 j번째 혐의에 쓸 수 있으면 j번째 비트가 1인 정수"""
+    tax_masks = [int(t.tax_mask | TaxFlag.COMMON) for t in tactics]
+    cat_masks = [int(t.category_mask | CategoryFlag.COMMON) for t in tactics]
+    compat = {}
+    for card in cards:
+        row = 0
+        for j in range(len(tactics)):
+            if card.tax_mask & tax_masks[j] and card.category_mask & cat_masks[j]:
+                row |= 1 << j
+        compat[card.card_id] = row
+    return compat
+
+_COMPAT_BY_TEMPLATE = {}  # id(기업 템플릿) -> (템플릿, 호환성 행렬)
+
+def template_tactic_compat(co_template):
+    """기업 템플릿별 카드 × 혐의 호환성 행렬 (프로세스 내 모든 세션이 공유)"""
+    entry = _COMPAT_BY_TEMPLATE.get(id(co_template))
+    if entry is None or entry[0] is not co_template:
+        entry = (co_template, build_tactic_compat(LOGIC_CARD_DB.values(), co_template.tactics))
+        _COMPAT_BY_TEMPLATE[id(co_template)] = entry
+    return entry[1]
+
+def card_tactic_bits(run, card):
+    """현재 전투에서 카드로 공격 가능한 혐의 인덱스 비트열"""
+    compat = run.battle.tactic_compat
+    row = compat.get(card.card_id)
+    if row is None:
+        # 행렬은 같은 템플릿끼리 공유되지만, 행 값은 카드 ID와 혐의 구성만으로 정해지므로 추가해도 안전
+        row = build_tactic_compat([card], run.battle.company.tactics)[card.card_id]
+        if card.card_id:
+            compat[card.card_id] = row
+    return row
+
+def can_attack_tactic(run, card, tactic_index):
+    """카드로 tactic_index 혐의를 공격할 수 있는지 (비트 행렬 조회)"""
+    return bool(card_tactic_bits(run, card) >> tactic_index & 1)
+
+def battle_damage_matrix(run, penalty_mult=1.0):
+    """현재 손패 × 현재 기업 혐의(+잔여 혐의) 예상 대미지 행렬"""
+    co = run.battle.company
+    return DamageCalculator.batch(
+        run.player_hand, co.tactics, co,
+        run.abilities, run.team_stats, run.current_stage_level, penalty_mult
+    )
+
+def invalidate_card_costs(run):
+    """카드 비용 테이블 무효화
+
+    비용은 턴 시작, 턴 첫 카드 사용, 실무 지휘(cost_reduction_active) 소모,
+    팀/조사 도구 변경 때만 바뀌므로 그 시점에만 호출합니다.
+    """
+    run.card_costs.clear()
+
+def calculate_card_cost(run, card):
+    """카드 비용 조회. 같은 카드 객체는 다음 무효화 전까지 캐시된 값을 반환"""
+    entry = run.card_costs.get(id(card))
+    if entry is not None and entry[0] is card:
+        return entry[1]
+    cost = _compute_card_cost(run, card)
+    run.card_costs[id(card)] = (card, cost)
+    return cost
+
+def _compute_card_cost(run, card):
+    """카드 비용 계산"""
+    battle = run.battle
+    if battle:
+        return card_cost_in_state(run, card, battle.turn_first_card_played, battle.cost_reduction_active)
+    return card_cost_in_state(run, card, True, False)
+
+def card_cost_in_state(run, card, is_first, cost_reduction):
+    """턴 첫 카드 여부/실무 지휘 할인 여부를 지정해 카드 비용 계산 (턴 플래너가 가정 상태로 사용)"""
+    try:
+        original_cost = max(0, card.cost - 1)
+        cost = original_cost
+
+        for hook in run.abilities.on_cost:
+            cost = hook(card, cost, is_first)
+
+        if cost_reduction:
+            cost = max(0, cost - 1)
+
+        for delta in run.player_artifacts.effects.cost_delta.get(card.card_id, ()):
+            cost = max(0, cost + delta)
+
+        final_cost = max(0, cost + 1)
+        return final_cost
+
+    except Exception as e:
+        log_message(run, "⚠️ 카드 비용 계산 오류: {}", "error", str(e))
+        return card.cost
+
+def _pay_card_cost(run, card, cost):
+    """카드 비용 지불 및 턴 내 첫 카드/실무 지휘 플래그 처리"""
+    battle = run.battle
+    original_cost_plus_one = max(0, card.cost - 1) + 1
+    if battle.cost_reduction_active and cost < original_cost_plus_one:
+        battle.cost_reduction_active = False
+        battle.cost_reduction_active_just_used = True
+        invalidate_card_costs(run)
+
+    run.player_focus_current -= cost
+    battle.stats['cards_played'] += 1
+
+    if battle.turn_first_card_played:
+        battle.turn_first_card_played = False
+        invalidate_card_costs(run)
+
+def execute_utility_card(run, card_index):
+    """유틸리티 카드 실행 (드로우, 서치 등). 카드를 사용했으면 True"""
+    try:
+        if card_index is None or card_index >= len(run.player_hand):
+            return False
+
+        card = run.player_hand[card_index]
+        cost = calculate_card_cost(run, card)
+
+        if run.player_focus_current < cost:
+            run.toast(f"집중력 부족! ({cost})", icon="🧠")
+            return False
+
+        _pay_card_cost(run, card, cost)
+        battle = run.battle
+
+        effect = card.special_effect.get("type")
+
+        if effect == "search_draw":
+            cats = CategoryFlag(0)
+            for t in battle.company.tactics:
+                if not t.is_cleared:
+                    cats |= t.category_mask
+            if not cats:
+                log_message(run, "ℹ️ [빅데이터 분석] 분석할 혐의 없음.", "info")
+            else:
+                found = search_card(run, cats)
+                if found:
+                    log_message(run, "📊 [빅데이터 분석] '{}' 발견!", "success", found.name)
+                    run.player_hand.append(found)
+                    run.just_created[found.card_id] += 1
+                else:
+                    log_message(run, "ℹ️ [빅데이터 분석] 관련 카드 없음...", "info")
+
+        elif effect == "draw":
+            val = card.special_effect.get("value", 0)
+            log_message(run, "✨ [{}] 효과! 카드 {}장 드로우!", "info", card.name, val)
+            draw_cards(run, val)
+
+        if battle.cost_reduction_active_just_used:
+            log_message(run, "✨ [실무 지휘] 카드 비용 -1 적용!", "info")
+            battle.cost_reduction_active_just_used = False
+
+        run.player_discard.append(run.player_hand.pop(card_index))
+        run.selected_card_index = None
+        check_draw_cards_in_hand(run)
+        return True
+
+    except Exception as e:
+        log_message(run, "⚠️ 유틸리티 카드 실행 오류: {}", "error", str(e))
+        return False
+
+def select_card_to_play(run, card_index):
+    """카드 선택. 상태가 바뀌었으면 True"""
+    try:
+        if card_index >= len(run.player_hand):
+            run.toast("오류: 유효 카드 아님.", icon="🚨")
+            return False
+
+        card = run.player_hand[card_index]
+        cost = calculate_card_cost(run, card)
+
+        if run.player_focus_current < cost:
+            run.toast(f"집중력 부족! ({cost})", icon="🧠")
+            return False
+
+        if card.special_effect and card.special_effect.get("type") in ["search_draw", "draw"]:
+            return execute_utility_card(run, card_index)
+
+        run.selected_card_index = card_index
+        return True
+
+    except Exception as e:
+        log_message(run, "⚠️ 카드 선택 오류: {}", "error", str(e))
+        return False
+
+def cancel_card_selection(run):
+    """카드 선택 취소"""
+    run.selected_card_index = None
+
+def execute_attack(run, card_index, tactic_index, penalty_mult=1.0):
+    """공격 실행. 공격이 이루어졌으면 True"""
+    try:
+        if card_index is None or card_index >= len(run.player_hand):
+            run.toast("오류: 잘못된 카드 인덱스.", icon="🚨")
+            run.selected_card_index = None
+            return False
+
+        battle = run.battle
+        card = run.player_hand[card_index]
+        cost = calculate_card_cost(run, card)
+        company = battle.company
+        is_residual = tactic_index >= len(company.tactics)
+        tactic = ResidualTactic(company.tax_target - company.current_collected_tax) if is_residual else company.tactics[tactic_index]
+
+        if run.player_focus_current < cost:
+            run.toast(f"집중력 부족! ({cost})", icon="🧠")
+            run.selected_card_index = None
+            return False
+
+        _pay_card_cost(run, card, cost)
+
+        # 대미지 계산기 사용
+        calc = DamageCalculator(
+            card, tactic, company,
+            run.abilities,
+            run.team_stats,
+            run.current_stage_level
+        )
+        damage_result = calc.calculate(penalty_mult)
+        final_dmg = damage_result['final_damage']
+
+        # 대미지 적용
+        overkill = 0
+        overkill_contrib = 0
+
+        if is_residual:
+            dmg_tactic = final_dmg
+        else:
+            remain = tactic.total_amount - tactic.exposed_amount
+            dmg_tactic = min(final_dmg, remain)
+            overkill = final_dmg - dmg_tactic
+            overkill_contrib = int(overkill * 0.5)
+            tactic.exposed_amount += dmg_tactic
+
+        company.current_collected_tax += (dmg_tactic + overkill_contrib)
+        battle.stats['total_damage_dealt'] += (dmg_tactic + overkill_contrib)
+
+        # 공격 이펙트 표시
+        attack_emoji = "💥"
+        prefix = "▶️ [적중]"
+        is_crit = damage_result['multiplier'] >= 2.0
+
+        dmg_ratio = final_dmg / company.tax_target if company.tax_target > 0 else 0
+        hit_level = 0
+
+        if is_crit or dmg_ratio > 0.3:
+            hit_level = 3
+            prefix = "💥💥 [초 치명타!]"
+        elif damage_result['multiplier'] > 1.0 or dmg_ratio > 0.15:
+            hit_level = 2
+            prefix = "🔥🔥 [치명타!]"
+        elif final_dmg > 0:
+            hit_level = 1
+            prefix = "👍 [효과적!]"
+
+        battle.hit_effect_company = hit_level
+
+        if AttackCategory.COST in card.attack_category:
+            attack_emoji = "💸"
+        elif AttackCategory.REVENUE in card.attack_category:
+            attack_emoji = "📈"
+        elif AttackCategory.CAPITAL in card.attack_category:
+            attack_emoji = "🏦"
+        elif card.name == "현장 압수수색":
+            attack_emoji = "🔎"
+        elif card.name == "판례 제시":
+            attack_emoji = "⚖️"
+        elif AttackCategory.COMMON in card.attack_category:
+            attack_emoji = "📄"
+
+        run.toast(f"{attack_emoji} {final_dmg}억원!", icon=attack_emoji)
+
+        log_message(run, "{} '{}' → '{}'에 **{}억원** 피해!", "success", prefix, card.name, tactic.name, final_dmg)
+
+        # 계산 로그 출력
+        for template, args in damage_result['logs']:
+            log_message(run, "  ㄴ " + template, "info", *args)
+
+        for mult_desc in damage_result['multiplier_desc']:
+            log_message(run, "  ㄴ {}", "info", mult_desc)
+
+        if penalty_mult != 1.0:
+            log_message(run, "  ㄴ 🤖 [자동공격 페널티 x{:.2f}]", "info", penalty_mult)
+
+        if battle.cost_reduction_active_just_used:
+            log_message(run, "✨ [실무 지휘] 카드 비용 -1 적용!", "info")
+            battle.cost_reduction_active_just_used = False
+
+        # 교육 팁 표시
+        tips = EducationalSystem.get_attack_tip(card, tactic, damage_result['multiplier'])
+        for tip in tips:
+            log_message(run, tip, "info")
+
+        # 상황별 메시지
+        if not is_residual:
+            if "금융" in card.name:
+                log_message(run, "💬 금융 분석팀: 의심스러운 자금 흐름 포착!", "info")
+            elif "차명" in card.name:
+                log_message(run, "💬 조사팀: 은닉 계좌 추적 성공! 자금 흐름 확보!", "warning")
+            elif "압수" in card.name:
+                log_message(run, "💬 현장팀: 결정적 증거물 확보!", "warning")
+            elif "출처" in card.name:
+                log_message(run, "💬 조사팀: 자금 출처 소명 요구, 압박 수위 높임!", "info")
+            elif tactic.method_type == MethodType.INTENTIONAL and final_dmg > tactic.total_amount * 0.5:
+                log_message(run, "💬 조사팀: 고의적 탈루 정황 가중! 추가 조사 필요.", "warning")
+            elif tactic.method_type == MethodType.ERROR and '판례' in card.name:
+                log_message(run, "💬 법무팀: 유사 판례 제시하여 납세자 설득 중...", "info")
+
+            if final_dmg < 10 and damage_result['base_damage'] > 0:
+                log_message(run, "💬 조사관: 꼼꼼하게 증빙 대조 중...", "info")
+            elif final_dmg > 100:
+                log_message(run, "💬 조사팀장: 결정적인 한 방입니다!", "success")
+
+        if overkill > 0:
+            log_message(run, "📈 [초과 기여] 혐의 초과 {}억 중 {}억 추가 세액 확보!", "info", overkill, overkill_contrib)
+
+        if not is_residual and tactic.exposed_amount >= tactic.total_amount and not tactic.is_cleared:
+            tactic.is_cleared = True
+            battle.stats['tactics_cleared'] += 1
+            log_message(run, "🔥 [{}] 혐의 완전 적발 완료! (총 {}억원)", "warning", tactic.name, tactic.total_amount)
+
+            if "벤츠" in card.text:
+                log_message(run, "💬 [현장] 법인소유 벤츠 키 확보!", "info")
+            if "압수수색" in card.name:
+                log_message(run, "💬 [현장] 비밀장부 및 관련 증거물 다수 확보!", "info")
+
+        run.player_discard.append(run.player_hand.pop(card_index))
+        run.selected_card_index = None
+        check_battle_end(run)
+        return True
+
+    except Exception as e:
+        log_message(run, "⚠️ 공격 실행 오류: {}", "error", str(e))
+        run.toast(f"공격 실행 중 오류가 발생했습니다: {e}", icon="🚨")
+        return False
+
+# --- 턴 플래너 ---
+def damage_rows(run, cards, penalty_mult=1.0):
+    """카드별 (혐의..., 잔여 혐의) 예상 대미지. 대미지는 카드와 기업/팀 구성에만 달려 있으므로
+    전투 동안 카드 ID별로 메모이즈 (팀 스탯이 바뀌면 recalculate_team_stats에서 비움)"""
+    battle = run.battle
+    memo = battle.damage_rows
+    missing = list({c.card_id: c for c in cards if (c.card_id, penalty_mult) not in memo}.values())
+    if missing:
+        co = battle.company
+        matrix = DamageCalculator.batch(
+            missing, co.tactics, co, run.abilities, run.team_stats, run.current_stage_level, penalty_mult
+        )
+        for card, row in zip(missing, matrix.tolist()):
+            memo[card.card_id, penalty_mult] = tuple(row)
+    return [memo[c.card_id, penalty_mult] for c in cards]
+
+@dataclass(frozen=True)
+class TurnPlan:
+    """턴 공격 계획. steps는 계획 시점 손패 인덱스 기준 (카드 인덱스, 혐의 인덱스) 순서"""
+    steps: Tuple[Tuple[int, int], ...] = ()
+    collected: int = 0  # 계획대로 공격하면 확보되는 세액
+    focus_used: int = 0
+
+@dataclass(frozen=True, slots=True)
+class PlanCard:
+    """턴 플래너 입력 카드 (plan_entries). 카드와 팀/기업 구성에만 달려 있어 미리 만들어 둘 수 있음"""
+    card_id: str
+    damage: Tuple[int, ...]  # 혐의별 예상 대미지, 마지막 칸은 잔여 혐의
+    bits: int                # 공격 가능한 혐의 비트열
+    targets: Tuple[int, ...]  # 공격 가능한 혐의 인덱스
+    costs: Dict[Tuple[bool, bool], Tuple[int, bool]]  # (턴 첫 카드, 실무 지휘) -> (비용, 실무 지휘 소모 여부)
+    plain_cost: int          # 상한 계산용 할인 없는 비용 (최소 1)
+    discount: int            # 가장 큰 할인 폭
+    max_tactic_damage: int   # 혐의 중 최대 대미지
+    max_damage: int          # 잔여 혐의 포함 최대 대미지
+
+PLAN_NODE_LIMIT = 200  # 펼치는 상태 수 상한. 시간 대신 상태 수라 같은 입력이면 늘 같은 계획 (리플레이/env)
+
+def plannable(card):
+    """턴 플래너가 쓰는 카드인지. 드로우/서치 카드는 결과가 무작위라 계획에서 제외"""
+    return card.base_damage > 0 and not (card.special_effect and card.special_effect.get("type") in ["search_draw", "draw"])
+
+def plan_entries(run, cards, penalty_mult=1.0):
+    """카드별 턴 플래너 입력 (PlanCard)"""
+    entries = []
+    for card, row in zip(cards, damage_rows(run, cards, penalty_mult)):
+        # 소모 조건은 _pay_card_cost와 같음
+        full = max(0, card.cost - 1) + 1
+        costs = {}
+        for is_first in (True, False):
+            for reduction in (True, False):
+                cost = card_cost_in_state(run, card, is_first, reduction)
+                costs[is_first, reduction] = (cost, reduction and cost < full)
+        bits = card_tactic_bits(run, card)
+        plain = max(1, costs[False, False][0])
+        entries.append(PlanCard(
+            card.card_id, row, bits, tuple(t for t in range(len(row) - 1) if bits >> t & 1), costs, plain,
+            plain - min(cost for cost, _ in costs.values()), max(row[:-1], default=0), max(row)))
+    return entries
+
+def plan_turn(run, penalty_mult=1.0):
+    """남은 집중력으로 이번 턴 확보 세액이 최대가 되는 공격 순서와 대상 탐색 (plan_attacks 참고).
+    드로우/서치 카드는 계획에서 제외합니다."""
+    battle = run.battle
+    co = battle.company
+    hand_indices = [i for i, c in enumerate(run.player_hand) if plannable(c)]
+    if not hand_indices:
+        return TurnPlan()
+    remain = tuple(0 if t.is_cleared else t.total_amount - t.exposed_amount for t in co.tactics)
+    plan = plan_attacks(plan_entries(run, [run.player_hand[i] for i in hand_indices], penalty_mult),
+                        run.player_focus_current, battle.turn_first_card_played, battle.cost_reduction_active,
+                        remain, co.current_collected_tax, co.tax_target)
+    return replace(plan, steps=tuple((hand_indices[i], t) for i, t in plan.steps))
+
+def plan_attacks(entries, focus, is_first, reduction, remain, collected, target):
+    """plan_entries의 카드들로 이번 턴 확보 세액이 최대가 되는 공격 순서와 대상 탐색.
+    remain은 혐의별 남은 금액 (적발 완료 0), steps의 카드 인덱스는 entries 기준
+
+    초과분 50% 인정, 혐의 완료 후 잔여 혐의 공격, 목표 달성 시 전투 종료, 턴 첫 카드 할인과
+    실무 지휘(다음 카드 -1) 소모를 실제 규칙대로 반영합니다. 세액이 같으면 집중력을 덜 쓰는 계획.
+
+    분기 한정(branch-and-bound) 깊이 우선 탐색으로, 이미 본 상태는 다시 펼치지 않고 남은 카드로
+    얻을 수 있는 세액 상한이 현재 최선 이하이면 가지를 칩니다. 남은 카드로 어느 혐의도 완료할 수 없고
+    목표 세액에도 못 미치는 상태부터는 순서가 비용 할인에만 영향을 주므로 (집중력, 실무 지휘 사용)
+    배낭 DP로 나머지를 한 번에 풉니다. 턴 첫 카드 할인/실무 지휘가 끝난 뒤에는 같은 공격 집합을 정렬된
+    순서 하나로만 펼칩니다. 집중력이 커서 펼친 상태가 PLAN_NODE_LIMIT에 닿으면 그때까지의 최선 계획을 씁니다.
+    """
+    if not entries:
+        return TurnPlan()
+    n, residual = len(entries), len(remain)
+    rows = [card.damage for card in entries]
+    bits = [card.bits for card in entries]
+    compat = [card.targets for card in entries]
+    # 상태(턴 첫 카드, 실무 지휘)별 카드마다 (비용, 실무 지휘 소모 여부)
+    costs = {state: [card.costs[state] for card in entries] for state in entries[0].costs}
+    # 같은 카드가 여러 장이면 손패 순서대로만 써서 같은 계획을 중복 탐색하지 않음
+    twin, first_of = [], {}
+    for i, card in enumerate(entries):
+        j = first_of.setdefault(card.card_id, i)
+        twin.append(j if j < i else -1)
+
+    # 상한 계산은 할인 없는 비용으로 하고, 할인(턴 첫 카드/실무 지휘, 각각 카드 1장)만큼 집중력을 더 줌
+    plain_costs = [card.plain_cost for card in entries]
+    max_discount = max(card.discount for card in entries)
+    # 카드별 최대 대미지: 혐의만 / 잔여 혐의 포함
+    max_dmgs = {
+        False: [card.max_tactic_damage for card in entries],
+        True: [card.max_damage for card in entries],
+    }
+    dmg_orders = {key: sorted(range(n), key=lambda i: dmgs[i] / plain_costs[i], reverse=True)
+                  for key, dmgs in max_dmgs.items()}
+
+    def knapsack(items, focus, skip):
+        """분할 배낭 상한 (items는 가성비 순으로 채움. skip 카드는 제외)"""
+        bound = 0
+        for value, weight, i in items:
+            if i == skip:
+                continue
+            if weight <= focus:
+                bound += value
+                focus -= weight
+            else:
+                return bound + value * focus / weight
+        return bound
+
+    def budget(focus, is_first, reduction):
+        return focus + max_discount * (is_first + reduction)
+
+    def fill(with_residual, used, focus):
+        dmgs, total = max_dmgs[with_residual], 0
+        for i in dmg_orders[with_residual]:
+            if used >> i & 1:
+                continue
+            cost = plain_costs[i]
+            if cost <= focus:
+                total += dmgs[i]
+                focus -= cost
+            else:
+                return total + dmgs[i] * focus / cost
+        return total
+
+    def damage_left(used, focus, remain):
+        """집중력 focus(할인 포함)로 더 줄 수 있는 대미지 상한. 열린 혐의를 모두 완료할 수 없으면
+        잔여 혐의 대미지는 제외"""
+        open_total = sum(remain)
+        if open_total:
+            on_tactics = fill(False, used, focus)
+            if on_tactics < open_total:
+                return on_tactics
+        return fill(True, used, focus)
+
+    def gain_bounds(used, remain, left):
+        """남은 카드별 (확보액 상한, 할인 없는 비용, 카드)를 가성비 순으로. 남은 금액은 줄기만 하므로
+        지금 기준 확보액이 이후 모든 상태에서의 상한. 잔여 혐의는 열린 혐의를 이번 턴에 모두
+        완료할 수 있을 때(left: 앞으로 줄 수 있는 대미지 상한)만 후보"""
+        residual_open = sum(remain) <= left
+        items = []
+        for i in range(n):
+            if used >> i & 1:
+                continue
+            row = rows[i]
+            g = row[residual] if residual_open else 0
+            for t in compat[i]:
+                r = remain[t]
+                if r > 0:
+                    dmg = row[t]
+                    if dmg > r:
+                        dmg = r + int((dmg - r) * 0.5)
+                    if dmg > g:
+                        g = dmg
+            if g > 0:
+                items.append((g, plain_costs[i], i))
+        items.sort(key=lambda item: item[0] / item[1], reverse=True)
+        return items
+
+    def upper_bound(items, focus, need, skip=-1):
+        """남은 카드로 더 확보할 수 있는 세액 상한 (skip 카드 제외). 목표를 넘기는 공격 뒤에는 전투가
+        끝나므로 (목표까지 남은 세액 - 1) + 카드 1장 최대 확보액도 상한"""
+        top = 0
+        for g, _, i in items:
+            if g > top and i != skip:
+                top = g
+        if not top:
+            return 0
+        return min(knapsack(items, focus, skip), need - 1 + top)
+
+    def free_plan(used, focus, is_first, reduction, remain):
+        """혐의 완료/전투 종료가 일어날 수 없는 상태의 최선 나머지 계획: ((세액, -집중력), 단계)
+
+        각 카드는 가장 큰 대미지의 대상에 쓰고, 순서는 비용에만 영향을 줌: 첫 카드가 턴 첫 카드 할인을 받고,
+        실무 지휘가 남아 있으면 할인을 소모하지 않는 카드들을 먼저, 그다음 할인을 소모할 카드 1장(c*),
+        나머지 카드는 할인 없이. 첫 카드는 후보를 하나씩 정해 보고 나머지는 (집중력, c* 사용) 배낭 DP.
+        """
+        open_tactics = [t for t in range(residual) if remain[t] > 0]
+        gains, targets = {}, {}
+        for i in range(n):
+            if used >> i & 1:
+                continue
+            cols = [t for t in open_tactics if bits[i] >> t & 1] if open_tactics else [residual]
+            if cols:
+                t = max(cols, key=lambda col: rows[i][col])
+                if rows[i][t] > 0:
+                    gains[i], targets[i] = rows[i][t], t
+
+        result = ((0, 0), ())
+        for first in (list(gains) if is_first else [None]):
+            budget, active, head_gain = focus, reduction, 0
+            if first is not None:
+                cost, consumed = costs[True, reduction][first]
+                if cost > focus:
+                    continue
+                budget, active, head_gain = focus - cost, reduction and not consumed, gains[first]
+            # (남은 집중력, c* 사용 여부) -> ((세액, -집중력), 고른 카드 [(인덱스, 비용, c* 여부)])
+            states = {(budget, False): ((head_gain, -(focus - budget)), ())}
+            for i in gains:
+                if i == first:
+                    continue
+                options = []
+                if active:
+                    cost_on, consumes = costs[False, True][i]
+                    if consumes:
+                        options.append((cost_on, True))
+                        options.append((costs[False, False][i][0], False))
+                    else:
+                        options.append((cost_on, False))
+                else:
+                    options.append((costs[False, False][i][0], False))
+                for (left, star), (value, picks) in list(states.items()):
+                    for cost, is_star in options:
+                        if cost > left or (is_star and star):
+                            continue
+                        key = (left - cost, star or is_star)
+                        cand = ((value[0] + gains[i], value[1] - cost), picks + ((i, cost, is_star),))
+                        if key not in states or cand[0] > states[key][0]:
+                            states[key] = cand
+            value, picks = max(states.values(), key=lambda v: v[0])
+            if value > result[0]:
+                # 실행 순서: 첫 카드 → 할인 비소모 카드 → c* → 나머지
+                star_picks = [i for i, _, is_star in picks if is_star]
+                plain = [i for i, _, is_star in picks if not is_star]
+                if active and star_picks:
+                    order = [i for i in plain if not costs[False, True][i][1]] + star_picks + \
+                            [i for i in plain if costs[False, True][i][1]]
+                else:
+                    order = plain
+                steps = tuple((i, targets[i]) for i in ([first] if first is not None else []) + order)
+                result = (value, steps)
+        return result
+
+    start_collected = collected
+    best = [(0, 0), ()]  # [(확보 세액, -사용 집중력), 단계]
+    expanded = [0]
+    seen = {}  # 상태 -> 그 상태에서 펼친 순서 하한 (가장 작은 것)
+
+    def search(used, focus, is_first, reduction, remain, collected, spent, steps, last=(-1, -1)):
+        value = (collected - start_collected, -spent)
+        if value > best[0]:
+            best[0], best[1] = value, steps
+        if collected >= target:
+            return  # 목표 달성 시 전투 종료
+
+        # 남은 금액이 앞으로 줄 수 있는 대미지보다 큰 혐의는 이번 턴에 완료될 수 없어 정확한 금액이
+        # 이후 결과에 영향을 주지 않으므로 키에서는 '열림(-1)'으로만 표시
+        capacity = budget(focus, is_first, reduction)
+        left = damage_left(used, capacity, remain)
+        state = tuple([-1 if r > left else r for r in remain])
+        key = (used, focus, is_first, reduction, state, collected)
+        explored = seen.get(key)
+        if explored is not None and explored <= last:
+            return  # 같은 상태(같은 누적 세액/집중력)를 더 넓은 순서 범위로 이미 펼침
+        seen[key] = last
+
+        if collected + left < target and max(state) <= 0:
+            (gain, neg_focus), rest = free_plan(used, focus, is_first, reduction, remain)
+            total = (value[0] + gain, neg_focus - spent)
+            if total > best[0]:
+                best[0], best[1] = total, steps + rest
+            return
+
+        items = gain_bounds(used, remain, left)
+        if (value[0] + upper_bound(items, capacity, target - collected), -spent) <= best[0]:
+            return
+        if expanded[0] >= PLAN_NODE_LIMIT:
+            return  # 탐색량 상한: 지금까지 찾은 최선의 계획을 씀
+        expanded[0] += 1
+
+        # 턴 첫 카드 할인과 실무 지휘가 끝나면 비용이 순서와 무관하고, 혐의별 확보액은 그 혐의에 쓴
+        # 대미지 합으로만 정해짐. 그래서 같은 공격 집합은 (완료시키지 않는 공격, 혐의를 완료시키는 공격,
+        # 잔여 혐의 공격) 단계와 손패 순서로 정렬한 순서 하나로만 펼침. 목표에 닿는 공격은 늘 마지막이라 예외
+        canonical = not is_first and not reduction
+        open_tactics = [t for t in range(residual) if remain[t] > 0]
+        moves = []
+        state_costs = costs[is_first, reduction]
+        for i in range(n):
+            if used >> i & 1 or (twin[i] >= 0 and not used >> twin[i] & 1):
+                continue
+            cost, consumed = state_costs[i]
+            if cost > focus:
+                continue
+            row = rows[i]
+            targets = [t for t in open_tactics if bits[i] >> t & 1] if open_tactics else [residual]
+            for t in targets:
+                dmg = row[t]
+                if t == residual:
+                    gain, next_remain, order = dmg, remain, (2, i)
+                elif dmg < remain[t]:
+                    gain, order = dmg, (0, i)
+                    next_remain = remain[:t] + (remain[t] - dmg,) + remain[t + 1:]
+                else:
+                    gain, order = remain[t] + int((dmg - remain[t]) * 0.5), (1, i)
+                    next_remain = remain[:t] + (0,) + remain[t + 1:]
+                if canonical and order <= last and collected + gain < target:
+                    continue
+                moves.append((gain, -cost, i, t, consumed, next_remain, order if canonical else (-1, -1)))
+        # 좋은 계획을 먼저 찾을수록 가지치기가 잘 됨
+        moves.sort(key=itemgetter(0, 1), reverse=True)
+        for gain, neg_cost, i, t, consumed, next_remain, order in moves:
+            next_reduction, next_collected = reduction and not consumed, collected + gain
+            if next_collected >= target:
+                # 목표 달성 시 전투 종료
+                value = (next_collected - start_collected, neg_cost - spent)
+                if value > best[0]:
+                    best[0], best[1] = value, steps + ((i, t),)
+                continue
+            # 다음 상태의 상한도 이 상태의 카드별 상한으로 먼저 확인해, 가망 없는 상태는 펼치지 않음
+            if (next_collected - start_collected + upper_bound(
+                    items, budget(focus + neg_cost, False, next_reduction), target - next_collected, i),
+                    neg_cost - spent) <= best[0]:
+                continue
+            search(used | 1 << i, focus + neg_cost, False, next_reduction,
+                   next_remain, next_collected, spent - neg_cost, steps + ((i, t),), order)
+
+    search(0, focus, is_first, reduction, remain, collected, 0, ())
+    (gain, neg_focus), steps = best
+    return TurnPlan(steps=steps, collected=gain, focus_used=-neg_focus)
+
+AUTO_ATTACK_HP_COST = 5
+AUTO_ATTACK_PENALTY = 0.9
+
+def execute_auto_attack(run, *, plan=None):
+    """자동 공격 (턴 플래너 최적 계획의 첫 공격). 공격이 이루어졌으면 True.
+    plan: 지금 국면에서 이미 계산한 plan_turn(run, AUTO_ATTACK_PENALTY) 결과 (없으면 새로 계획)"""
+    try:
+        hp_cost = AUTO_ATTACK_HP_COST
+        if run.team_hp <= hp_cost:
+            run.toast(f"⚡ 자동 공격을 사용하기엔 팀 체력이 너무 낮습니다! (최소 {hp_cost+1} 필요)", icon="💔")
+            return False
+
+        affordable_attacks = []
+        for i, card in enumerate(run.player_hand):
+            if card.base_damage <= 0 or (card.special_effect and card.special_effect.get("type") in ["search_draw", "draw"]):
+                continue
+            cost = calculate_card_cost(run, card)
+            if run.player_focus_current >= cost:
+                affordable_attacks.append({'card': card, 'index': i, 'cost': cost})
+
+        if not affordable_attacks:
+            run.toast("⚡ 사용할 수 있는 자동 공격 카드가 없습니다.", icon="⚠️")
+            return False
+
+        if plan is None:
+            plan = plan_turn(run, penalty_mult=AUTO_ATTACK_PENALTY)
+        if not plan.steps:
+            run.toast(f"⚡ 현재 손패의 카드로 공격 가능한 혐의가 없습니다.", icon="⚠️")
+            return False
+
+        company = run.battle.company
+        current_idx, target_idx = plan.steps[0]
+        run.team_hp -= hp_cost
+        log_message(run, "⚡ 자동 공격 사용! (팀 체력 -{}, 피해량 10% 감소)", "warning", hp_cost)
+        run.toast(f"⚡ 자동 공격! (❤️-{hp_cost}, 💥-10%)", icon="🤖")
+
+        target_name = "[잔여 혐의 조사]" if target_idx >= len(company.tactics) else company.tactics[target_idx].name
+        log_message(run, "⚡ 자동 공격: '{}' -> '{}'!", "info", run.player_hand[current_idx].name, target_name)
+
+        execute_attack(run, current_idx, target_idx, penalty_mult=AUTO_ATTACK_PENALTY)
+        return True
+
+    except Exception as e:
+        log_message(run, "⚠️ 자동 공격 오류: {}", "error", str(e))
+        return False
+
+def execute_auto_turn(run):
+    """턴 자동 진행: 플래너 계획이 끝날 때까지 자동 공격 반복. 실행한 공격 수 반환"""
+    played = 0
+    while run.game_state == "BATTLE":
+        # 첫 공격 이후에는 더 할 공격이 없으면 경고 알림 없이 멈춤. 확인에 쓴 계획을 공격에 그대로 넘김
+        plan = None
+        if played:
+            if run.team_hp <= AUTO_ATTACK_HP_COST:
+                break
+            plan = plan_turn(run, penalty_mult=AUTO_ATTACK_PENALTY)
+            if not plan.steps:
+                break
+        if not execute_auto_attack(run, plan=plan):
+            break
+        played += 1
+    if played:
+        run.toast(f"🤖 턴 자동 진행: 공격 {played}회", icon="🤖")
+    return played
+
+# --- 과세 논리 개발 후보 색인 ---
+# 개발 점수 = 기본 점수(카드, 남은 혐의 유형) x 비용 보정. 기본 점수와 후보 순위는 콘텐츠에만
+# 달려 있으므로 (남은 혐의 카테고리, 남은 혐의 유형) 조합마다 콘텐츠 로드 시 한 번 정렬해 두고,
+# 개발할 때는 팀/조사 도구에 따라 달라지는 비용 보정만 계산합니다.
+DEVELOP_COST_PENALTY = 0.8  # 실제 비용 4 이상
+DEVELOP_COST_BONUS = 1.1    # 실제 비용 1 이하
+
+_DEVELOP_INDEX = (None, {})  # (카탈로그, {(카테고리 마스크, 유형 집합): 후보 순위})
+
+def build_develop_index(cards):
+    """(카테고리 마스크, 유형 집합) -> ((기본 점수, DB 순서, 카드), ...) 기본 점수 내림차순"""
+    pool = [(order, card) for order, card in enumerate(cards)
+            if card.base_damage > 0 and not (card.special_effect and card.special_effect.get("type") in ["search_draw", "draw"])]
+    methods = list(MethodType)
+    index = {}
+    for cat_bits in range(int(CategoryFlag.COMMON)):
+        target_cats = CategoryFlag(cat_bits) | CategoryFlag.COMMON
+        for method_bits in range(1 << len(methods)):
+            target_methods = frozenset(m for i, m in enumerate(methods) if method_bits >> i & 1)
+            ranked = []
+            for order, card in pool:
+                if not card.category_mask & target_cats:
+                    continue
+                score = card.base_damage
+                if card.special_bonus and card.special_bonus.get('target_method') in target_methods:
+                    score *= card.special_bonus.get('multiplier', 1.0) * 1.5
+                ranked.append((score, order, card))
+            ranked.sort(key=lambda entry: (-entry[0], entry[1]))
+            index[(target_cats, target_methods)] = tuple(ranked)
+    return index
+
+def develop_candidates(target_cats, target_methods):
+    """남은 혐의 카테고리/유형에 맞는 개발 후보 (기본 점수 내림차순). 콘텐츠가 바뀌면 다시 만듦"""
+    global _DEVELOP_INDEX
+    catalog, index = _DEVELOP_INDEX
+    if catalog is not content.CATALOG:
+        catalog = content.CATALOG
+        index = build_develop_index(LOGIC_CARD_DB.values())
+        _DEVELOP_INDEX = (catalog, index)
+    return index[(target_cats, target_methods)]
+
+def develop_targets(remaining_tactics, target_not_met):
+    """과세 논리 개발 대상 (카테고리 마스크, 혐의 유형 집합). 분석할 혐의가 없으면 None"""
+    if remaining_tactics:
+        target_cats = CategoryFlag.COMMON
+        target_methods = set()
+        for t in remaining_tactics:
+            target_cats |= t.category_mask
+            target_methods.add(t.method_type)
+        return target_cats, frozenset(target_methods)
+    if target_not_met:
+        return CategoryFlag.COMMON, frozenset((MethodType.ERROR,))
+    return None
+
+def develop_choice(run, target_cats, target_methods):
+    """과세 논리 개발로 얻을 카드 (현재 비용 기준). 없으면 None"""
+    best_card, best_order, max_score = None, -1, -1
+    # 기본 점수 내림차순 후보에 비용 보정(최대 x1.1)만 더함. 남은 후보가 현재 최고점을 넘을 수 없으면 중단
+    for score, order, card in develop_candidates(target_cats, target_methods):
+        if score * DEVELOP_COST_BONUS < max_score:
+            break
+        card_actual_cost = calculate_card_cost(run, card)
+        if card_actual_cost > 3:
+            score *= DEVELOP_COST_PENALTY
+        if card_actual_cost <= 1:
+            score *= DEVELOP_COST_BONUS
+
+        # 동점이면 DB 순서가 앞선 카드
+        if score > max_score or (score == max_score and order < best_order):
+            max_score, best_order, best_card = score, order, card
+    return best_card
+
+def develop_tax_logic(run):
+    """과세 논리 개발. 카드를 얻었으면 True"""
+    try:
+        hp_cost = math.ceil(run.team_hp / 2)
+        if run.team_hp <= 1 or (run.team_hp - hp_cost) <= 0:
+            run.toast("💡 체력이 너무 낮아 과세 논리를 개발할 수 없습니다.", icon="💔")
+            return False
+
+        run.team_hp -= hp_cost
+
+        company = run.battle.company
+        targets = develop_targets([t for t in company.tactics if not t.is_cleared],
+                                  company.current_collected_tax < company.tax_target)
+        if targets is None:
+            run.toast("💡 더 이상 분석할 혐의가 없습니다.", icon="ℹ️")
+            run.team_hp += hp_cost
+            return False
+
+        best_card = develop_choice(run, *targets)
+        if best_card:
+            run.player_hand.append(best_card)
+            run.just_created[best_card.card_id] += 1
+            log_message(run, "💡 [과세 논리 개발] '{}' 획득! (팀 체력 -{})", "warning", best_card.name, hp_cost)
+            run.toast(f"💡 '{best_card.name}' 획득! (❤️-{hp_cost})", icon="💡")
+            run.battle.hit_effect_player = True
+            return True
+
+        log_message(run, "💡 [과세 논리 개발] 적절한 카드를 찾지 못함.", "info")
+        run.toast("💡 적절한 카드를 찾지 못했습니다.", icon="ℹ️")
+        run.team_hp += hp_cost
+        return False
+
+    except Exception as e:
+        log_message(run, "⚠️ 과세 논리 개발 오류: {}", "error", str(e))
+        return False
+
+def end_player_turn(run):
+    """플레이어 턴 종료"""
+    try:
+        battle = run.battle
+        battle.kim_dj_effect_used = False
+        battle.cost_reduction_active = False
+        battle.cost_reduction_active_just_used = False
+        invalidate_card_costs(run)
+
+        run.player_discard.extend(run.player_hand)
+        run.player_hand.clear()
+        run.selected_card_index = None
+
+        log_message(run, "--- 기업 턴 시작 ---")
+        enemy_turn(run)
+
+        if not check_battle_end(run):
+            start_player_turn(run)
+
+    except Exception as e:
+        log_message(run, "⚠️ 턴 종료 오류: {}", "error", str(e))
+
+def enemy_turn(run):
+    """적 턴"""
+    try:
+        co = run.battle.company
+        rng = run.rng.stream("enemy")
+        act = rng.choice(co.defense_actions)
+        min_d, max_d = co.team_hp_damage
+        dmg = rng.randint(min_d, max_d)
+        run.team_hp -= dmg
+        run.battle.hit_effect_player = True
+
+        run.toast(f"❤️ 팀 체력 -{dmg}!", icon="💔")
+
+        log_icon = "🏢"
+        if "로펌" in act or "법무팀" in act or "법리" in act:
+            log_icon = "⚖️"
+        elif "자료" in act or "서버" in act or "장부" in act:
+            log_icon = "📁"
+        elif "압력" in act or "여론전" in act or "항변" in act:
+            log_icon = "🗣️"
+        elif "도피" in act or "잠적" in act or "시간" in act:
+            log_icon = "⏳"
+
+        prefix = f"{log_icon} [기업]" if not (co.size in ["대기업", "외국계", "글로벌 기업"] and "로펌" in act) else f"{log_icon} [로펌]"
+        log_message(run, "{} {} (팀 사기 저하 ❤️-{}!)", "error", prefix, act, dmg)
+
+    except Exception as e:
+        log_message(run, "⚠️ 적 턴 오류: {}", "error", str(e))
+
+def check_battle_end(run):
+    """전투 종료 체크"""
+    try:
+        company = run.battle.company
+
+        if company.current_collected_tax >= company.tax_target:
+            bonus = company.current_collected_tax - company.tax_target
+            log_message(run, "🎉 [조사 승리] 목표 {:,}억원 달성! (초과 {:,}억원)", "success", company.tax_target, bonus)
+            run.total_collected_tax += company.current_collected_tax
+
+            heal_amount = int(run.team_max_hp * 0.25)
+            run.team_hp = min(run.team_max_hp, run.team_hp + heal_amount)
+            log_message(run, "🩺 [전투 승리] 팀 정비. (체력 +{})", "success", heal_amount)
+
+            last_card_text = run.player_discard[-1].text if run.player_discard else ""
+            run.toast(f"승리! \"{last_card_text}\"" if last_card_text else "승리!", icon="🎉")
+
+            run.bonus_reward_artifact = None
+            run.bonus_reward_member = None
+            next_state = "REWARD"
+            rng = run.rng.stream("reward")
+
+            if rng.random() < 0.31:
+                current_artifact_names = [art.name for art in run.player_artifacts]
+                available_artifacts = [art for art in ARTIFACT_DB.values() if art.name not in current_artifact_names]
+                if available_artifacts:
+                    new_artifact = rng.choice(available_artifacts)
+                    run.bonus_reward_artifact = new_artifact
+                    log_message(run, "🎁 [전리품 발견] 새로운 조사 도구 '{}' 발견!", "info", new_artifact.name)
+                    next_state = "REWARD_BONUS"
+
+            if next_state != "REWARD_BONUS" and rng.random() < 0.73:
+                current_member_names = [m.name for m in run.player_team]
+                available_members = [m for m in TAX_MAN_DB.values() if m.name not in current_member_names]
+                if available_members:
+                    new_member = rng.choice(available_members)
+                    run.bonus_reward_member = new_member
+                    log_message(run, "👥 [지원군 발견] '{}' 조사관 발견!", "info", new_member.name)
+                    next_state = "REWARD_BONUS"
+
+            run.game_state = next_state
+            return True
+
+        if run.team_hp <= 0:
+            run.team_hp = 0
+            log_message(run, "‼️ [조사 중단] 팀 체력 소진...", "error")
+            run.game_state = "GAME_OVER"
+            return True
+
+        return False
+
+    except Exception as e:
+        log_message(run, "⚠️ 전투 종료 체크 오류: {}", "error", str(e))
+        return False
+
+def abandon_battle(run):
+    """전투 포기 (조사 중단). 시뮬레이터가 턴 수 상한에 걸린 전투를 끝낼 때 리플레이에 남기려고 사용"""
+    if run.game_state == "BATTLE":
+        log_message(run, "‼️ [조사 중단] 조사 기한 초과...", "error")
+        run.game_state = "GAME_OVER"
+
+def start_battle(run, co_template):
+    """전투 시작"""
+    try:
+        co = CompanyInstance(co_template)
+        run.rng.begin_stage(run.current_stage_level)
+        run.battle = BattleState(company=co, tactic_compat=template_tactic_compat(co_template))
+        run.game_state = "BATTLE"
+        run.battle_log.clear()
+        log_message(run, "--- {} ({}) 조사 시작 ---", "normal", co.name, co.size)
+
+        log_message(run, "🏢 **{}** 주요 탈루 혐의:", "info", co.name)
+
+        t_types = set()
+        for t in co.tactics:
+            tax_str = ', '.join(get_enum_values(t.tax_type))
+            method_val = safe_get_enum_value(t.method_type, "메소드 오류")
+            category_val = safe_get_enum_value(t.tactic_category, "카테고리 오류")
+
+            log_message(run, "- **{}** ({}, {}, {})", "info", t.name, tax_str, method_val, category_val)
+            t_types.add(t.method_type)
+
+        log_message(run, "---", "info")
+        guide = "[조사 가이드] "
+        has_g = False
+
+        if MethodType.INTENTIONAL in t_types:
+            guide += "고의 탈루: 증거 확보, 압박 중요. "
+            has_g = True
+        if MethodType.CAPITAL_TX in t_types or co.size in ["대기업", "외국계", "글로벌 기업"]:
+            guide += "자본/국제 거래: 자금 흐름, 법규 분석 필요. "
+            has_g = True
+        if MethodType.ERROR in t_types and MethodType.INTENTIONAL not in t_types:
+            guide += "단순 오류: 규정/판례 제시, 설득 효과적. "
+            has_g = True
+
+        log_message(run, guide if has_g else "[조사 가이드] 기업 특성/혐의 고려, 전략적 접근.", "warning")
+        log_message(run, "---", "info")
+
+        recalculate_team_stats(run)
+
+        # 드로우 보너스는 start_player_turn에서 매 턴 적용
+        for art in run.player_artifacts:
+            log_message(run, "✨ [조사도구] '{}' 효과 준비.", "info", art.name)
+
+        run.player_deck.extend(run.player_discard)
+        run.player_deck.shuffle(run.rng.stream("shuffle"), run.canonical_shuffle)
+        run.player_discard.clear()
+        run.player_hand.clear()
+        run.selected_card_index = None
+
+        start_player_turn(run)
+
+    except Exception as e:
+        log_message(run, "⚠️ 전투 시작 오류: {}", "error", str(e))
+
+def log_message(run, template, level="normal", *args):
+    """로그 이벤트 추가. template은 str.format 형식이며 화면에 표시할 때만 args로 포맷"""
+    run.battle_log.append(level, template, args)
+
+def accept_bonus_reward(run):
+    """보너스 보상(조사 도구 또는 팀원) 획득"""
+    if run.bonus_reward_artifact:
+        art = run.bonus_reward_artifact
+        run.player_artifacts.append(art)
+        log_message(run, "🎁 조사 도구 '{}' 정식 획득!", "success", art.name)
+        run.toast(f"획득: {art.name}", icon="🧰")
+    elif run.bonus_reward_member:
+        member = run.bonus_reward_member
+        run.player_team.append(member)
+        log_message(run, "👥 '{}' 조사관 정식 합류!", "success", member.name)
+        run.toast(f"합류: {member.name}", icon="👨‍💼")
+    recalculate_team_stats(run)
+    run.bonus_reward_artifact = None
+    run.bonus_reward_member = None
+    run.game_state = "REWARD"
+
+def decline_bonus_reward(run):
+    """보너스 보상 거절"""
+    if run.bonus_reward_artifact:
+        log_message(run, "🗑️ 조사 도구 '{}' 획득 포기.", "warning", run.bonus_reward_artifact.name)
+    elif run.bonus_reward_member:
+        log_message(run, "🚶 '{}' 조사관 영입 거절.", "warning", run.bonus_reward_member.name)
+    run.bonus_reward_artifact = None
+    run.bonus_reward_member = None
+    run.game_state = "REWARD"
+
+def roll_reward_cards(run):
+    """승리 보상 카드 후보 3장 추첨"""
+    co = run.battle.company
+    rng = run.rng.stream("reward")
+    pool = [c for c in LOGIC_CARD_DB.values()
+           if not (c.cost == 0 and c.special_effect and c.special_effect.get("type") == "draw")]
+    opts = []
+
+    has_cap = any(t.method_type == MethodType.CAPITAL_TX for t in co.tactics)
+    if has_cap:
+        cap_cards = [c for c in pool if AttackCategory.CAPITAL in c.attack_category and c not in opts]
+        if cap_cards:
+            opts.append(rng.choice(cap_cards))
+            run.toast("ℹ️ [보상 가중치] '자본' 카드 1장 포함!")
+
+    remain = [c for c in pool if c not in opts]
+    num_add = 3 - len(opts)
+
+    if len(remain) < num_add:
+        opts.extend(rng.sample(remain, len(remain)))
+    else:
+        opts.extend(rng.sample(remain, num_add))
+
+    while len(opts) < 3 and len(pool) > 0:
+        add = rng.choice(pool)
+        if add not in opts or len(pool) < 3:
+            opts.append(add)
+
+    run.reward_cards = opts
+    return opts
+
+def finish_game(run):
+    """마지막 스테이지 승리 후 최종 결과(게임 클리어)로 이동"""
+    if run.current_stage_level >= len(run.company_order) - 1:
+        run.game_state = "GAME_CLEAR"
+
+def go_to_next_stage(run, add_card=None):
+    """다음 스테이지로"""
+    if add_card:
+        run.player_deck.append(add_card)
+        run.toast(f"[{add_card.name}] 덱 추가!", icon="🃏")
+
+    run.reward_cards = []
+    run.bonus_reward_artifact = None
+    run.bonus_reward_member = None
+
+    run.current_stage_level += 1
+
+    if run.current_stage_level >= len(run.company_order):
+        run.game_state = "GAME_CLEAR"
+    else:
+        run.game_state = "MAP"
@@ -0,0 +1,852 @@
+"""전투 강화학습 환경 (Gym 스타일)
+
+N개 전투를 같은 박자로 진행하는 VectorEnv와, 그 한 칸짜리 래퍼인 TaxBattleEnv.
+gymnasium에 의존하지 않지만 reset()/step()의 반환 형식은 gymnasium과 같습니다.
+
+환경마다 seed로 드래프트를 한 번 해서 팀/조사 도구/시작 덱/stage 기업(시나리오)을 정하고,
+reset()마다 같은 시나리오의 전투를 새 셔플/적 행동 굴림으로 다시 시작합니다.
+이전 스테이지 보상(카드, 도구, 팀원)은 반영하지 않습니다.
+
+전투 진행은 엔진 함수를 부르지 않고 NumPy 배열 커널로 모든 전투를 한 번에 계산합니다.
+규칙 중 팀/기업 구성에만 달린 부분은 시나리오마다 엔진으로 한 번 컴파일해 표로 둡니다:
+    대미지       DamageCalculator.batch (자동 공격 x0.9 포함)
+    카드 비용    card_cost_in_state (턴 첫 카드 x 실무 지휘 할인)
+    혐의 호환성  build_tactic_compat
+    논리 개발    develop_targets/develop_choice (남은 혐의 조합 x 비용 상태)
+    빅데이터     search_card 후보 조건 (남은 혐의 조합)
+    턴 시작 훅   능력/조사 도구 훅을 빈 턴에 한 번 실행해 본 결과 (집중력, 할인, 추가 카드)
+    자동 공격    plan_turn의 카드별 입력 (plan_entries). 손패/국면 조합은 너무 많아 표로 만들지 않고
+                 자동 공격 때마다 plan_attacks 실행
+커널이 엔진과 다른 점:
+    셔플/적 대미지 난수는 RunRandom 대신 NumPy Generator (분포는 같고 시드별 결과는 다름)
+    손패는 HAND_CAP장, 덱은 CARD_CAP장까지 (넘치는 카드는 버린 덱으로. 실전에서는 닿지 않음)
+
+관측 (float32, 길이 OBS_SIZE):
+    OBS_HAND     손패 카드 번호 (카드 ID 정렬 순서 + 1, 빈칸 0). MAX_HAND장까지
+    OBS_STATUS   집중력, 최대 집중력, 팀 체력, 최대 팀 체력, 턴, 턴 첫 카드 여부, 실무 지휘 할인 여부
+    OBS_STATS    팀 스탯 (분석력, 설득력, 증거력, 데이터)
+    OBS_TACTICS  혐의별 (적발액, 총액). MAX_TACTICS개까지, 없는 칸 0
+    OBS_TAX      추징액, 목표 세액
+행동 (정수):
+    h * (MAX_TACTICS + 1) + t   손패 h번 카드로 혐의 t 공격 (t = MAX_TACTICS는 잔여 혐의,
+                                드로우/빅데이터 카드는 t = 0으로 사용)
+    END_TURN, AUTO_ATTACK, DEVELOP
+보상: 이번 행동으로 확보한 세액 / 목표 세액. 승리 +1, 패배 -1
+
+    python env.py --envs 1024 --steps 2000000
+"""
+import argparse
+import random
+import time
+from collections import Counter
+
+import numpy as np
+
+import content
+from content import LOGIC_CARD_DB
+from engine import (
+    RunState, CardZone, start_draft, initialize_game, start_battle, deck_counts,
+    DamageCalculator, card_cost_in_state, build_tactic_compat, invalidate_card_costs,
+    develop_targets, develop_choice, plannable, plan_entries, plan_attacks, plan_turn,
+    calculate_card_cost, card_tactic_bits, select_card_to_play, execute_attack, execute_auto_attack,
+    develop_tax_logic, end_player_turn, AUTO_ATTACK_HP_COST, AUTO_ATTACK_PENALTY
+)
+from models import CategoryFlag
+from simulate import MAX_TURNS_PER_BATTLE
+
+MAX_HAND = 10
+MAX_TACTICS = 4
+HAND_CAP = 24
+CARD_CAP = 128
+
+OBS_HAND = slice(0, MAX_HAND)
+OBS_STATUS = slice(OBS_HAND.stop, OBS_HAND.stop + 7)
+OBS_STATS = slice(OBS_STATUS.stop, OBS_STATUS.stop + 4)
+OBS_TACTICS = slice(OBS_STATS.stop, OBS_STATS.stop + 2 * MAX_TACTICS)
+OBS_TAX = slice(OBS_TACTICS.stop, OBS_TACTICS.stop + 2)
+OBS_SIZE = OBS_TAX.stop
+
+TARGETS = MAX_TACTICS + 1
+RESIDUAL = MAX_TACTICS
+END_TURN = MAX_HAND * TARGETS
+AUTO_ATTACK = END_TURN + 1
+DEVELOP = END_TURN + 2
+N_ACTIONS = DEVELOP + 1
+
+STAT_KEYS = ("analysis", "persuasion", "evidence", "data")
+
+# 카드 종류 (Scenario.kind)
+UNPLAYABLE, ATTACK, DRAW, SEARCH = 0, 1, 2, 3
+
+# --- 시나리오 컴파일 ---
+class Scenario:
+    """시나리오 하나의 규칙 표 (카드 번호 = card_ids 순서 + 1, 0은 빈칸)"""
+
+    def __init__(self, run, stage, card_ids, deck):
+        cards = [LOGIC_CARD_DB[card_id] for card_id in card_ids]
+        number = {card_id: n + 1 for n, card_id in enumerate(card_ids)}
+        size = len(cards) + 1
+        battle = run.battle
+        co = battle.company
+        tactics = co.tactics
+        if len(tactics) > MAX_TACTICS:
+            raise ValueError(f"혐의가 MAX_TACTICS({MAX_TACTICS})개보다 많은 기업: {co.name}")
+        n_tactics = len(tactics)
+
+        self.deck = np.array([number[card_id] for card_id, n in deck for _ in range(n)], dtype=np.int16)
+        self.totals = np.zeros(MAX_TACTICS, dtype=np.int64)
+        self.totals[:n_tactics] = [t.total_amount for t in tactics]
+        self.full_bits = (1 << n_tactics) - 1
+        self.tax_target = co.tax_target
+        self.enemy_damage = co.team_hp_damage
+        self.hp_max = run.team_max_hp
+        self.focus_max = run.player_focus_max
+        self.stats = [run.team_stats[key] for key in STAT_KEYS]
+
+        # 대미지 [자동 공격 여부, 카드, 대상] (잔여 혐의는 RESIDUAL 열)
+        self.damage = np.zeros((2, size, TARGETS), dtype=np.int64)
+        for auto, penalty in enumerate((1.0, AUTO_ATTACK_PENALTY)):
+            matrix = DamageCalculator.batch(cards, tactics, co, run.abilities, run.team_stats, stage, penalty)
+            self.damage[auto, 1:, :n_tactics] = matrix[:, :n_tactics]
+            self.damage[auto, 1:, RESIDUAL] = matrix[:, n_tactics]
+
+        # 비용 [카드, 턴 첫 카드, 실무 지휘 할인]. 비용이 (원래 비용 + 1)보다 작으면 할인 소모
+        self.cost = np.zeros((size, 2, 2), dtype=np.int64)
+        for n, card in enumerate(cards, 1):
+            for first in (0, 1):
+                for reduction in (0, 1):
+                    self.cost[n, first, reduction] = card_cost_in_state(run, card, bool(first), bool(reduction))
+        self.base_cost = np.array([0] + [max(0, card.cost - 1) + 1 for card in cards], dtype=np.int64)
+
+        compat = build_tactic_compat(cards, tactics)
+        self.compat = np.array([0] + [compat[card.card_id] for card in cards], dtype=np.int64)
+
+        self.kind = np.zeros(size, dtype=np.int8)
+        self.draw_value = np.zeros(size, dtype=np.int64)  # 드로우 카드를 낼 때 뽑는 장수
+        self.auto_play = np.zeros(size, dtype=bool)       # 손패에 들어오면 자동 실행되는 비용 0 드로우 카드
+        self.auto_value = np.zeros(size, dtype=np.int64)  # 자동 실행 때 뽑는 장수 (on_draw_effect 적용)
+        searchable = np.zeros(size, dtype=bool)
+        category = np.zeros(size, dtype=np.int64)
+        for n, card in enumerate(cards, 1):
+            effect = (card.special_effect or {}).get("type")
+            if effect == "draw":
+                self.kind[n] = DRAW
+                self.draw_value[n] = value = card.special_effect.get("value", 0)
+                if card.cost == 0:
+                    for hook in run.abilities.on_draw_effect:
+                        value, _ = hook(card, value)
+                    self.auto_play[n], self.auto_value[n] = True, value
+            elif effect == "search_draw":
+                self.kind[n] = SEARCH
+            elif card.base_damage > 0:
+                self.kind[n] = ATTACK
+            category[n] = int(card.category_mask)
+            searchable[n] = (card.cost > 0 and not int(card.category_mask) & int(CategoryFlag.COMMON)
+                             and effect != "draw")
+
+        # 남은 혐의 비트열별 빅데이터 후보 / 논리 개발 카드 [남은 혐의, 턴 첫 카드, 할인]
+        self.search_ok = np.zeros((1 << MAX_TACTICS, size), dtype=bool)
+        self.develop = np.zeros((1 << MAX_TACTICS, 2, 2), dtype=np.int64)
+        saved = battle.turn_first_card_played, battle.cost_reduction_active
+        for bits in range(1 << n_tactics):
+            remaining = [t for j, t in enumerate(tactics) if bits >> j & 1]
+            cats = 0
+            for t in remaining:
+                cats |= int(t.category_mask)
+            self.search_ok[bits] = searchable & (category & cats != 0)
+            # 전투 중에는 목표 미달이므로 혐의를 모두 적발하면 잔여 혐의(단순 오류) 대상
+            targets = develop_targets(remaining, True)
+            for first in (0, 1):
+                for reduction in (0, 1):
+                    battle.turn_first_card_played, battle.cost_reduction_active = bool(first), bool(reduction)
+                    invalidate_card_costs(run)
+                    card = develop_choice(run, *targets)
+                    self.develop[bits, first, reduction] = number[card.card_id] if card else 0
+        battle.turn_first_card_played, battle.cost_reduction_active = saved
+        invalidate_card_costs(run)
+
+        self._compile_turn_start(run, number)
+
+        # 자동 공격: 플래너 입력(카드별 대미지/비용/호환성)도 카드와 구성에만 달려 있어 카드마다 처음 나올 때
+        # 컴파일에 쓴 엔진 국면으로 한 번 만들어 두고, 매번 손패와 국면만 바꿔 plan_attacks 실행
+        self.n_tactics = n_tactics
+        self._cards = cards
+        self._planner = run
+        self._plan_entries = {}
+
+    def plan_entry(self, n):
+        """카드 번호 n의 플래너 입력 (PlanCard). 플래너가 쓰지 않는 카드면 None"""
+        entries = self._plan_entries
+        if n not in entries:
+            card = self._cards[n - 1]
+            entries[n] = plan_entries(self._planner, [card], AUTO_ATTACK_PENALTY)[0] if plannable(card) else None
+        return entries[n]
+
+    def auto_attack(self, hand, focus, first, reduction, remain, collected):
+        """자동 공격(execute_auto_attack = plan_turn(..., AUTO_ATTACK_PENALTY)의 첫 공격)의
+        (손패 위치, 대상). 계획이 없으면 None. remain은 혐의별 남은 금액 (적발 완료 0)"""
+        table = self._plan_entries
+        entries = [table[n] if n in table else self.plan_entry(n) for n in hand]
+        positions = [h for h, entry in enumerate(entries) if entry]
+        steps = plan_attacks([entries[h] for h in positions], focus, bool(first), bool(reduction),
+                             remain[:self.n_tactics], collected, self.tax_target).steps
+        if not steps:
+            return None
+        h, t = steps[0]
+        return positions[h], RESIDUAL if t >= self.n_tactics else t
+
+    def _compile_turn_start(self, run, number):
+        """턴 시작 훅을 빈 턴에 한 번 실행해 효과를 기록. 훅 효과는 팀 스탯과 턴 종료 때
+        풀리는 플래그(kim_dj_effect_used)에만 달려 있으므로 매 턴 같음"""
+        battle = run.battle
+        hand = run.player_hand
+        before = len(hand)
+        battle.kim_dj_effect_used = False
+        battle.cost_reduction_active = False
+        run.player_focus_current = 0
+        for hook in run.abilities.on_turn_start + run.player_artifacts.effects.on_turn_start:
+            hook(run)
+        self.focus_bonus = run.player_focus_current
+        self.reduction = battle.cost_reduction_active
+        self.turn_cards = [number[card.card_id] for card in hand[before:]]
+        if any(self.auto_play[n] for n in self.turn_cards):
+            raise ValueError("턴 시작에 얻는 비용 0 드로우 카드는 커널이 지원하지 않음")
+        del hand[before:]
+        run.just_created.clear()
+        battle.kim_dj_effect_used = False
+        battle.cost_reduction_active = False
+        self.bonus_draw = run.player_artifacts.effects.bonus_draw
+
+# 드래프트 결과(팀, 조사 도구, 덱, 기업, stage)가 같은 시나리오끼리 표를 공유
+_SCENARIOS = (None, {})
+
+def draft_scenario(seed, stage):
+    """seed로 드래프트(첫 후보 선택)해서 stage 기업 전투의 시나리오 표 반환"""
+    global _SCENARIOS
+    catalog, cache = _SCENARIOS
+    if catalog is not content.CATALOG:
+        cache = {}
+        _SCENARIOS = (content.CATALOG, cache)
+
+    run = RunState(quiet=True)
+    start_draft(run, seed=seed)
+    initialize_game(run, run.draft_team_choices[0], run.draft_artifact_choices[0])
+    co_template = run.company_order[stage]
+    deck = tuple(sorted(deck_counts(run).items()))
+    key = (tuple(m.name for m in run.player_team), tuple(a.name for a in run.player_artifacts),
+           deck, co_template.name, stage)
+    scenario = cache.get(key)
+    if scenario is None:
+        run.current_stage_level = stage
+        start_battle(run, co_template)
+        scenario = cache[key] = Scenario(run, stage, sorted(LOGIC_CARD_DB), deck)
+    return scenario
+
+# --- 벡터 환경 ---
+class VectorEnv:
+    """num_envs개 전투를 같은 박자로 진행. autoreset이면 끝난 전투는 바로 reset하고
+    그 전투의 마지막 관측은 info['final_observation']에 담음 (끝난 칸의 행만 의미 있음)"""
+
+    def __init__(self, num_envs, stage=0, seed=None, autoreset=True):
+        self.num_envs = num_envs
+        self.stage = stage
+        self.autoreset = autoreset
+        self._seeds = random.Random(seed)
+        self._draft()
+
+    def _draft(self):
+        """칸마다 시나리오를 드래프트해서 표를 (num_envs, ...) 배열로 쌓음"""
+        n = self.num_envs
+        self.draft_seeds = [self._seeds.getrandbits(32) for _ in range(n)]
+        scenarios = self.scenarios = [draft_scenario(seed, self.stage) for seed in self.draft_seeds]
+        self.rng = np.random.default_rng(self._seeds.getrandbits(64))
+
+        def stack(name, dtype=None):
+            return np.array([getattr(s, name) for s in scenarios], dtype=dtype)
+
+        self.damage = stack("damage")
+        self.cost = stack("cost")
+        self.base_cost = stack("base_cost")
+        self.compat = stack("compat")
+        self.kind = stack("kind")
+        self.draw_value = stack("draw_value")
+        self.auto_play = stack("auto_play")
+        self.auto_value = stack("auto_value")
+        self.search_ok = stack("search_ok")
+        self.develop = stack("develop")
+        self.totals = stack("totals")
+        self.full_bits = stack("full_bits", np.int64)
+        self.tax_target = stack("tax_target", np.int64)
+        self.enemy_low, self.enemy_high = stack("enemy_damage", np.int64).T
+        self.hp_max = stack("hp_max", np.int64)
+        self.focus_max = stack("focus_max", np.int64)
+        self.focus_start = np.minimum(self.focus_max + stack("focus_bonus", np.int64), self.focus_max + 10)
+        self.reduction_start = stack("reduction", np.int64)
+        self.draw_start = 4 + stack("bonus_draw", np.int64)
+        self.has_auto_play = bool(self.auto_play.any())
+
+        self.turn_cards = np.zeros((n, max(len(s.turn_cards) for s in scenarios)), dtype=np.int16)
+        self.start_deck = np.zeros((n, CARD_CAP), dtype=np.int16)
+        for i, s in enumerate(scenarios):
+            if len(s.deck) > CARD_CAP:
+                raise ValueError(f"시작 덱이 CARD_CAP({CARD_CAP})장보다 큼")
+            self.turn_cards[i, :len(s.turn_cards)] = s.turn_cards
+            self.start_deck[i, :len(s.deck)] = s.deck
+        self.start_deck_len = np.array([len(s.deck) for s in scenarios], dtype=np.int64)
+
+        # 전투 상태
+        self.hand = np.zeros((n, HAND_CAP), dtype=np.int16)
+        self.hand_len = np.zeros(n, dtype=np.int64)
+        self.deck = np.zeros((n, CARD_CAP), dtype=np.int16)  # 앞쪽 deck_len장, 맨 뒤가 맨 위 카드
+        self.deck_len = np.zeros(n, dtype=np.int64)
+        # 버린 덱은 리셔플 때 통째로 섞여 순서가 남지 않으므로 카드 번호별 장수만 둠
+        self.discard = np.zeros((n, self.kind.shape[1]), dtype=np.int64)
+        self.focus = np.zeros(n, dtype=np.int64)
+        self.hp = np.zeros(n, dtype=np.int64)
+        self.turn = np.zeros(n, dtype=np.int64)
+        self.first = np.zeros(n, dtype=np.int64)
+        self.reduction = np.zeros(n, dtype=np.int64)
+        self.exposed = np.zeros((n, MAX_TACTICS), dtype=np.int64)
+        self.open_bits = np.zeros(n, dtype=np.int64)  # 아직 적발하지 못한 혐의 비트열
+        self.collected = np.zeros(n, dtype=np.int64)
+
+        # 관측 중 전투 동안 변하지 않는 칸은 미리 채움
+        self.obs = np.zeros((n, OBS_SIZE), dtype=np.float32)
+        self.obs[:, OBS_STATS] = stack("stats")
+        self.obs[:, OBS_STATUS.start + 1] = self.focus_max
+        self.obs[:, OBS_STATUS.start + 3] = self.hp_max
+        self.obs[:, OBS_TACTICS.start + 1:OBS_TACTICS.stop:2] = self.totals
+        self.obs[:, OBS_TAX.start + 1] = self.tax_target
+        self._lanes = np.arange(n)
+        self._legal = None
+
+    # --- gymnasium 인터페이스 ---
+    def reset(self, seed=None, options=None):
+        """(관측, info). seed를 주면 시나리오도 그 seed로 다시 드래프트"""
+        if seed is not None:
+            self._seeds = random.Random(seed)
+            self._draft()
+        self._reset(self._lanes)
+        return self._observe(), {}
+
+    def step(self, actions):
+        """actions: 길이 num_envs 정수 배열. (관측, 보상, 종료, 중단, info).
+        불가능한 행동은 상태를 바꾸지 않고 info['illegal']에 표시"""
+        actions = np.asarray(actions, dtype=np.int64)
+        legal = self._legal_moves()
+        before = self.collected.copy()
+        illegal = (actions < 0) | (actions >= N_ACTIONS)
+
+        # 칸마다 행동은 하나이므로 행동 종류별로 해당 칸만 모아 처리
+        play = (actions >= 0) & (actions < END_TURN)
+        if play.any():
+            ix = self._lanes[play]
+            h, t = np.divmod(actions[play], TARGETS)
+            ok = legal[ix, h, t]
+            illegal[ix[~ok]] = True
+            ix, h, t = ix[ok], h[ok], t[ok]
+            utility = self.kind[ix, self.hand[ix, h]] >= DRAW
+            self._play_utility(ix[utility], h[utility])
+            self._attack(ix[~utility], h[~utility], t[~utility], 0)
+
+        auto = actions == AUTO_ATTACK
+        if auto.any():
+            ix = self._lanes[auto]
+            moves = [self._auto_move(i) if self.hp[i] > AUTO_ATTACK_HP_COST else None for i in ix]
+            ok = np.array([move is not None for move in moves])
+            illegal[ix[~ok]] = True
+            if ok.any():
+                ix = ix[ok]
+                h, t = np.array([move for move in moves if move is not None], dtype=np.int64).T
+                self.hp[ix] -= AUTO_ATTACK_HP_COST
+                self._attack(ix, h, t, 1)
+
+        develop = actions == DEVELOP
+        if develop.any():
+            ix = self._lanes[develop]
+            card = self.develop[ix, self.open_bits[ix], self.first[ix], self.reduction[ix]]
+            ok = (self.hp[ix] >= 2) & (card > 0)
+            illegal[ix[~ok]] = True
+            ix, card = ix[ok], card[ok]
+            self.hp[ix] -= (self.hp[ix] + 1) // 2
+            self._add_to_hand(ix, card)
+
+        end = actions == END_TURN
+        if end.any():
+            self._end_turn(self._lanes[end])
+
+        won = self.collected >= self.tax_target
+        lost = ~won & (self.hp <= 0)
+        terminated = won | lost
+        truncated = ~terminated & (self.turn > MAX_TURNS_PER_BATTLE)
+        rewards = ((self.collected - before) / self.tax_target + won - lost.astype(np.float64)).astype(np.float32)
+        info = {"illegal": illegal}
+
+        obs = self._observe()
+        done = terminated | truncated
+        if self.autoreset and done.any():
+            info["final_observation"] = obs
+            self._reset(self._lanes[done])
+            obs = self._observe()
+        return obs, rewards, terminated, truncated, info
+
+    def action_masks(self):
+        """(num_envs, N_ACTIONS) bool 배열"""
+        legal = self._legal_moves()
+        masks = np.zeros((self.num_envs, N_ACTIONS), dtype=bool)
+        masks[:, :END_TURN] = legal[:, :MAX_HAND].reshape(self.num_envs, -1)
+        masks[:, END_TURN] = True
+        # 플래너는 확보액이 0보다 큰 공격이 하나라도 있으면 계획을 내므로, 그런 공격이 있는지만 보면 됨
+        lanes = self._lanes[:, None]
+        attack = (legal & (self.kind[lanes, self.hand] == ATTACK)[:, :, None]
+                  & (self.damage[lanes, 1, self.hand] > 0))
+        masks[:, AUTO_ATTACK] = (self.hp > AUTO_ATTACK_HP_COST) & attack.any(axis=(1, 2))
+        develop = self.develop[self._lanes, self.open_bits, self.first, self.reduction]
+        masks[:, DEVELOP] = (self.hp >= 2) & (develop > 0)
+        return masks
+
+    # --- 규칙 커널 (ix: 칸 번호 배열) ---
+    def _legal_moves(self):
+        """(num_envs, HAND_CAP, TARGETS) 가능한 (손패, 대상). UI와 같은 규칙: 집중력이 되고,
+        열린 혐의 중 공격 가능한 혐의, 모두 적발했으면 잔여 혐의. 드로우/빅데이터 카드는 대상 0"""
+        if self._legal is not None:
+            return self._legal
+        lanes = self._lanes[:, None]
+        card = self.hand
+        in_hand = np.arange(HAND_CAP) < self.hand_len[:, None]
+        cost = self.cost[lanes, card, self.first[:, None], self.reduction[:, None]]
+        affordable = in_hand & (cost <= self.focus[:, None])
+        kind = self.kind[lanes, card]
+        attack = affordable & (kind == ATTACK)
+        bits = self.compat[lanes, card] & self.open_bits[:, None]
+        legal = np.empty((self.num_envs, HAND_CAP, TARGETS), dtype=bool)
+        for t in range(MAX_TACTICS):
+            legal[:, :, t] = attack & (bits >> t & 1).astype(bool)
+        legal[:, :, RESIDUAL] = attack & (self.open_bits == 0)[:, None]
+        legal[:, :, 0] |= affordable & (kind >= DRAW)
+        self._legal = legal
+        return legal
+
+    def _auto_move(self, i):
+        """칸 i의 자동 공격 (손패 위치, 대상) 또는 None"""
+        return self.scenarios[i].auto_attack(
+            self.hand[i, :self.hand_len[i]].tolist(), int(self.focus[i]), int(self.first[i]),
+            int(self.reduction[i]), tuple((self.totals[i] - self.exposed[i]).tolist()), int(self.collected[i]))
+
+    def _pay(self, ix, card):
+        """비용 지불 및 턴 첫 카드/실무 지휘 플래그 처리 (_pay_card_cost)"""
+        cost = self.cost[ix, card, self.first[ix], self.reduction[ix]]
+        self.reduction[ix] &= cost >= self.base_cost[ix, card]
+        self.focus[ix] -= cost
+        self.first[ix] = 0
+
+    def _attack(self, ix, h, t, auto):
+        """손패 h번 카드로 대상 t 공격. 초과분은 절반만 추징 (execute_attack)"""
+        if not ix.size:
+            return
+        card = self.hand[ix, h].astype(np.int64)
+        self._pay(ix, card)
+        damage = self.damage[ix, auto, card, t]
+        gain = damage.copy()
+        on_tactic = t != RESIDUAL
+        tx, tt, td = ix[on_tactic], t[on_tactic], damage[on_tactic]
+        hit = np.minimum(td, self.totals[tx, tt] - self.exposed[tx, tt])
+        self.exposed[tx, tt] += hit
+        gain[on_tactic] = hit + (td - hit) // 2
+        cleared = self.exposed[tx, tt] >= self.totals[tx, tt]
+        self.open_bits[tx[cleared]] &= ~(1 << tt[cleared])
+        self.collected[ix] += gain
+        self._pop_hand(ix, h)
+
+    def _play_utility(self, ix, h):
+        """드로우/빅데이터 카드 사용 (execute_utility_card와 같은 순서)"""
+        if not ix.size:
+            return
+        card = self.hand[ix, h].astype(np.int64)
+        self._pay(ix, card)
+        search = self.kind[ix, card] == SEARCH
+        for i in ix[search & (self.open_bits[ix] != 0)]:
+            self._search(i)
+        self._draw(ix[~search], self.draw_value[ix[~search], card[~search]])
+        self._pop_hand(ix, h)
+        self._auto_draw(ix)
+
+    def _search(self, i):
+        """빅데이터: 손패에 없는 후보 카드 한 장을 장수만큼 가중해 골라 덱(없으면 버린 덱)에서 손패로 (search_card)"""
+        size = self.discard.shape[1]
+        in_deck = np.bincount(self.deck[i, :self.deck_len[i]], minlength=size)
+        in_hand = np.bincount(self.hand[i, :self.hand_len[i]], minlength=size) > 0
+        weights = np.where(self.search_ok[i, self.open_bits[i]] & ~in_hand, in_deck + self.discard[i], 0)
+        total = weights.sum()
+        if total == 0:
+            return
+        card = int(np.searchsorted(np.cumsum(weights), self.rng.integers(total), side="right"))
+        if in_deck[card]:
+            # 같은 카드 중 한 장을 맨 위 카드와 맞바꿔 꺼냄 (CardZone.take)
+            top = self.deck_len[i] - 1
+            spot = self.rng.choice(np.flatnonzero(self.deck[i, :top + 1] == card))
+            self.deck[i, spot] = self.deck[i, top]
+            self.deck[i, top] = 0
+            self.deck_len[i] = top
+        else:
+            self.discard[i, card] -= 1
+        self._add_to_hand(np.array([i]), np.array([card]))
+
+    def _add_to_hand(self, ix, cards):
+        """손패 끝에 카드 추가. HAND_CAP을 넘는 카드는 버린 덱으로"""
+        self._legal = None
+        fits = self.hand_len[ix] < HAND_CAP
+        fx = ix[fits]
+        self.hand[fx, self.hand_len[fx]] = cards[fits]
+        self.hand_len[fx] += 1
+        if not fits.all():
+            np.add.at(self.discard, (ix[~fits], cards[~fits]), 1)
+
+    def _pop_hand(self, ix, h):
+        """손패 h번 카드를 버린 덱으로 (뒤 카드는 한 칸씩 당김)"""
+        self._legal = None
+        np.add.at(self.discard, (ix, self.hand[ix, h]), 1)
+        cols = np.arange(HAND_CAP)
+        src = np.minimum(cols + (cols >= h[:, None]), HAND_CAP - 1)
+        self.hand[ix] = np.take_along_axis(self.hand[ix], src, axis=1)
+        self.hand_len[ix] -= 1
+        self.hand[ix, self.hand_len[ix]] = 0
+
+    def _draw(self, ix, counts):
+        """칸마다 counts장 드로우. 덱이 비면 버린 덱을 섞어 새 덱으로 (draw_cards)"""
+        more = counts > 0
+        ix, counts = ix[more], counts[more]
+        while ix.size:
+            empty = self.deck_len[ix] == 0
+            if empty.any():
+                self._reshuffle(ix[empty])
+                alive = self.deck_len[ix] > 0
+                ix, counts = ix[alive], counts[alive]
+                if not ix.size:
+                    break
+            top = self.deck_len[ix] - 1
+            cards = self.deck[ix, top]
+            self.deck[ix, top] = 0
+            self.deck_len[ix] = top
+            self._add_to_hand(ix, cards)
+            counts = counts - 1
+            more = counts > 0
+            ix, counts = ix[more], counts[more]
+
+    def _reshuffle(self, ix):
+        """버린 덱 전체를 섞어 새 덱으로"""
+        counts = self.discard[ix]
+        total = counts.sum(axis=1)
+        if total.max() > CARD_CAP:
+            raise ValueError(f"보유 카드가 CARD_CAP({CARD_CAP})장을 넘음")
+        # 자리 p의 카드 번호 = 누적 장수가 p 이하인 카드 종류 수 (카드 번호 오름차순으로 펼침)
+        slots = np.arange(CARD_CAP)
+        cards = (slots[None, :, None] >= np.cumsum(counts, axis=1)[:, None, :]).sum(axis=2)
+        self._shuffle_into_deck(ix, np.where(slots < total[:, None], cards, 0), total)
+        self.discard[ix] = 0
+
+    def _shuffle_into_deck(self, ix, cards, total):
+        """cards의 앞쪽 total장을 무작위 순서로 덱에 배치"""
+        keys = self.rng.random((len(ix), CARD_CAP))
+        keys[np.arange(CARD_CAP) >= total[:, None]] = 2.0
+        self.deck[ix] = np.take_along_axis(cards, np.argsort(keys, axis=1), axis=1)
+        self.deck_len[ix] = total
+
+    def _auto_draw(self, ix):
+        """손패의 비용 0 드로우 카드를 자동 실행하고 그만큼 드로우 (check_draw_cards_in_hand)"""
+        if not self.has_auto_play or not ix.size:
+            return
+        card = self.hand[ix]
+        in_hand = np.arange(HAND_CAP) < self.hand_len[ix, None]
+        fire = in_hand & self.auto_play[ix[:, None], card]
+        rows = fire.any(axis=1)
+        if not rows.any():
+            return
+        ix, card, fire, in_hand = ix[rows], card[rows], fire[rows], in_hand[rows]
+        self._legal = None
+        rr, cc = np.nonzero(fire)
+        np.add.at(self.discard, (ix[rr], card[rr, cc]), 1)
+        counts = np.where(fire, self.auto_value[ix[:, None], card], 0).sum(axis=1)
+        # 남는 카드를 순서대로 앞으로 모음
+        kept = np.take_along_axis(card, np.argsort(fire | ~in_hand, axis=1, kind="stable"), axis=1)
+        self.hand_len[ix] -= fire.sum(axis=1)
+        kept[np.arange(HAND_CAP) >= self.hand_len[ix, None]] = 0
+        self.hand[ix] = kept
+        self._draw(ix, counts)
+
+    def _end_turn(self, ix):
+        """손패를 버리고 적 턴, 버티면 다음 턴 시작 (end_player_turn)"""
+        card = self.hand[ix]
+        rr, cc = np.nonzero(card)
+        np.add.at(self.discard, (ix[rr], card[rr, cc]), 1)
+        self.hand[ix] = 0
+        self.hand_len[ix] = 0
+        self.hp[ix] -= self.rng.integers(self.enemy_low[ix], self.enemy_high[ix] + 1)
+        alive = self.hp[ix] > 0
+        self.hp[ix[~alive]] = 0
+        self._start_turn(ix[alive])
+
+    def _start_turn(self, ix):
+        """턴 시작: 집중력 회복, 턴 시작 훅 효과, 드로우 (start_player_turn)"""
+        self._legal = None
+        self.turn[ix] += 1
+        self.focus[ix] = self.focus_start[ix]
+        self.reduction[ix] = self.reduction_start[ix]
+        for cards in self.turn_cards.T:
+            given = ix[cards[ix] > 0]
+            self._add_to_hand(given, cards[given])
+        self._draw(ix, self.draw_start[ix])
+        self._auto_draw(ix)
+        self.first[ix] = 1
+
+    def _reset(self, ix):
+        """같은 시나리오로 새 전투 (start_battle)"""
+        self.hand[ix] = 0
+        self.hand_len[ix] = 0
+        self.discard[ix] = 0
+        self._shuffle_into_deck(ix, self.start_deck[ix], self.start_deck_len[ix])
+        self.hp[ix] = self.hp_max[ix]
+        self.turn[ix] = 0
+        self.exposed[ix] = 0
+        self.open_bits[ix] = self.full_bits[ix]
+        self.collected[ix] = 0
+        self._start_turn(ix)
+
+    def _observe(self):
+        obs = self.obs
+        obs[:, OBS_HAND] = self.hand[:, :MAX_HAND]
+        status = OBS_STATUS.start
+        obs[:, status] = self.focus
+        obs[:, status + 2] = self.hp
+        obs[:, status + 4] = self.turn
+        obs[:, status + 5] = self.first
+        obs[:, status + 6] = self.reduction
+        obs[:, OBS_TACTICS.start:OBS_TACTICS.stop:2] = self.exposed
+        obs[:, OBS_TAX.start] = self.collected
+        return obs.copy()
+
+class TaxBattleEnv:
+    """전투 한 판 = 에피소드 (VectorEnv 한 칸). stage는 0~3 (company_order 순서).
+    끝난 뒤에는 reset()을 다시 불러야 함"""
+
+    def __init__(self, stage=0, seed=None):
+        self.vec = VectorEnv(1, stage=stage, seed=seed, autoreset=False)
+
+    def reset(self, seed=None, options=None):
+        """(관측, info). seed를 주면 시나리오도 그 seed로 다시 드래프트"""
+        obs, info = self.vec.reset(seed=seed)
+        return obs[0], info
+
+    def step(self, action):
+        """(관측, 보상, 종료, 중단, info)"""
+        obs, rewards, terminated, truncated, info = self.vec.step([action])
+        return (obs[0], float(rewards[0]), bool(terminated[0]), bool(truncated[0]),
+                {"illegal": True} if info["illegal"][0] else {})
+
+    def action_mask(self):
+        """길이 N_ACTIONS bool 배열"""
+        return self.vec.action_masks()[0]
+
+    def legal_actions(self):
+        """가능한 행동 번호 목록"""
+        return np.flatnonzero(self.action_mask()).tolist()
+
+def random_actions(masks, rng):
+    """행동 마스크에서 칸마다 가능한 행동 하나를 균등하게 고름"""
+    scores = rng.random(masks.shape)
+    scores[~masks] = -1.0
+    return scores.argmax(axis=1)
+
+# --- 엔진 대조 검사 ---
+# 커널과 엔진 전투를 같은 행동으로 나란히 진행하며 행동 마스크와 행동 뒤 상태를 비교 (python env.py --check).
+# 셔플/적 대미지 난수는 둘이 다르므로 행동마다 커널 상태를 엔진 국면에 옮긴 뒤 한 행동씩 비교하고,
+# 난수가 끼는 행동(턴 종료, 빅데이터, 버린 덱을 섞는 드로우)은 난수와 무관한 값만 비교
+def _sync_engine(run, vec, i, cards):
+    """칸 i의 커널 상태를 엔진 국면 run에 옮김"""
+    battle = run.battle
+    co = battle.company
+    run.player_hand = CardZone([cards[n - 1] for n in vec.hand[i, :vec.hand_len[i]]], indexed=False)
+    run.player_deck = CardZone([cards[n - 1] for n in vec.deck[i, :vec.deck_len[i]]])
+    run.player_discard = CardZone([cards[n - 1] for n, count in enumerate(vec.discard[i]) for _ in range(count)])
+    run.just_created.clear()
+    run.player_focus_current, run.team_hp = int(vec.focus[i]), int(vec.hp[i])
+    battle.turn_first_card_played, battle.cost_reduction_active = bool(vec.first[i]), bool(vec.reduction[i])
+    battle.kim_dj_effect_used = True  # 턴 시작 훅은 이번 턴에 이미 실행됨
+    for j, tactic in enumerate(co.tactics):
+        tactic.exposed_amount = int(vec.exposed[i, j])
+        tactic.is_cleared = not vec.open_bits[i] >> j & 1
+    co.current_collected_tax = int(vec.collected[i])
+    battle.stats['turns_taken'] = int(vec.turn[i])
+    run.game_state = "BATTLE"
+    invalidate_card_costs(run)
+
+def _engine_masks(run):
+    """엔진 규칙(UI/execute_* 함수)으로 만든 행동 마스크"""
+    co = run.battle.company
+    open_tactics = [j for j, t in enumerate(co.tactics) if not t.is_cleared]
+    masks = np.zeros(N_ACTIONS, dtype=bool)
+    for h, card in enumerate(run.player_hand[:MAX_HAND]):
+        if calculate_card_cost(run, card) > run.player_focus_current:
+            continue
+        if card.special_effect and card.special_effect.get("type") in ("draw", "search_draw"):
+            masks[h * TARGETS] = True
+        elif card.base_damage > 0 and open_tactics:
+            bits = card_tactic_bits(run, card)
+            for t in open_tactics:
+                masks[h * TARGETS + t] = bool(bits >> t & 1)
+        elif card.base_damage > 0:
+            masks[h * TARGETS + RESIDUAL] = co.current_collected_tax < co.tax_target
+    masks[END_TURN] = True
+    masks[AUTO_ATTACK] = (run.team_hp > AUTO_ATTACK_HP_COST
+                          and bool(plan_turn(run, penalty_mult=AUTO_ATTACK_PENALTY).steps))
+    if run.team_hp >= 2:
+        masks[DEVELOP] = develop_choice(run, *develop_targets([t for t in co.tactics if not t.is_cleared], True)) is not None
+    return masks
+
+def _engine_step(run, action):
+    """엔진 함수로 행동 실행. (행동 종류, 성공 여부)"""
+    if action == END_TURN:
+        end_player_turn(run)
+        return "end", True
+    if action == AUTO_ATTACK:
+        return "auto", execute_auto_attack(run)
+    if action == DEVELOP:
+        return "develop", develop_tax_logic(run)
+    h, t = divmod(action, TARGETS)
+    card = run.player_hand[h]
+    if card.special_effect:
+        return card.special_effect["type"], select_card_to_play(run, h)
+    return "attack", execute_attack(run, h, len(run.battle.company.tactics) if t == RESIDUAL else t)
+
+def _lane_state(vec, i):
+    """비교용 칸 i의 전투 상태"""
+    return dict(
+        hand=vec.hand[i, :vec.hand_len[i]].tolist(), deck=vec.deck[i, :vec.deck_len[i]].tolist(),
+        discard={n: int(count) for n, count in enumerate(vec.discard[i]) if count},
+        focus=int(vec.focus[i]), hp=int(vec.hp[i]), first=bool(vec.first[i]), reduction=bool(vec.reduction[i]),
+        exposed=vec.exposed[i].tolist(), collected=int(vec.collected[i]), turn=int(vec.turn[i]))
+
+def _engine_state(run, number):
+    """비교용 엔진 전투 상태 (_lane_state와 같은 형식)"""
+    battle = run.battle
+    co = battle.company
+    exposed = [t.exposed_amount for t in co.tactics]
+    return dict(
+        hand=[number[c.card_id] for c in run.player_hand], deck=[number[c.card_id] for c in run.player_deck],
+        discard=dict(Counter(number[c.card_id] for c in run.player_discard)),
+        focus=run.player_focus_current, hp=max(run.team_hp, 0), first=battle.turn_first_card_played,
+        reduction=battle.cost_reduction_active, exposed=exposed + [0] * (MAX_TACTICS - len(exposed)),
+        collected=co.current_collected_tax, turn=battle.stats['turns_taken'])
+
+def _invariants(state):
+    """난수와 무관한 값: 전체 카드 구성, 손패 수, 집중력/할인, 적발액, 턴"""
+    cards = sorted(state["hand"] + state["deck"] + [n for n, count in state["discard"].items() for _ in range(count)])
+    return (cards, len(state["hand"]), state["focus"], state["first"], state["reduction"],
+            state["exposed"], state["turn"])
+
+def check_against_engine(num_envs=64, stage=0, seed=0, steps=300, illegal_rate=0.1):
+    """커널과 엔진을 무작위 행동(illegal_rate 비율은 불가능할 수도 있는 임의 행동)으로 나란히 진행.
+    (행동 종류별 횟수, 불일치 설명 목록)"""
+    vec = VectorEnv(num_envs, stage=stage, seed=seed)
+    card_ids = sorted(LOGIC_CARD_DB)
+    cards = [LOGIC_CARD_DB[card_id] for card_id in card_ids]
+    number = {card_id: n + 1 for n, card_id in enumerate(card_ids)}
+    runs = []
+    for draft_seed in vec.draft_seeds:
+        run = RunState(quiet=True)
+        start_draft(run, seed=draft_seed)
+        initialize_game(run, run.draft_team_choices[0], run.draft_artifact_choices[0])
+        run.current_stage_level = stage
+        start_battle(run, run.company_order[stage])
+        runs.append(run)
+
+    vec.reset()
+    rng = np.random.default_rng(seed)
+    kinds, mismatches = Counter(), []
+    for _ in range(steps):
+        masks = vec.action_masks()
+        actions = random_actions(masks, rng)
+        wild = rng.random(num_envs) < illegal_rate
+        actions[wild] = rng.integers(0, N_ACTIONS, int(wild.sum()))
+        discards = vec.discard.sum(axis=1)
+        for i, run in enumerate(runs):
+            _sync_engine(run, vec, i, cards)
+            diff = np.flatnonzero(_engine_masks(run) != masks[i])
+            if diff.size:
+                mismatches.append(f"칸 {i} 행동 마스크 {diff.tolist()}")
+
+        _, rewards, terminated, truncated, info = vec.step(actions)
+        for i, run in enumerate(runs):
+            action, legal = int(actions[i]), bool(masks[i][actions[i]])
+            if info["illegal"][i] == legal:
+                mismatches.append(f"칸 {i} 행동 {action} illegal 표시")
+            if not legal:
+                kinds["illegal"] += 1
+                continue
+            kind, ok = _engine_step(run, action)
+            kinds[kind] += 1
+            if not ok:
+                mismatches.append(f"칸 {i} 엔진이 거부한 {kind}")
+                continue
+            random_kind = kind in ("end", "search_draw")
+            if terminated[i] or truncated[i]:
+                # 끝난 칸은 커널이 바로 reset하므로 결과만 비교
+                won = rewards[i] > 0.5
+                if not random_kind and ((run.game_state in ("REWARD", "REWARD_BONUS")) != won
+                                        or (run.game_state == "BATTLE") != bool(truncated[i])):
+                    mismatches.append(f"칸 {i} {kind} 결과 {run.game_state}")
+                continue
+            if run.game_state == "GAME_OVER" and kind == "end":
+                continue  # 적 대미지 난수 차이
+            lane, engine = _lane_state(vec, i), _engine_state(run, number)
+            # 드로우 카드를 냈는데 버린 덱이 늘지 않았으면 덱이 모자라 버린 덱을 섞은 것
+            if random_kind or (kind == "draw" and vec.discard[i].sum() <= discards[i]):
+                if _invariants(lane) != _invariants(engine):
+                    mismatches.append(f"칸 {i} {kind} 뒤 상태 {_invariants(lane)} != {_invariants(engine)}")
+            elif lane != engine:
+                diff = {key: (lane[key], engine[key]) for key in lane if lane[key] != engine[key]}
+                mismatches.append(f"칸 {i} {kind} 뒤 상태 (커널, 엔진) {diff}")
+    return kinds, mismatches
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="VectorEnv 처리량 측정 (무작위 합법 행동)")
+    parser.add_argument("--envs", type=int, default=1024, help="동시 전투 수")
+    parser.add_argument("--steps", type=int, default=2_000_000, help="전체 스텝 수 (전투 수 x 박자)")
+    parser.add_argument("--stage", type=int, default=0, help="스테이지 (0~3)")
+    parser.add_argument("--seed", type=int, default=0, help="시드")
+    parser.add_argument("--check", action="store_true",
+                        help="처리량 대신 엔진 대조 검사 (--envs 전투 x --steps 박자, 불일치가 있으면 종료 코드 1)")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        kinds, mismatches = check_against_engine(args.envs, args.stage, args.seed, args.steps)
+        for line in mismatches[:20]:
+            print(line)
+        print(f"엔진 대조 {sum(kinds.values()):,}회 | 불일치 {len(mismatches):,}건 | "
+              + ", ".join(f"{kind} {count:,}" for kind, count in kinds.most_common()))
+        if mismatches:
+            raise SystemExit(1)
+        return
+
+    vec = VectorEnv(args.envs, stage=args.stage, seed=args.seed)
+    vec.reset()
+    rng = np.random.default_rng(args.seed)
+    rounds = max(1, args.steps // args.envs)
+    episodes = wins = 0
+    policy_time = 0.0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        actions = random_actions(vec.action_masks(), rng)
+        policy_time += time.perf_counter() - t0
+        _, rewards, terminated, truncated, _ = vec.step(actions)
+        episodes += int(terminated.sum() + truncated.sum())
+        wins += int((terminated & (rewards > 0.5)).sum())
+    elapsed = time.perf_counter() - started
+    steps = rounds * args.envs
+    print(f"{steps:,} 스텝 | 전투 {episodes:,}회 (승리 {wins:,}) | {elapsed:.1f}초 | "
+          f"환경 {steps / max(elapsed - policy_time, 1e-9):,.0f} 스텝/초 "
+          f"(행동 마스크/선택 포함 {steps / elapsed:,.0f})")
+
+if __name__ == "__main__":
+    main()
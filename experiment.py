@@ -0,0 +1,152 @@
+"""공통 난수(CRN) 페어 밸런스 실험
+
+카드/조사관 수치를 바꾼 변형(variant)과 현재 콘텐츠(baseline)를 같은 시드로 한 판씩 짝지어
+실행합니다. 런의 난수는 시드별·용도별 스트림(engine.RunRandom)에서 나오므로 두 판은
+같은 드래프트 후보, 같은 기업 선택, 같은 셔플, 같은 적 행동 굴림을 받고, 결과 차이는
+거의 전부 콘텐츠 변경에서 옵니다. 쌍별 차이의 평균과 신뢰구간을 보고하며, 구간이
+임계값(±threshold)을 벗어나거나 그 안에 완전히 들어오면 조기 종료합니다.
+
+변형은 콘텐츠 팩과 같은 형식의 패치 파일로, 바꿀 필드만 적습니다:
+
+    # buff_audit.toml
+    [cards.c_tier_01]
+    base_damage = 12
+
+    python experiment.py --variant buff_audit.toml --metric win --threshold 0.01
+"""
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import content
+from content_pack import load_catalog
+from engine import RunState
+from simulate import load_policy, play_run
+
+METRICS = {
+    "win": ("클리어율", lambda run: float(run.game_state == "GAME_CLEAR")),
+    "tax": ("총 추징액", lambda run: float(run.total_collected_tax)),
+}
+
+# --- 워커 ---
+_WORKER = {}
+
+def _init_worker(patches, policy_name):
+    """워커당 한 번: 기준/변형 카탈로그와 정책 준비"""
+    _WORKER["base"] = content.CATALOG
+    _WORKER["variant"] = load_catalog(patches=patches)
+    _WORKER["policy"] = load_policy(policy_name)
+
+def _play(seed, catalog):
+    content.use_catalog(catalog)
+    # 섞기 전 카드 ID순 정렬: 두 판의 플레이 순서가 달라 버린 덱 순서가 어긋나도 같은 셔플 결과를 받음
+    run = RunState(quiet=True, canonical_shuffle=True)
+    play_run(seed, _WORKER["policy"], run=run)
+    return tuple(fn(run) for _, fn in METRICS.values())
+
+def paired_chunk(seeds):
+    """시드마다 (기준 지표들, 변형 지표들) 반환"""
+    try:
+        return [(_play(seed, _WORKER["base"]), _play(seed, _WORKER["variant"])) for seed in seeds]
+    finally:
+        content.use_catalog(_WORKER["base"])
+
+# --- 통계 ---
+def paired_summary(pairs, index, z):
+    """지표 index의 기준/변형 평균, 쌍별 차이 평균, 신뢰구간, 분산 감소 배수"""
+    base = [b[index] for b, _ in pairs]
+    variant = [v[index] for _, v in pairs]
+    diffs = [v - b for b, v in zip(base, variant)]
+    n = len(diffs)
+    mean = statistics.fmean(diffs)
+    var_d = statistics.variance(diffs) if n > 1 else 0.0
+    half = z * (var_d / n) ** 0.5 if n > 1 else float("inf")
+    # 독립 표본이었다면 차이의 분산은 var(기준) + var(변형)
+    var_ind = (statistics.variance(base) + statistics.variance(variant)) if n > 1 else 0.0
+    return {
+        "n": n,
+        "base": statistics.fmean(base),
+        "variant": statistics.fmean(variant),
+        "diff": mean,
+        "ci": (mean - half, mean + half),
+        "reduction": var_ind / var_d if var_d > 0 else float("inf"),
+    }
+
+def stop_reason(summary, threshold):
+    """신뢰구간이 ±threshold를 벗어나거나 안에 들어오면 종료 사유, 아니면 None"""
+    lo, hi = summary["ci"]
+    if lo > threshold:
+        return f"변형이 {threshold:g} 이상 높음"
+    if hi < -threshold:
+        return f"변형이 {threshold:g} 이상 낮음"
+    if -threshold < lo and hi < threshold:
+        return f"차이가 ±{threshold:g} 이내"
+    return None
+
+def run_experiment(patches, policy_name="greedy", metric="win", threshold=0.01, confidence=0.95,
+                   seed=0, batch=500, max_runs=20_000, workers=None):
+    """batch 쌍씩 실행하며 조기 종료 조건을 검사. (쌍 목록, 종료 사유) 반환"""
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    index = list(METRICS).index(metric)
+    pairs, reason = [], None
+    workers = workers or os.cpu_count()
+
+    if workers == 1:
+        _init_worker(patches, policy_name)
+        mapper, pool = map, None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(patches, policy_name))
+        mapper = pool.map
+    try:
+        while len(pairs) < max_runs and reason is None:
+            start = seed + len(pairs)
+            seeds = range(start, start + min(batch, max_runs - len(pairs)))
+            step = max(1, -(-len(seeds) // workers))
+            for chunk in mapper(paired_chunk, [seeds[i:i + step] for i in range(0, len(seeds), step)]):
+                pairs.extend(chunk)
+            reason = stop_reason(paired_summary(pairs, index, z), threshold)
+    finally:
+        if pool:
+            pool.shutdown()
+    return pairs, reason
+
+def format_report(pairs, reason, confidence, elapsed):
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    lines = [
+        f"{len(pairs):,}쌍 | {reason or '최대 런 수 도달'} | {elapsed:.1f}초",
+        "",
+        f"{'지표':<8}{'기준':>10}{'변형':>10}{'차이':>10}   {confidence:.0%} 신뢰구간{'':>8}{'분산 감소':>8}",
+    ]
+    for index, (label, _) in enumerate(METRICS.values()):
+        s = paired_summary(pairs, index, z)
+        lo, hi = s["ci"]
+        lines.append(
+            f"{label:<8}{s['base']:>10,.3f}{s['variant']:>10,.3f}{s['diff']:>+10,.3f}"
+            f"   [{lo:+,.3f}, {hi:+,.3f}]{'':>4}x{s['reduction']:,.1f}"
+        )
+    lines.append("")
+    lines.append("분산 감소: 독립 표본으로 같은 정밀도를 얻으려면 필요한 런 수의 배수")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="공통 난수 페어 밸런스 실험")
+    parser.add_argument("--variant", nargs="+", required=True, help="변형 패치 파일 (TOML/JSON)")
+    parser.add_argument("--policy", default="greedy", help="봇 정책 (simulate.py 참고)")
+    parser.add_argument("--metric", choices=list(METRICS), default="win", help="조기 종료 판단 지표")
+    parser.add_argument("--threshold", type=float, default=0.01, help="의미 있는 차이 (win은 비율, tax는 억원)")
+    parser.add_argument("--confidence", type=float, default=0.95, help="신뢰수준")
+    parser.add_argument("--seed", type=int, default=0, help="시작 시드")
+    parser.add_argument("--batch", type=int, default=500, help="조기 종료 검사 간격 (쌍)")
+    parser.add_argument("--max-runs", type=int, default=20_000, help="최대 쌍 수")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="워커 프로세스 수")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    pairs, reason = run_experiment(args.variant, args.policy, args.metric, args.threshold, args.confidence,
+                                   args.seed, args.batch, args.max_runs, args.workers)
+    print(format_report(pairs, reason, args.confidence, time.perf_counter() - started))
+
+if __name__ == "__main__":
+    main()
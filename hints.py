@@ -0,0 +1,186 @@
+"""전투 추천 (힌트) 엔진
+
+현재 국면에서 둘 수 있는 수(카드 → 혐의 공격, 드로우/빅데이터 카드, 과세 논리 개발, 턴 종료)마다
+남은 전투를 봇 정책(simulate.py)으로 끝까지 롤아웃해 승률과 추징 달성률을 추정합니다.
+롤아웃은 fork_battle()로 복사한 헤드리스 국면에서 snapshot/restore를 반복하며, 매번 새 난수로
+덱을 다시 섞고 적 대미지를 굴리므로 플레이어가 모르는 덱 순서나 앞으로의 적 행동은 보지 않습니다.
+
+HintSearch.start()는 백그라운드 스레드에서 제한 시간(budget) 동안 후보를 번갈아 롤아웃하고,
+estimates()는 언제 불러도 지금까지의 추정치를 돌려주므로 UI는 기다리지 않습니다.
+
+    python hints.py --seed 7 --stage 1 --budget 0.15
+"""
+import argparse
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Tuple
+
+from engine import RunState, fork_battle, snapshot_battle, restore_battle, start_draft, initialize_game, start_battle
+from replay import ACTIONS
+from simulate import load_policy, legal_moves
+
+HINT_BUDGET = 0.15       # 초
+MAX_ROLLOUT_TURNS = 30   # 롤아웃 한 번의 최대 턴 수 (넘기면 실패로 셈)
+
+@dataclass(frozen=True)
+class Move:
+    """추천 후보 수. action/args는 replay.ACTIONS 이름과 인자"""
+    action: str
+    args: Tuple[int, ...]
+    label: str
+
+@dataclass(frozen=True)
+class Estimate:
+    """후보 수의 롤아웃 결과"""
+    move: Move
+    rollouts: int
+    win_rate: float
+    tax_ratio: float  # 평균 추징액 / 목표 세액 (패배 포함)
+
+def candidate_moves(run):
+    """현재 국면에서 둘 수 있는 수. 같은 카드를 여러 장 들고 있으면 대상별로 한 번만"""
+    co = run.battle.company
+    hand = run.player_hand
+    moves, seen = [], set()
+    for card_index, tactic_index in legal_moves(run):
+        card = hand[card_index]
+        if (card.card_id, tactic_index) in seen:
+            continue
+        seen.add((card.card_id, tactic_index))
+        if tactic_index is None:
+            moves.append(Move("select_card_to_play", (card_index,), f"'{card.name}' 사용"))
+        else:
+            target = co.tactics[tactic_index].name if tactic_index < len(co.tactics) else "잔여 혐의"
+            moves.append(Move("execute_attack", (card_index, tactic_index), f"'{card.name}' → {target}"))
+    if run.team_hp >= 2:
+        moves.append(Move("develop_tax_logic", (), "과세 논리 개발"))
+    moves.append(Move("end_player_turn", (), "턴 종료"))
+    return moves
+
+def position_key(run):
+    """국면이 바뀌었는지 비교하는 요약 (추천을 다시 계산할지 판단)"""
+    battle = run.battle
+    co = battle.company
+    return (id(battle), tuple(map(id, run.player_hand)), len(run.player_deck), len(run.player_discard),
+            run.team_hp, run.player_focus_current, battle.turn_first_card_played, battle.cost_reduction_active,
+            battle.stats["turns_taken"], co.current_collected_tax,
+            tuple((t.exposed_amount, t.is_cleared) for t in co.tactics))
+
+class HintSearch:
+    """후보 수별 롤아웃 탐색. 생성 시점의 국면을 복사해 두므로 원래 세션은 그대로 진행해도 됨"""
+
+    def __init__(self, run, budget=HINT_BUDGET, policy="greedy", seed=None):
+        self.key = position_key(run)
+        self.moves = candidate_moves(run)
+        self.budget = budget
+        self.policy = load_policy(policy)
+        self.elapsed = 0.0
+        self.error = None
+        self._seeds = random.Random(seed)
+        self._fork = fork_battle(run)
+        self._root = snapshot_battle(self._fork)
+        self._target = run.battle.company.tax_target
+        self._totals = [[0, 0, 0.0] for _ in self.moves]  # 후보별 [롤아웃 수, 승리 수, 추징률 합]
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """백그라운드 스레드에서 탐색 시작. self 반환"""
+        self._thread = threading.Thread(target=self._search, name="hint-search", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._stop.set()
+
+    @property
+    def done(self):
+        return self._thread is not None and not self._thread.is_alive()
+
+    def wait(self, timeout=None):
+        """탐색이 끝나거나 timeout초가 지날 때까지 기다린 뒤 지금까지의 추정치 반환"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.estimates()
+
+    def estimates(self):
+        """승률, 추징 달성률 순으로 정렬한 추정치 (롤아웃이 없는 후보는 뒤에)"""
+        with self._lock:
+            totals = [tuple(t) for t in self._totals]
+        result = [
+            Estimate(move, n, wins / n if n else 0.0, ratio / n if n else 0.0)
+            for move, (n, wins, ratio) in zip(self.moves, totals)
+        ]
+        result.sort(key=lambda e: (e.rollouts > 0, e.win_rate, e.tax_ratio), reverse=True)
+        return result
+
+    @property
+    def rollouts(self):
+        with self._lock:
+            return sum(t[0] for t in self._totals)
+
+    def _search(self):
+        started = time.perf_counter()
+        deadline = started + self.budget
+        try:
+            # 후보를 번갈아 하나씩 롤아웃하므로 시간이 언제 끊겨도 후보별 표본 수가 고름
+            while not self._stop.is_set():
+                for index, move in enumerate(self.moves):
+                    if self._stop.is_set() or time.perf_counter() >= deadline:
+                        return
+                    won, ratio = self._rollout(move, self._seeds.getrandbits(32))
+                    with self._lock:
+                        totals = self._totals[index]
+                        totals[0] += 1
+                        totals[1] += won
+                        totals[2] += ratio
+        except Exception as e:
+            self.error = e
+        finally:
+            self.elapsed = time.perf_counter() - started
+
+    def _rollout(self, move, seed):
+        """국면을 되돌리고 move를 둔 뒤 전투가 끝날 때까지 정책으로 진행. (승리 여부, 추징률)"""
+        fork = self._fork
+        restore_battle(fork, self._root)
+        fork.rng.seed = seed
+        fork.player_deck.shuffle(random.Random(seed))  # 덱 순서는 플레이어가 모르는 정보
+        fork.actions.clear()
+
+        ACTIONS[move.action](fork, *move.args)
+        battle = fork.battle
+        turns_limit = battle.stats["turns_taken"] + MAX_ROLLOUT_TURNS
+        while fork.game_state == "BATTLE" and battle.stats["turns_taken"] <= turns_limit:
+            self.policy.play_turn(fork)
+            if fork.game_state == "BATTLE":
+                ACTIONS["end_player_turn"](fork)
+
+        won = fork.game_state not in ("BATTLE", "GAME_OVER")
+        return won, min(battle.company.current_collected_tax / self._target, 1.0)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="전투 첫 턴 추천 출력 (롤아웃 속도 확인용)")
+    parser.add_argument("--seed", type=int, default=0, help="런 시드")
+    parser.add_argument("--stage", type=int, default=0, help="스테이지 (0~3)")
+    parser.add_argument("--budget", type=float, default=HINT_BUDGET, help="탐색 시간 (초)")
+    parser.add_argument("--policy", default="greedy", help="롤아웃 정책 (simulate.py 참고)")
+    args = parser.parse_args(argv)
+
+    run = RunState(quiet=True)
+    start_draft(run, seed=args.seed)
+    initialize_game(run, run.draft_team_choices[0], run.draft_artifact_choices[0])
+    run.current_stage_level = args.stage
+    start_battle(run, run.company_order[args.stage])
+
+    search = HintSearch(run, budget=args.budget, policy=args.policy, seed=args.seed).start()
+    estimates = search.wait()
+    print(f"{run.battle.company.name} | 손패 {[c.name for c in run.player_hand]} | 집중력 {run.player_focus_current}")
+    for e in estimates:
+        print(f"  {e.move.label:<36} 승률 {e.win_rate:6.1%}  추징 {e.tax_ratio:6.1%}  ({e.rollouts}회)")
+    print(f"롤아웃 {search.rollouts:,}회 | {search.elapsed * 1000:.0f}ms")
+
+if __name__ == "__main__":
+    main()
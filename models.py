@@ -0,0 +1,244 @@
+from enum import Enum, IntFlag
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Tuple
+import math
+
+# --- 0. Enum(열거형) 정의 ---
+class TaxType(str, Enum): 
+    CORP = "법인세"
+    VAT = "부가세"
+    COMMON = "공통"
+
+class AttackCategory(str, Enum): 
+    COST = "비용"
+    REVENUE = "수익"
+    CAPITAL = "자본"
+    COMMON = "공통"
+
+class MethodType(str, Enum): 
+    INTENTIONAL = "고의적 누락"
+    ERROR = "단순 오류"
+    CAPITAL_TX = "자본 거래"
+
+class DifficultyTier(str, Enum):
+    EASY = "중소기업"
+    MEDIUM = "중견기업"
+    HARD = "대기업"
+    EXPERT = "글로벌기업"
+
+# 세목/유형 비트 마스크 (멤버 이름은 TaxType/AttackCategory와 동일)
+class TaxFlag(IntFlag):
+    CORP = 1
+    VAT = 2
+    COMMON = 4
+
+class CategoryFlag(IntFlag):
+    COST = 1
+    REVENUE = 2
+    CAPITAL = 4
+    COMMON = 8
+
+# --- 헬퍼 함수 ---
+def format_krw(amount):
+    """금액을 한국 원화 형식으로 포맷팅"""
+    if amount is None: 
+        return "N/A"
+    try:
+        if abs(amount) >= 1_000_000: 
+            return f"{amount / 1_000_000:,.1f}조원"
+        elif abs(amount) >= 10_000: 
+            return f"{amount / 10_000:,.0f}억원"
+        elif abs(amount) >= 100: 
+            return f"{amount / 100:,.0f}억원"
+        else: 
+            return f"{amount:,.0f}백만원"
+    except Exception: 
+        return f"{amount} (Format Error)"
+
+def get_enum_values(enum_or_list):
+    """Enum이나 Enum 리스트를 값 리스트로 변환"""
+    if isinstance(enum_or_list, list):
+        return [e.value for e in enum_or_list if hasattr(e, 'value')]
+    elif hasattr(enum_or_list, 'value'):
+        return [enum_or_list.value]
+    return []
+
+def enum_mask(enum_or_list, flag_type):
+    """Enum이나 Enum 리스트를 같은 이름의 IntFlag 마스크로 변환"""
+    items = enum_or_list if isinstance(enum_or_list, list) else [enum_or_list]
+    mask = flag_type(0)
+    for e in items:
+        name = getattr(e, 'name', None)
+        if name in flag_type.__members__:
+            mask |= flag_type[name]
+    return mask
+
+def safe_get_enum_value(enum_obj, default="N/A"):
+    """안전하게 Enum 값 가져오기"""
+    try:
+        if hasattr(enum_obj, 'value'):
+            return enum_obj.value
+        return default
+    except:
+        return default
+
+# --- 1. 데이터 클래스 정의 ---
+# 정적 콘텐츠는 프로세스 전체가 공유하는 읽기 전용 객체 (frozen, __slots__)
+# 전투 중 바뀌는 값은 아래 TacticInstance/CompanyInstance에만 둡니다.
+@dataclass(frozen=True, slots=True)
+class Card:
+    name: str
+    description: str
+    cost: int
+
+@dataclass(frozen=True, slots=True)
+class TaxManCard(Card):
+    hp: int
+    max_hp: int
+    focus: int
+    analysis: int
+    persuasion: int
+    evidence: int
+    data: int
+    ability_name: str
+    ability_desc: str
+    
+    def __init__(self, name, description, cost, hp, focus, analysis, persuasion, evidence, data, ability_name, ability_desc):
+        nerfed_hp = int(hp * 0.8)
+        Card.__init__(self, name, description, cost)  # slots 클래스는 재생성되므로 super() 대신 명시 호출
+        for key, value in dict(hp=nerfed_hp, max_hp=nerfed_hp, focus=focus, analysis=analysis,
+                               persuasion=persuasion, evidence=evidence, data=data,
+                               ability_name=ability_name, ability_desc=ability_desc).items():
+            object.__setattr__(self, key, value)
+
+@dataclass(frozen=True, slots=True)
+class LogicCard(Card):
+    base_damage: int
+    tax_type: List[TaxType]
+    attack_category: List[AttackCategory]
+    text: str
+    special_effect: Optional[Dict[str, Any]] = None
+    special_bonus: Optional[Dict[str, Any]] = None
+    card_id: str = ""  # LOGIC_CARD_DB 키 (콘텐츠 로드 시 intern)
+    tax_mask: TaxFlag = field(init=False, repr=False, compare=False)
+    category_mask: CategoryFlag = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # 비용 증가를 생성 시점에 처리
+        object.__setattr__(self, 'cost', max(0, self.cost + 1))
+        object.__setattr__(self, 'tax_mask', enum_mask(self.tax_type, TaxFlag))
+        object.__setattr__(self, 'category_mask', enum_mask(self.attack_category, CategoryFlag))
+
+@dataclass(frozen=True, slots=True)
+class EvasionTactic:
+    name: str
+    description: str
+    total_amount: int
+    tax_type: Any  # TaxType | list[TaxType]
+    method_type: MethodType
+    tactic_category: AttackCategory
+    tax_mask: TaxFlag = field(init=False, repr=False, compare=False)
+    category_mask: CategoryFlag = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'tax_mask', enum_mask(self.tax_type, TaxFlag))
+        object.__setattr__(self, 'category_mask', enum_mask(self.tactic_category, CategoryFlag))
+
+class ResidualTactic(EvasionTactic):
+    __slots__ = ()
+    exposed_amount = 0
+    is_cleared = False  # 잔여 혐의는 완료 처리되지 않음
+
+    def __init__(self, remaining_tax):
+        super().__init__(
+            name="[잔여 혐의 조사]",
+            description=f"특정 혐의를 모두 적발했습니다. 남은 목표 세액 {remaining_tax:,}억원을 마저 추징합니다.",
+            total_amount=remaining_tax,
+            tax_type=[TaxType.COMMON],
+            method_type=MethodType.ERROR,
+            tactic_category=AttackCategory.COMMON
+        )
+
+@dataclass(frozen=True, slots=True)
+class Company:
+    name: str
+    size: str
+    description: str
+    real_case_desc: str
+    revenue: int
+    operating_income: int
+    tax_target: int
+    team_hp_damage: tuple
+    tactics: Tuple[EvasionTactic, ...]
+    defense_actions: Tuple[str, ...]
+    difficulty_tier: DifficultyTier
+    real_investigation_result: str = ""  # ⭐ 이 줄이 있는지 확인!
+    
+    def __post_init__(self):
+        min_dmg, max_dmg = self.team_hp_damage
+        
+        if self.difficulty_tier == DifficultyTier.EASY:
+            multiplier = 0.7
+        elif self.difficulty_tier == DifficultyTier.MEDIUM:
+            multiplier = 0.9
+        elif self.difficulty_tier == DifficultyTier.HARD:
+            multiplier = 1.1
+        else:  # EXPERT
+            multiplier = 1.3
+        
+        object.__setattr__(self, 'team_hp_damage', (
+            math.ceil(min_dmg * multiplier),
+            math.ceil(max_dmg * multiplier)
+        ))
+        object.__setattr__(self, 'tactics', tuple(self.tactics))
+        object.__setattr__(self, 'defense_actions', tuple(self.defense_actions))
+        
+# --- 전투 인스턴스 (copy-on-write) ---
+# 템플릿(EvasionTactic/Company)은 공유 콘텐츠 그대로 참조하고, 전투 중 바뀌는 값만 따로 보관합니다.
+# 그 밖의 속성(name, description, tax_target 등)은 템플릿으로 위임합니다.
+def _template_field(name):
+    """자주 읽는 템플릿 속성용 위임 프로퍼티 (__getattr__ 폴백보다 빠름)"""
+    return property(lambda self: getattr(self.template, name))
+
+class TacticInstance:
+    """전투 중 혐의: 템플릿 참조 + 적발액/완료 여부"""
+    __slots__ = ("template", "exposed_amount", "is_cleared")
+    name = _template_field("name")
+    total_amount = _template_field("total_amount")
+    method_type = _template_field("method_type")
+    tactic_category = _template_field("tactic_category")
+    tax_mask = _template_field("tax_mask")
+    category_mask = _template_field("category_mask")
+
+    def __init__(self, template):
+        self.template = template
+        self.exposed_amount = 0
+        self.is_cleared = False
+
+    def __getattr__(self, name):
+        if name == "template" or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.template, name)
+
+class CompanyInstance:
+    """전투 중 기업: 템플릿 참조 + 추징액/혐의 진행 상태"""
+    __slots__ = ("template", "tactics", "current_collected_tax")
+    name = _template_field("name")
+    size = _template_field("size")
+    tax_target = _template_field("tax_target")
+
+    def __init__(self, template):
+        self.template = template
+        self.tactics = [TacticInstance(t) for t in template.tactics]
+        self.current_collected_tax = 0
+
+    def __getattr__(self, name):
+        if name == "template" or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.template, name)
+
+@dataclass(frozen=True, slots=True)
+class Artifact:
+    name: str
+    description: str
+    effect: Dict[str, Any]
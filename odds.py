@@ -0,0 +1,164 @@
+"""전투 확률 계산 (사이드바용)
+
+샘플링 없이 정확한 분포로 계산하므로 상태가 바뀔 때마다 다시 불러도 됩니다.
+
+기업 턴 대미지는 Company.team_hp_damage 범위의 균등 정수(enemy_turn의 randint)이므로,
+k턴 누적 대미지 분포는 한 턴 분포를 k번 합성곱한 것입니다. 대미지 범위별로 누적분포표를
+한 번 만들어 두고(lru_cache), 생존 확률은 표에서 현재 체력 위치를 읽기만 합니다.
+
+다음 턴 드로우 확률은 구역별 카드 ID 장수(CardZone.counts)만으로 초기하분포를 계산합니다.
+덱이 모자라 버린 덱을 섞는 경계와, 턴 시작에 자동 사용되는 비용 0 드로우 카드의 추가 드로우도
+start_player_turn()의 순서 그대로 반영합니다.
+
+    python odds.py --min 8 --max 15 --hp 40
+"""
+import argparse
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+from content import LOGIC_CARD_DB
+from engine import card_tactic_bits
+
+SURVIVAL_TURNS = 5  # 미리 계산해 두는 최대 기업 턴 수
+
+# --- 적 대미지 분포 ---
+@lru_cache(maxsize=None)
+def damage_cdf(min_damage, max_damage, turns=SURVIVAL_TURNS):
+    """누적 대미지 누적분포표. cdf[k, d] = P(기업 턴 k번 누적 대미지 <= d) (k=0..turns, d=0..turns*max_damage)"""
+    width = turns * max_damage + 1
+    one_turn = np.zeros(max_damage + 1)
+    one_turn[min_damage:] = 1.0 / (max_damage - min_damage + 1)
+
+    pmf = np.zeros((turns + 1, width))
+    pmf[0, 0] = 1.0
+    for k in range(1, turns + 1):
+        pmf[k] = np.convolve(pmf[k - 1], one_turn)[:width]
+    cdf = np.cumsum(pmf, axis=1)
+    cdf.setflags(write=False)  # 세션끼리 공유하는 캐시
+    return cdf
+
+def survival_odds(team_hp, damage_range, turns=SURVIVAL_TURNS):
+    """다음 1..turns번의 기업 턴을 모두 버틸 확률 (체력이 0 이하가 되면 패배)"""
+    if team_hp <= 0:
+        return np.zeros(turns)
+    min_damage, max_damage = damage_range
+    cdf = damage_cdf(min_damage, max_damage, max(turns, SURVIVAL_TURNS))
+    # 누적 대미지 <= 체력-1 이어야 생존. 표 범위를 넘는 체력은 확률 1
+    return cdf[1:turns + 1, min(team_hp - 1, cdf.shape[1] - 1)]
+
+def battle_survival_odds(run, turns=SURVIVAL_TURNS):
+    """현재 전투에서 다음 1..turns번의 기업 턴을 버틸 확률 (플레이어가 쓰는 체력 비용은 제외)"""
+    return survival_odds(run.team_hp, run.battle.company.team_hp_damage, turns)
+
+# --- 드로우 확률 ---
+def _miss_samples(size, targets, autos, m):
+    """size장 중 targets장이 목표 카드인 더미에서 m장을 뽑을 때, 목표 카드가 하나도 없는 경우를
+    자동 드로우 카드 구성별로 나눈 (뽑힌 자동 드로우 카드 수, 추가 드로우 수, 확률) 목록.
+    autos: 추가 드로우 수 -> 더미의 자동 드로우 카드 장수"""
+    ways = {(0, 0): 1}  # (자동 드로우 카드 수, 추가 드로우 수) -> 경우의 수
+    for value, count in autos.items():
+        grown = {}
+        for (k, extra), w in ways.items():
+            for j in range(min(count, m - k) + 1):
+                key = (k + j, extra + j * value)
+                grown[key] = grown.get(key, 0) + w * comb(count, j)
+        ways = grown
+    others = size - targets - sum(autos.values())
+    total = comb(size, m)
+    return [(k, extra, w * comb(others, m - k) / total) for (k, extra), w in ways.items()]
+
+def _miss_rest(size, targets, m):
+    """남은 size장(목표 targets장)에서 m장을 더 뽑아도 목표 카드가 없을 확률 (더미보다 많으면 전부)"""
+    m = min(m, size)
+    if size - targets < m:
+        return 0.0
+    return comb(size - targets, m) / comb(size, m)
+
+def _split(counts, targets, auto_draw):
+    """카드 ID별 장수 -> (장수, 목표 카드 장수, 추가 드로우 수별 자동 드로우 카드 장수)"""
+    size = hits = 0
+    autos = {}
+    for card_id, n in counts.items():
+        size += n
+        if card_id in auto_draw:
+            autos[auto_draw[card_id]] = autos.get(auto_draw[card_id], 0) + n
+        elif card_id in targets:
+            hits += n
+    return size, hits, autos
+
+def next_draw_odds(deck, pile, draw_n, targets, auto_draw=None):
+    """다음 턴 시작 후 손패에 targets 카드가 1장 이상 있을 확률.
+    deck: 덱, pile: 턴 종료 후의 버린 덱(버린 덱 + 손패)의 카드 ID별 장수.
+    auto_draw: 턴 시작에 자동 사용되는 드로우 카드 ID -> 추가 드로우 수 (이 카드들은 목표에서 제외)"""
+    auto_draw = auto_draw or {}
+    d, d_hits, d_autos = _split(deck, targets, auto_draw)
+    p, p_hits, p_autos = _split(pile, targets, auto_draw)
+
+    miss = 0.0
+    if d >= draw_n:
+        # 첫 드로우는 덱 안에서 끝남. 추가 드로우가 덱 나머지를 넘으면 버린 덱(+자동 사용한 카드)을 섞어 이어 뽑음
+        rest = d - draw_n
+        for k, extra, prob in _miss_samples(d, d_hits, d_autos, draw_n):
+            if extra <= rest:
+                miss += prob * _miss_rest(rest, d_hits, extra)
+            elif d_hits == 0:
+                miss += prob * _miss_rest(p + k, p_hits, extra - rest)
+    elif d_hits == 0:
+        # 덱을 모두 뽑고 버린 덱을 섞어 나머지를 뽑음. 추가 드로우가 그 나머지도 넘으면
+        # 다시 섞이는 더미는 방금 자동 사용한 드로우 카드뿐이므로 목표 카드가 없음
+        m = min(draw_n - d, p)
+        deck_extra = sum(value * n for value, n in d_autos.items())
+        for _, extra, prob in _miss_samples(p, p_hits, p_autos, m):
+            miss += prob * _miss_rest(p - m, p_hits, deck_extra + extra)
+    return 1.0 - miss
+
+def auto_draw_values(run):
+    """턴 시작에 자동 사용되는 드로우 카드 ID -> 추가 드로우 수 (check_draw_cards_in_hand와 같은 조건·능력 보정)"""
+    values = {}
+    for card_id, card in LOGIC_CARD_DB.items():
+        if card.cost == 0 and card.special_effect and card.special_effect.get("type") == "draw":
+            value = card.special_effect.get("value", 0)
+            for hook in run.abilities.on_draw_effect:
+                value, _ = hook(card, value)
+            values[card_id] = value
+    return values
+
+def battle_draw_odds(run):
+    """턴을 지금 끝낼 때 다음 턴 손패에 각 미완료 혐의를 공격할 카드가 1장 이상 있을 확률.
+    [(혐의 이름, 확률)]. 모든 혐의를 적발했으면 잔여 혐의에 쓸 공격 카드 기준.
+    턴 시작 능력으로 생기는 카드(이승수)는 제외"""
+    battle = run.battle
+    co = battle.company
+    pile = dict(run.player_discard.counts)
+    for card_id, n in run.player_hand.counts.items():
+        pile[card_id] = pile.get(card_id, 0) + n
+    draw_n = 4 + run.player_artifacts.effects.bonus_draw
+    auto_draw = auto_draw_values(run)
+
+    attack_ids = [card_id for card_id in set(pile) | set(run.player_deck.counts)
+                  if LOGIC_CARD_DB[card_id].base_damage > 0]
+    open_tactics = [(i, t.name) for i, t in enumerate(co.tactics) if not t.is_cleared]
+    if not open_tactics:
+        return [("잔여 혐의", next_draw_odds(run.player_deck.counts, pile, draw_n, set(attack_ids), auto_draw))]
+    bits = {card_id: card_tactic_bits(run, LOGIC_CARD_DB[card_id]) for card_id in attack_ids}
+    return [
+        (name, next_draw_odds(run.player_deck.counts, pile, draw_n,
+                              {card_id for card_id, row in bits.items() if row >> i & 1}, auto_draw))
+        for i, name in open_tactics
+    ]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="기업 턴 생존 확률 출력")
+    parser.add_argument("--min", type=int, required=True, help="턴당 최소 대미지")
+    parser.add_argument("--max", type=int, required=True, help="턴당 최대 대미지")
+    parser.add_argument("--hp", type=int, required=True, help="현재 팀 체력")
+    parser.add_argument("--turns", type=int, default=SURVIVAL_TURNS, help="기업 턴 수")
+    args = parser.parse_args(argv)
+
+    for k, p in enumerate(survival_odds(args.hp, (args.min, args.max), args.turns), 1):
+        print(f"{k}턴 생존 {p:7.2%}")
+
+if __name__ == "__main__":
+    main()
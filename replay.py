@@ -0,0 +1,125 @@
+"""런 리플레이
+
+런의 모든 난수는 start_draft()에서 시드한 run.rng에서 나오므로, 한 판은
+(시드, 플레이어 행동 목록)만으로 그대로 재현됩니다. UI와 시뮬레이터는
+apply_action()으로 엔진을 호출해 행동을 run.actions에 기록하고,
+replay()는 기록을 Streamlit 없이 최고 속도로 다시 실행합니다.
+버그 재현과 회귀 벤치마크에 사용합니다.
+
+행동 인자는 객체 대신 인덱스(드래프트 후보, 손패, 혐의, 보상 카드)로 저장합니다.
+
+    python replay.py record --seed 7 --policy greedy -o run.json
+    python replay.py play run.json --repeat 100
+"""
+import argparse
+import json
+import time
+
+from engine import (
+    RunState, start_draft, initialize_game, start_battle,
+    select_card_to_play, cancel_card_selection, execute_attack, execute_auto_attack, execute_auto_turn,
+    develop_tax_logic, end_player_turn, abandon_battle, accept_bonus_reward, decline_bonus_reward,
+    roll_reward_cards, finish_game, go_to_next_stage
+)
+
+REPLAY_VERSION = 3  # 2: 덱 구역 제자리 셔플 (셔플 난수 소비가 1과 다름), 3: 섞기 전 정렬은 canonical_shuffle일 때만
+
+def _initialize_game(run, lead_index, artifact_index):
+    initialize_game(run, run.draft_team_choices[lead_index], run.draft_artifact_choices[artifact_index])
+
+def _start_battle(run):
+    start_battle(run, run.company_order[run.current_stage_level])
+
+def _go_to_next_stage(run, reward_index=None):
+    go_to_next_stage(run, add_card=None if reward_index is None else run.reward_cards[reward_index])
+
+# 행동 이름 -> 엔진 함수 (run, *인자)
+ACTIONS = {
+    "initialize_game": _initialize_game,
+    "start_battle": _start_battle,
+    "select_card_to_play": select_card_to_play,
+    "cancel_card_selection": cancel_card_selection,
+    "execute_attack": execute_attack,
+    "execute_auto_attack": execute_auto_attack,
+    "execute_auto_turn": execute_auto_turn,
+    "develop_tax_logic": develop_tax_logic,
+    "end_player_turn": end_player_turn,
+    "abandon_battle": abandon_battle,
+    "accept_bonus_reward": accept_bonus_reward,
+    "decline_bonus_reward": decline_bonus_reward,
+    "roll_reward_cards": roll_reward_cards,
+    "finish_game": finish_game,
+    "go_to_next_stage": _go_to_next_stage,
+}
+
+def apply_action(run, name, *args):
+    """행동을 리플레이 로그에 기록하고 실행. 엔진 함수의 반환값을 그대로 반환"""
+    handler = ACTIONS.get(name)
+    if handler is None:
+        raise ValueError(f"알 수 없는 행동: {name}")
+    run.actions.append((name, *args))
+    return handler(run, *args)
+
+def dump_replay(run):
+    """JSON으로 저장할 수 있는 리플레이 기록 {'version', 'seed', 'canonical_shuffle', 'actions'}"""
+    return {
+        "version": REPLAY_VERSION,
+        "seed": run.rng.seed,
+        "canonical_shuffle": run.canonical_shuffle,
+        "actions": [list(action) for action in run.actions],
+    }
+
+def replay(record, quiet=True):
+    """리플레이 기록을 처음부터 다시 실행하고 최종 RunState 반환"""
+    if record.get("version") != REPLAY_VERSION:
+        raise ValueError(f"지원하지 않는 리플레이 버전: {record.get('version')}")
+    run = RunState(quiet=quiet, canonical_shuffle=record.get("canonical_shuffle", False))
+    start_draft(run, seed=record["seed"])
+    for name, *args in record["actions"]:
+        apply_action(run, name, *args)
+    return run
+
+def summarize(run):
+    """리플레이 결과 비교용 요약"""
+    return {
+        "game_state": run.game_state,
+        "stage": run.current_stage_level,
+        "team_hp": run.team_hp,
+        "total_collected_tax": run.total_collected_tax,
+        "actions": len(run.actions),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="런 리플레이 기록/재생")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="봇 정책으로 런 하나를 진행하고 리플레이 저장")
+    rec.add_argument("--seed", type=int, default=0, help="런 시드")
+    rec.add_argument("--policy", default="greedy", help="봇 정책 (simulate.py 참고)")
+    rec.add_argument("-o", "--output", default="replay.json", help="저장할 파일")
+
+    play = sub.add_parser("play", help="리플레이 파일 재생")
+    play.add_argument("path", help="리플레이 파일")
+    play.add_argument("--repeat", type=int, default=1, help="반복 재생 횟수 (벤치마크용)")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        from simulate import load_policy, play_run
+        run = RunState(quiet=True)
+        play_run(args.seed, load_policy(args.policy), run=run)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(dump_replay(run), f, ensure_ascii=False)
+        print(f"{args.output} 저장 | {summarize(run)}")
+        return
+
+    with open(args.path, encoding="utf-8") as f:
+        record = json.load(f)
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        run = replay(record)
+    elapsed = time.perf_counter() - started
+    print(f"{summarize(run)} | {args.repeat:,}회 {elapsed:.2f}초 "
+          f"({args.repeat * len(record['actions']) / max(elapsed, 1e-9):,.0f} 행동/초)")
+
+if __name__ == "__main__":
+    main()
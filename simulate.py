@@ -0,0 +1,255 @@
+"""몬테카를로 밸런스 시뮬레이터
+
+Streamlit 없이 엔진만으로 전체 런(초기화 → 4개 스테이지 → GAME_CLEAR/GAME_OVER)을
+반복 실행하고, 난이도(DifficultyTier)별 승률·전투당 턴 수·추징 세액 분포를 보고합니다.
+
+    python simulate.py --runs 100000 --policy greedy
+"""
+import argparse
+import importlib
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from models import DifficultyTier
+from engine import RunState, battle_damage_matrix, start_draft, calculate_card_cost, card_tactic_bits, plan_turn
+from replay import apply_action
+
+MAX_TURNS_PER_BATTLE = 200
+
+# --- 봇 정책 ---
+class RandomPolicy:
+    """가능한 행동 중 무작위로 선택하는 정책"""
+
+    def choose_draft(self, run):
+        return random.choice(run.draft_team_choices), random.choice(run.draft_artifact_choices)
+
+    def play_turn(self, run):
+        """턴 종료 전까지 행동 반복"""
+        while run.game_state == "BATTLE":
+            moves = legal_moves(run)
+            if not moves:
+                return
+            card_index, tactic_index = random.choice(moves)
+            if not play_move(run, card_index, tactic_index):
+                return
+
+    def accept_bonus(self, run):
+        return random.random() < 0.5
+
+    def choose_reward(self, run, cards):
+        return random.choice(cards + [None])
+
+class GreedyPolicy(RandomPolicy):
+    """드로우 카드를 먼저 쓰고, 실제 추징액이 가장 큰 공격을 고르는 정책"""
+
+    def choose_draft(self, run):
+        lead = max(run.draft_team_choices, key=lambda m: m.hp + m.focus * 20)
+        return lead, run.draft_artifact_choices[0]
+
+    def play_turn(self, run):
+        while run.game_state == "BATTLE":
+            moves = legal_moves(run)
+            if not moves:
+                return
+            utility = [m for m in moves if m[1] is None]
+            if utility:
+                move = utility[0]
+            else:
+                damage = battle_damage_matrix(run)
+                move = max(moves, key=lambda m: expected_collection(run, damage, *m))
+            if not play_move(run, *move):
+                return
+
+    def accept_bonus(self, run):
+        return True
+
+    def choose_reward(self, run, cards):
+        return max(cards, key=lambda c: c.base_damage / max(c.cost, 1))
+
+class PlannerPolicy(GreedyPolicy):
+    """드로우 카드를 먼저 쓰고, 턴 플래너(plan_turn)의 최적 계획대로 공격하는 정책"""
+
+    def play_turn(self, run):
+        while run.game_state == "BATTLE":
+            utility = [m for m in legal_moves(run) if m[1] is None]
+            if not utility:
+                break
+            if not play_move(run, *utility[0]):
+                return
+        if run.game_state != "BATTLE":
+            return
+        played = []  # 계획 시점 손패 인덱스 중 이미 낸 것
+        for card_index, tactic_index in plan_turn(run).steps:
+            current = card_index - sum(1 for p in played if p < card_index)
+            if not play_move(run, current, tactic_index) or run.game_state != "BATTLE":
+                return
+            played.append(card_index)
+
+POLICIES = {
+    "random": RandomPolicy,
+    "greedy": GreedyPolicy,
+    "planner": PlannerPolicy,
+}
+
+def load_policy(name):
+    """정책 이름 또는 'module:Class' 경로로 정책 객체 생성"""
+    if name in POLICIES:
+        return POLICIES[name]()
+    module_name, _, class_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+# --- 정책용 헬퍼 ---
+def legal_moves(run):
+    """(카드 인덱스, 혐의 인덱스) 목록. 유틸리티 카드는 혐의 인덱스가 None"""
+    co = run.battle.company
+    open_tactics = [i for i, t in enumerate(co.tactics) if not t.is_cleared]
+    moves = []
+    for i, card in enumerate(run.player_hand):
+        if calculate_card_cost(run, card) > run.player_focus_current:
+            continue
+        if card.special_effect and card.special_effect.get("type") in ["search_draw", "draw"]:
+            moves.append((i, None))
+        elif card.base_damage > 0:
+            if open_tactics:
+                bits = card_tactic_bits(run, card)
+                moves.extend((i, t) for t in open_tactics if bits >> t & 1)
+            elif co.current_collected_tax < co.tax_target:
+                moves.append((i, len(co.tactics)))
+    return moves
+
+def play_move(run, card_index, tactic_index):
+    if tactic_index is None:
+        return apply_action(run, "select_card_to_play", card_index)
+    return apply_action(run, "execute_attack", card_index, tactic_index)
+
+def expected_collection(run, damage, card_index, tactic_index):
+    """공격 시 실제로 확보되는 세액 (초과분은 50%만 인정). damage는 battle_damage_matrix 결과"""
+    co = run.battle.company
+    dmg = int(damage[card_index, tactic_index])
+    if tactic_index >= len(co.tactics):
+        return dmg
+    tactic = co.tactics[tactic_index]
+    remain = tactic.total_amount - tactic.exposed_amount
+    return min(dmg, remain) + int(max(0, dmg - remain) * 0.5)
+
+# --- 런 실행 ---
+def play_run(seed, policy, run=None, stop_stage=None):
+    """런 하나를 끝까지 진행하고 전투별 결과 반환. run을 넘기면 행동 기록(리플레이)이 남음.
+    stop_stage를 주면 그 스테이지 전투의 첫 턴을 진행한 뒤 멈춤 (전투 중 세션 만들기용, bench_memory.py)"""
+    random.seed(seed)  # 정책의 무작위 선택용. 게임 난수는 run.rng
+    run = run or RunState(quiet=True)
+    start_draft(run, seed=seed)
+    lead, artifact = policy.choose_draft(run)
+    apply_action(run, "initialize_game", run.draft_team_choices.index(lead), run.draft_artifact_choices.index(artifact))
+    battles = []
+
+    while run.game_state not in ("GAME_OVER", "GAME_CLEAR"):
+        if run.game_state == "MAP":
+            co = run.company_order[run.current_stage_level]
+            apply_action(run, "start_battle")
+            if run.current_stage_level == stop_stage:
+                policy.play_turn(run)
+                break
+            while run.game_state == "BATTLE" and run.battle.stats['turns_taken'] <= MAX_TURNS_PER_BATTLE:
+                policy.play_turn(run)
+                if run.game_state == "BATTLE":
+                    apply_action(run, "end_player_turn")
+            if run.game_state == "BATTLE":
+                apply_action(run, "abandon_battle")
+            battles.append((
+                co.difficulty_tier,
+                run.game_state != "GAME_OVER",
+                run.battle.stats['turns_taken'],
+                run.battle.company.current_collected_tax,
+            ))
+        elif run.game_state == "REWARD_BONUS":
+            apply_action(run, "accept_bonus_reward" if policy.accept_bonus(run) else "decline_bonus_reward")
+        elif run.game_state == "REWARD":
+            if run.current_stage_level >= len(run.company_order) - 1:
+                apply_action(run, "finish_game")
+            else:
+                cards = list(apply_action(run, "roll_reward_cards"))
+                card = policy.choose_reward(run, cards)
+                apply_action(run, "go_to_next_stage", None if card is None else cards.index(card))
+        else:
+            raise RuntimeError(f"알 수 없는 게임 상태: {run.game_state}")
+
+    return run.game_state == "GAME_CLEAR", battles
+
+def simulate_chunk(seeds, policy_name):
+    """워커 프로세스에서 시드 묶음을 실행하고 요약 반환"""
+    policy = load_policy(policy_name)
+    wins = 0
+    per_tier = {tier: {'battles': 0, 'wins': 0, 'turns': [], 'collected': []} for tier in DifficultyTier}
+    for seed in seeds:
+        won, battles = play_run(seed, policy)
+        wins += won
+        for tier, battle_won, turns, collected in battles:
+            agg = per_tier[tier]
+            agg['battles'] += 1
+            agg['wins'] += battle_won
+            agg['turns'].append(turns)
+            agg['collected'].append(collected)
+    return len(seeds), wins, per_tier
+
+def merge_results(results):
+    total_runs, total_wins = 0, 0
+    per_tier = {tier: {'battles': 0, 'wins': 0, 'turns': [], 'collected': []} for tier in DifficultyTier}
+    for runs, wins, chunk in results:
+        total_runs += runs
+        total_wins += wins
+        for tier, agg in chunk.items():
+            per_tier[tier]['battles'] += agg['battles']
+            per_tier[tier]['wins'] += agg['wins']
+            per_tier[tier]['turns'].extend(agg['turns'])
+            per_tier[tier]['collected'].extend(agg['collected'])
+    return total_runs, total_wins, per_tier
+
+def simulate(runs, policy_name="greedy", seed=0, workers=None, chunk_size=500):
+    """전체 시뮬레이션을 프로세스 풀에 분산 실행"""
+    seeds = range(seed, seed + runs)
+    chunks = [seeds[i:i + chunk_size] for i in range(0, runs, chunk_size)]
+    if workers == 1:
+        results = [simulate_chunk(c, policy_name) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(simulate_chunk, chunks, [policy_name] * len(chunks)))
+    return merge_results(results)
+
+def format_report(total_runs, total_wins, per_tier, elapsed):
+    lines = [
+        f"총 {total_runs:,}회 런 | 최종 클리어율 {total_wins / max(total_runs, 1):.1%} | "
+        f"{elapsed:.1f}초 ({total_runs / max(elapsed, 1e-9):,.0f} 런/초)",
+        "",
+        f"{'난이도':<8}{'전투 수':>10}{'승률':>9}{'평균 턴':>9}{'세액 p10':>10}{'p50':>8}{'p90':>8}{'평균':>9}",
+    ]
+    for tier, agg in per_tier.items():
+        if not agg['battles']:
+            continue
+        collected = sorted(agg['collected'])
+        pct = lambda q: collected[min(len(collected) - 1, int(q * len(collected)))]
+        lines.append(
+            f"{tier.value:<8}{agg['battles']:>10,}{agg['wins'] / agg['battles']:>9.1%}"
+            f"{statistics.fmean(agg['turns']):>9.2f}{pct(0.1):>10,}{pct(0.5):>8,}{pct(0.9):>8,}"
+            f"{statistics.fmean(collected):>9,.0f}"
+        )
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="세무조사 덱빌딩 몬테카를로 시뮬레이터")
+    parser.add_argument("--runs", type=int, default=10_000, help="실행할 런 수")
+    parser.add_argument("--policy", default="greedy", help=f"봇 정책 ({', '.join(POLICIES)} 또는 module:Class)")
+    parser.add_argument("--seed", type=int, default=0, help="시작 시드")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="워커 프로세스 수")
+    parser.add_argument("--chunk-size", type=int, default=500, help="워커에 한 번에 넘길 런 수")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    total_runs, total_wins, per_tier = simulate(args.runs, args.policy, args.seed, args.workers, args.chunk_size)
+    print(format_report(total_runs, total_wins, per_tier, time.perf_counter() - started))
+
+if __name__ == "__main__":
+    main()